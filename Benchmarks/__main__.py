@@ -0,0 +1,81 @@
+"""
+Benchmark the page objects against the in-process fake Appium server.
+
+Usage:
+    python -m Benchmarks run [--latency MS] [--repeat N] [--catalogs 6,100,500] [--save-baseline NAME]
+    python -m Benchmarks compare [--baseline NAME] [--current PATH] [--max-round-trips N] [--max-slowdown PCT]
+    python -m Benchmarks sessions [--sessions N] [--latency MS]
+"""
+import argparse
+import os
+import sys
+from Benchmarks.runner import DEFAULT_CATALOGS, compare, format_table, load, run_benchmarks, save
+from Benchmarks.sessions import format_sessions, run_sessions
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+RESULTS_FILE = os.path.join("debug", "benchmarks.json")
+SESSIONS_FILE = os.path.join("debug", "benchmarks-sessions.json")
+
+
+def baseline_path(name: str) -> str:
+    """
+    Resolve a baseline name (e.g. 'default') or a path to a baseline file.
+    """
+    return name if name.endswith(".json") else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and store the results.")
+    run.add_argument("--latency", type=float, default=0.0, help="Simulated Appium latency per request in ms.")
+    run.add_argument("--repeat", type=int, default=20, help="Timed runs per operation.")
+    run.add_argument("--catalogs", default=",".join(map(str, DEFAULT_CATALOGS)),
+                     help="Comma-separated catalog sizes of the products screen.")
+    run.add_argument("--only", default=None, help="Only run operations whose name contains this text.")
+    run.add_argument("--output", default=RESULTS_FILE, help="Where to write the results.")
+    run.add_argument("--save-baseline", metavar="NAME", default=None, help="Also store the results as a baseline.")
+
+    check = commands.add_parser("compare", help="Fail if results regressed against a baseline.")
+    check.add_argument("--baseline", default="default", help="Baseline name or file.")
+    check.add_argument("--current", default=RESULTS_FILE, help="Results file to check.")
+    check.add_argument("--max-round-trips", type=int, default=0, help="Extra round trips tolerated per operation.")
+    check.add_argument("--max-slowdown", type=float, default=25.0, help="Tolerated median slowdown in percent.")
+
+    sessions = commands.add_parser("sessions", help="Compare sync and async page objects driving many sessions.")
+    sessions.add_argument("--sessions", type=int, default=12, help="Number of concurrent sessions.")
+    sessions.add_argument("--latency", type=float, default=20.0, help="Simulated Appium latency per request in ms.")
+    sessions.add_argument("--output", default=SESSIONS_FILE, help="Where to write the results.")
+
+    args = parser.parse_args(argv)
+    if args.command == "sessions":
+        report = run_sessions(args.sessions, args.latency / 1000)
+        print(format_sessions(report))
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        save(report, args.output)
+        return 0
+    if args.command == "run":
+        report = run_benchmarks([int(size) for size in args.catalogs.split(",")], args.latency / 1000, args.repeat,
+                                args.only)
+        print(format_table(report))
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        save(report, args.output)
+        if args.save_baseline:
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            save(report, baseline_path(args.save_baseline))
+        return 0
+
+    baseline, current = load(baseline_path(args.baseline)), load(args.current)
+    if baseline["settings"]["latency"] != current["settings"]["latency"]:
+        print(f"Warning: baseline latency {baseline['settings']['latency']} s differs from "
+              f"{current['settings']['latency']} s, timings are not comparable.")
+    regressions = compare(baseline, current, args.max_round_trips, args.max_slowdown / 100)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(current['results'])} operations compared, {len(regressions)} regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
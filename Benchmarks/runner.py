@@ -0,0 +1,133 @@
+import json
+import platform
+import time
+from Benchmarks.scenarios import SCENARIOS
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import FakeSwagLabsApp
+
+# Catalog sizes benchmarked by default: the real app, a long list and a very long list
+DEFAULT_CATALOGS = (6, 100, 500)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(server: FakeAppiumServer, driver, scenario, repeat: int) -> dict:
+    """
+    Run one scenario repeatedly and collect its round trips and wall times.
+
+    :param server: The fake Appium server the driver is connected to.
+    :param driver: Appium WebDriver instance connected to the server.
+    :param scenario: The Scenario to run.
+    :param repeat: Number of timed runs.
+    :return: A dictionary with round-trip counts and wall-time statistics in seconds.
+    """
+    app = server.sessions[driver.session_id].app
+    round_trips, wall_times = [], []
+    for _ in range(repeat):
+        operation = scenario.setup(app, driver)
+        requests_before = len(server.requests)
+        start = time.perf_counter()
+        operation()
+        wall_times.append(time.perf_counter() - start)
+        round_trips.append(len(server.requests) - requests_before)
+    return {
+        "runs": repeat,
+        "round_trips": max(round_trips),
+        "round_trips_mean": round(sum(round_trips) / repeat, 2),
+        "mean": round(sum(wall_times) / repeat, 5),
+        "p50": round(percentile(wall_times, 0.50), 5),
+        "p95": round(percentile(wall_times, 0.95), 5),
+        "max": round(max(wall_times), 5),
+    }
+
+
+def run_benchmarks(catalogs=DEFAULT_CATALOGS, latency: float = 0.0, repeat: int = 20, only: str = None) -> dict:
+    """
+    Benchmark every scenario against a fake Appium server, once per catalog size.
+
+    :param catalogs: Catalog sizes (number of products on the products screen) to benchmark.
+    :param latency: Simulated server-side latency in seconds added to every request.
+    :param repeat: Number of timed runs per scenario.
+    :param only: Optional substring; only scenarios whose name contains it are run.
+    :return: The results, keyed by 'Page.method[catalog size]', together with the run settings.
+    """
+    results = {}
+    for size in sorted(catalogs):
+        with FakeAppiumServer(latency=latency, app_factory=lambda: FakeSwagLabsApp(items=size)) as server:
+            driver = server.connect()
+            try:
+                for scenario in SCENARIOS:
+                    if (only and only not in scenario.name) or (not scenario.catalog_sensitive and size != min(catalogs)):
+                        continue
+                    key = f"{scenario.name}[{size}]" if scenario.catalog_sensitive else scenario.name
+                    results[key] = measure(server, driver, scenario, repeat)
+            finally:
+                driver.quit()
+    return {
+        "settings": {"catalogs": sorted(catalogs), "latency": latency, "repeat": repeat,
+                     "python": platform.python_version(), "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, max_round_trips: int = 0, max_slowdown: float = 0.25,
+            min_delta: float = 0.002) -> list[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    A scenario regresses when it needs more round trips than the baseline allows, or when its
+    median wall time grew by more than `max_slowdown` (and by more than `min_delta` seconds, so
+    sub-millisecond noise on fast operations does not count).
+
+    :param baseline: Results of the baseline run, as returned by `run_benchmarks`.
+    :param current: Results of the run to check.
+    :param max_round_trips: Number of extra round trips tolerated per operation.
+    :param max_slowdown: Tolerated relative increase of the median wall time, e.g. 0.25 for 25 %.
+    :param min_delta: Absolute increase of the median wall time in seconds below which it is ignored.
+    :return: A list of regression descriptions; empty if nothing regressed.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        if result["round_trips"] > base["round_trips"] + max_round_trips:
+            regressions.append(f"{name}: {result['round_trips']} round trips, baseline {base['round_trips']}")
+        slower = result["p50"] - base["p50"]
+        if slower > min_delta and slower > base["p50"] * max_slowdown:
+            regressions.append(f"{name}: median {result['p50'] * 1000:.1f} ms, baseline {base['p50'] * 1000:.1f} ms "
+                               f"(+{slower / base['p50'] * 100 if base['p50'] else float('inf'):.0f} %)")
+    return regressions
+
+
+def format_table(report: dict) -> str:
+    """
+    Render benchmark results as a plain-text table.
+    """
+    lines = [f"{'Operation':<48}{'Trips':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name, result in report["results"].items():
+        lines.append(f"{name:<48}{result['round_trips']:>7}{result['p50'] * 1000:>10.2f}"
+                     f"{result['p95'] * 1000:>10.2f}{result['max'] * 1000:>10.2f}")
+    return "\n".join(lines)
+
+
+def save(report: dict, path: str):
+    """
+    Write benchmark results to a JSON file.
+    """
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+
+def load(path: str) -> dict:
+    """
+    Read benchmark results from a JSON file.
+    """
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,130 @@
+from Pages.element_cache import element_cache
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+
+LOCKED_OUT_ERROR = "Sorry, this user has been locked out."
+
+
+class Scenario:
+    """
+    Scenario describes one benchmarked page-object operation.
+
+    The setup prepares the simulated app directly on the fake server, so it costs no
+    round trips, and returns the operation to time. Only the operation is measured.
+    Setups restart the app with `restart`, which also drops the cached element handles
+    of the driver, as a restart through the driver would.
+    """
+
+    def __init__(self, name: str, setup, catalog_sensitive: bool = True):
+        """
+        Initialize the Scenario.
+
+        :param name: The page-object method being measured, e.g. 'HomePage.add_to_cart'.
+        :param setup: Callable taking (app, driver) and returning the operation to time.
+        :param catalog_sensitive: Whether the operation depends on the catalog size. Scenarios that
+                                  do not are only run against the smallest catalog.
+        """
+        self.name = name
+        self.setup = setup
+        self.catalog_sensitive = catalog_sensitive
+
+
+def restart(app, driver):
+    """
+    Restart the simulated app with its data cleared. The app process changes behind the
+    driver's back, so the handles of the element cache are dropped (see Pages/element_cache.py).
+    """
+    app.reset()
+    element_cache.clear(driver)
+
+
+def on_products(app, driver):
+    """
+    Put the simulated app on the products screen with an empty cart.
+    """
+    restart(app, driver)
+    app.screen = "products"
+
+
+def last_item(app) -> str:
+    """
+    The title of the last product of the catalog, the worst case for XPath lookups.
+    """
+    return app.items[-1]
+
+
+def get_element(app, driver):
+    on_products(app, driver)
+    page = HomePage(driver)
+    return lambda: page.get_element(page.cart_icon)
+
+
+def is_absent(app, driver):
+    on_products(app, driver)
+    page = LoginPage(driver)
+    return lambda: page.is_absent(page.login_button)
+
+
+def perform_login(app, driver):
+    restart(app, driver)
+    page = LoginPage(driver)
+    return lambda: page.perform_login("standard_user", "secret_sauce")
+
+
+def is_error_message_present(app, driver):
+    restart(app, driver)
+    app.error = LOCKED_OUT_ERROR
+    page = LoginPage(driver)
+    return lambda: page.is_error_message_present(LOCKED_OUT_ERROR)
+
+
+def is_logged_in(app, driver):
+    on_products(app, driver)
+    page = HomePage(driver)
+    return page.is_logged_in
+
+
+def get_available_items(app, driver):
+    on_products(app, driver)
+    page = HomePage(driver)
+    return page.get_available_items
+
+
+def get_cart_quantity(app, driver):
+    on_products(app, driver)
+    app.cart = {last_item(app)}
+    page = HomePage(driver)
+    return page.get_cart_quantity
+
+
+def add_to_cart(app, driver):
+    on_products(app, driver)
+    page = HomePage(driver)
+    return lambda: page.add_to_cart(last_item(app))
+
+
+def remove_from_cart(app, driver):
+    on_products(app, driver)
+    app.cart = {last_item(app)}
+    page = HomePage(driver)
+    return lambda: page.remove_from_cart(last_item(app))
+
+
+def add_many(app, driver):
+    on_products(app, driver)
+    page = HomePage(driver)
+    return lambda: page.add_many(app.items[:6])
+
+
+SCENARIOS = [
+    Scenario("BasePage.get_element", get_element),
+    Scenario("BasePage.is_absent", is_absent),
+    Scenario("LoginPage.perform_login", perform_login, catalog_sensitive=False),
+    Scenario("LoginPage.is_error_message_present", is_error_message_present, catalog_sensitive=False),
+    Scenario("HomePage.is_logged_in", is_logged_in),
+    Scenario("HomePage.get_available_items", get_available_items),
+    Scenario("HomePage.get_cart_quantity", get_cart_quantity),
+    Scenario("HomePage.add_to_cart", add_to_cart),
+    Scenario("HomePage.remove_from_cart", remove_from_cart),
+    Scenario("HomePage.add_many", add_many),
+]
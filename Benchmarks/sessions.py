@@ -0,0 +1,128 @@
+import asyncio
+import platform
+import threading
+import time
+from Pages.async_pages import AsyncHomePage, AsyncLoginPage
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Utils.async_driver import AsyncDriver, AsyncHttpClient
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.http_pool import HttpPool
+
+# Ways of driving several sessions from one process: one after the other, one thread per session, asyncio
+MODES = ("sequential", "threads", "async")
+CAPABILITIES = {"platformName": "Android", "appium:appPackage": "com.swaglabsmobileapp"}
+ITEM = "Sauce Labs Backpack"
+
+
+def sync_flow(driver) -> int | None:
+    """
+    The benchmarked flow with the sync page objects: log in, add an item, read the cart, remove it.
+
+    :return: The cart quantity after adding the item.
+    """
+    LoginPage(driver).perform_login("standard_user", "secret_sauce")
+    home = HomePage(driver)
+    home.is_logged_in()
+    home.add_to_cart(ITEM)
+    quantity = home.get_cart_quantity(fresh=True)
+    home.remove_from_cart(ITEM)
+    return quantity
+
+
+async def async_flow(driver) -> int | None:
+    """
+    The same flow as `sync_flow` with the async page objects.
+    """
+    await AsyncLoginPage(driver).perform_login("standard_user", "secret_sauce")
+    home = AsyncHomePage(driver)
+    await home.is_logged_in()
+    await home.add_to_cart(ITEM)
+    quantity = await home.get_cart_quantity(fresh=True)
+    await home.remove_from_cart(ITEM)
+    return quantity
+
+
+def run_mode(server: FakeAppiumServer, mode: str, sessions: int) -> dict:
+    """
+    Create the sessions and run the flow once in each of them, timing the whole batch.
+
+    :return: The wall time, the flows per second, the requests and the connections opened.
+    """
+    requests_before, connections_before = len(server.requests), server.connections
+    start = time.perf_counter()
+    if mode == "async":
+        quantities = asyncio.run(_run_async(server.url, sessions))
+    else:
+        pool = HttpPool(max_per_host=sessions)
+        quantities = [None] * sessions
+
+        def run(number: int):
+            driver = server.connect(pool.connection(server.url))
+            try:
+                quantities[number] = sync_flow(driver)
+            finally:
+                driver.quit()
+
+        if mode == "threads":
+            threads = [threading.Thread(target=run, args=(number,)) for number in range(sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            for number in range(sessions):
+                run(number)
+        pool.close()
+    wall_time = time.perf_counter() - start
+    if quantities != [1] * sessions:
+        raise AssertionError(f"{mode}: unexpected cart quantities {quantities}")
+    return {"wall_time": round(wall_time, 4), "flows_per_second": round(sessions / wall_time, 2),
+            "requests": len(server.requests) - requests_before, "connections": server.connections - connections_before}
+
+
+async def _run_async(url: str, sessions: int) -> list:
+    client = AsyncHttpClient(max_per_host=sessions)
+
+    async def run():
+        driver = await AsyncDriver.create(client, url, CAPABILITIES)
+        try:
+            return await async_flow(driver)
+        finally:
+            await driver.quit()
+
+    try:
+        return await asyncio.gather(*(run() for _ in range(sessions)))
+    finally:
+        await client.close()
+
+
+def run_sessions(sessions: int = 12, latency: float = 0.02, modes=MODES) -> dict:
+    """
+    Benchmark driving many sessions from one process: the sync page objects one session after
+    the other and one thread per session, against the async page objects on one event loop.
+
+    :param sessions: Number of concurrent sessions on the fake Appium server.
+    :param latency: Simulated server-side latency in seconds added to every request.
+    :param modes: The modes to run (see MODES).
+    :return: The results per mode, together with the run settings.
+    """
+    with FakeAppiumServer(latency=latency) as server:
+        results = {mode: run_mode(server, mode, sessions) for mode in modes}
+    return {
+        "settings": {"sessions": sessions, "latency": latency, "python": platform.python_version(),
+                     "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def format_sessions(report: dict) -> str:
+    """
+    Render the session benchmark as a plain-text table.
+    """
+    lines = [f"{report['settings']['sessions']} sessions, {report['settings']['latency'] * 1000:.0f} ms latency",
+             f"{'Mode':<14}{'Wall s':>9}{'Flows/s':>10}{'Requests':>10}{'Connections':>13}"]
+    for mode, result in report["results"].items():
+        lines.append(f"{mode:<14}{result['wall_time']:>9.2f}{result['flows_per_second']:>10.2f}"
+                     f"{result['requests']:>10}{result['connections']:>13}")
+    return "\n".join(lines)
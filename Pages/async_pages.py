@@ -0,0 +1,105 @@
+import asyncio
+import inspect
+from Pages.base_page import Output, enter_page_method, leave_page_method
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+
+
+async def _outcome(call):
+    """
+    Await a call yielded by a page-object method.
+
+    :return: The result of the call and None, or None and the exception to raise in the method.
+    """
+    try:
+        return (await call if inspect.isawaitable(call) else call), None
+    except Exception as error:
+        return None, error
+
+
+def _resume(steps, value, error):
+    """
+    Resume a page-object method with the outcome of its last call.
+    """
+    return steps.throw(error) if error is not None else steps.send(value)
+
+
+async def run_steps(steps, name: str):
+    """
+    Run a `page_steps` method on an async page, awaiting every call it yields (see `Pages.base_page.run_steps`).
+    """
+    if not inspect.isgenerator(steps):
+        return steps
+    token = enter_page_method(name)
+    try:
+        value, error = None, None
+        while True:
+            try:
+                call = _resume(steps, value, error)
+            except StopIteration as stop:
+                return stop.value
+            value, error = await _outcome(call)
+    finally:
+        leave_page_method(token)
+        steps.close()
+
+
+async def iterate_steps(steps, name: str):
+    """
+    Run a `page_iterator` method on an async page as an async generator (see `Pages.base_page.iterate_steps`).
+    """
+    try:
+        value, error = None, None
+        while True:
+            token = enter_page_method(name)
+            try:
+                step = _resume(steps, value, error)
+                if not isinstance(step, Output):
+                    value, error = await _outcome(step)
+                    continue
+            except StopIteration:
+                return
+            finally:
+                leave_page_method(token)
+            value, error = None, None
+            yield step.value
+    finally:
+        steps.close()
+
+
+class AsyncPage:
+    """
+    AsyncPage turns a page object into its asyncio version for an AsyncDriver (see Utils/async_driver.py).
+
+    It is mixed in before the sync page class, e.g. `class AsyncLoginPage(AsyncPage, LoginPage)`.
+    The page methods are written once with `page_steps` (see Pages/base_page.py); AsyncPage only
+    replaces the runner, which awaits every call the methods yield, and the few calls whose shape
+    differs between the sync and the async driver. Every page method therefore returns an awaitable,
+    `page_iterator` methods are async generators, and waits poll with `asyncio.sleep`, so the other
+    sessions of the event loop keep running.
+    """
+
+    _run = staticmethod(run_steps)
+    _iterate = staticmethod(iterate_steps)
+    _sleep = staticmethod(asyncio.sleep)
+    _next = staticmethod(anext)
+
+    def _page_source(self):
+        return self.driver.get_page_source()
+
+    def _perform(self, actions):
+        devices = [device.encode() for device in actions.devices]
+        return self.driver.perform_actions([device for device in devices if device["actions"]])
+
+
+class AsyncLoginPage(AsyncPage, LoginPage):
+    """
+    AsyncLoginPage is the asyncio version of LoginPage; every method is awaitable.
+    """
+
+
+class AsyncHomePage(AsyncPage, HomePage):
+    """
+    AsyncHomePage is the asyncio version of HomePage; every method is awaitable and
+    `iter_items` is an async generator.
+    """
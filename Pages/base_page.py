@@ -1,4 +1,197 @@
-from selenium.common.exceptions import NoSuchElementException
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from types import FunctionType
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from Pages.element_cache import element_cache
+from Pages.locator_compiler import locator_compiler
+from Pages.page_snapshot import PageSnapshot, track_actions
+from Pages.waits import ABSENT, PRESENT, STABLE, TEXT_EQUALS, VISIBLE, poll_intervals, wait_recorder
+
+# Maximum age in seconds of a reused snapshot, so UI updates that happen without
+# an action (animations, async re-renders) are picked up eventually
+SNAPSHOT_MAX_AGE = 1.0
+
+# The page-object method that is running, e.g. 'HomePage.add_to_cart'. Only the outermost method
+# sets it, so commands and waits sent by BasePage helpers are attributed to the public method that
+# called them. Read by the wait recorder and the command recorder (see Utils/command_metrics.py).
+current_page_method = ContextVar("current_page_method", default=None)
+
+
+def enter_page_method(name: str):
+    """
+    Set `current_page_method` unless another page-object method already did.
+
+    :return: The token to pass to `leave_page_method`.
+    """
+    return current_page_method.set(name) if current_page_method.get() is None else None
+
+
+def leave_page_method(token):
+    """
+    Undo `enter_page_method`.
+    """
+    if token is not None:
+        current_page_method.reset(token)
+
+
+def page_method(function):
+    """
+    Decorate a page-object method so it sets `current_page_method` while it runs, unless another
+    page-object method already did. Works for plain methods, coroutines and (async) generators,
+    whose steps run with the method set. Every method of BasePage and its subclasses is decorated
+    when the class is created, except the ones written with `page_steps`, whose runner sets it.
+    """
+    def enter(page):
+        return enter_page_method(f"{type(page).__name__}.{function.__name__}")
+
+    if inspect.isasyncgenfunction(function):
+        @functools.wraps(function)
+        async def wrapper(self, *args, **kwargs):
+            steps = function(self, *args, **kwargs)
+            try:
+                while True:
+                    token = enter(self)
+                    try:
+                        value = await steps.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        leave_page_method(token)
+                    yield value
+            finally:
+                await steps.aclose()
+    elif inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            steps = function(self, *args, **kwargs)
+            try:
+                while True:
+                    token = enter(self)
+                    try:
+                        value = next(steps)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        leave_page_method(token)
+                    yield value
+            finally:
+                steps.close()
+    elif inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(self, *args, **kwargs):
+            token = enter(self)
+            try:
+                return await function(self, *args, **kwargs)
+            finally:
+                leave_page_method(token)
+    else:
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            token = enter(self)
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                leave_page_method(token)
+    return wrapper
+
+
+def page_steps(function):
+    """
+    Write a page-object method once for the sync pages and their async versions (see Pages/async_pages.py).
+
+    The method is a generator that yields every call talking to the device - driver and element
+    commands, other page-object methods, `_sleep` - and gets the result of the call back from the
+    yield, e.g. `snapshot = yield self.snapshot()`. The page's `_run` drives it: on a sync page the
+    call has already been made when it is yielded and its result is just passed back, an async page
+    awaits it first. An exception raised by the call is raised at the yield. Everything between
+    the yields - the decisions - is shared by both flavours. A method without I/O may simply return.
+    """
+    @functools.wraps(function)
+    def method(self, *args, **kwargs):
+        return self._run(function(self, *args, **kwargs), f"{type(self).__name__}.{function.__name__}")
+
+    method.runs_steps = True
+    return method
+
+
+def page_iterator(function):
+    """
+    Like `page_steps`, for a method the caller iterates over: it yields `Output(value)` for every
+    value of the iteration besides its calls, and the page's `_iterate` turns it into a generator
+    (or an async generator on an async page).
+    """
+    @functools.wraps(function)
+    def method(self, *args, **kwargs):
+        return self._iterate(function(self, *args, **kwargs), f"{type(self).__name__}.{function.__name__}")
+
+    method.runs_steps = True
+    return method
+
+
+class Output:
+    """
+    A value a `page_iterator` method hands to its caller, as opposed to the calls it yields.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def run_steps(steps, name: str):
+    """
+    Run a `page_steps` method on a sync page. Its calls have been made by the time they are
+    yielded, so their results are only passed back.
+
+    :param steps: The generator of the method, or its return value if it is not a generator.
+    :param name: The page-object method, e.g. 'HomePage.add_to_cart' (see `current_page_method`).
+    :return: The return value of the method.
+    """
+    if not inspect.isgenerator(steps):
+        return steps
+    token = enter_page_method(name)
+    try:
+        value = next(steps)
+        while True:
+            value = steps.send(value)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        leave_page_method(token)
+
+
+def iterate_steps(steps, name: str):
+    """
+    Run a `page_iterator` method on a sync page, generating its outputs. `current_page_method`
+    is only set while the method runs, not while the caller handles an output.
+    """
+    try:
+        value = None
+        while True:
+            token = enter_page_method(name)
+            try:
+                step = steps.send(value)
+            except StopIteration:
+                return
+            finally:
+                leave_page_method(token)
+            if isinstance(step, Output):
+                value = None
+                yield step.value
+            else:
+                value = step
+    finally:
+        steps.close()
+
+
+def _decorate_methods(cls):
+    for name, value in list(vars(cls).items()):
+        if (isinstance(value, FunctionType) and (name == "__init__" or not name.startswith("__"))
+                and not getattr(value, "runs_steps", False)):
+            setattr(cls, name, page_method(value))
+
 
 class BasePage:
     """
@@ -6,33 +199,328 @@ class BasePage:
     It provides reusable methods and common functionality to interact with the mobile application.
     """
 
+    # Let '/following-sibling::' XPath steps compile into UiSelector.fromParent (see Pages/locator_compiler.py).
+    # Only enable this in pages whose sibling locators are unique among all siblings, once their
+    # compiled lookups have been checked against UiAutomator2 on a device.
+    sibling_selectors = False
+
+    # I/O of the sync flavour; the async pages replace these and the runners (see Pages/async_pages.py)
+    _run = staticmethod(run_steps)
+    _iterate = staticmethod(iterate_steps)
+    _sleep = staticmethod(time.sleep)
+    _next = staticmethod(next)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _decorate_methods(cls)
+
     def __init__(self, driver, timeout: int = 10):
         """
         Initialize the BasePage.
 
+        The driver's implicit wait is switched off once per session: every lookup that needs to
+        wait says so explicitly through `wait_for`, so negative lookups return immediately.
+
         :param driver: Appium WebDriver instance for interacting with the app.
-        :param timeout: Default implicit wait timeout in seconds. Defaults to 10 seconds if not provided.
+        :param timeout: Default explicit wait timeout in seconds. Defaults to 10 seconds if not provided.
         """
         self.driver = driver
-        self.driver.implicitly_wait(timeout)  # Configure the implicit wait timeout.
+        self.timeout = timeout
+        if not getattr(self.driver, "implicit_wait_disabled", False):
+            self.driver.implicitly_wait(0)  # Sent once per session, not once per page object
+            self.driver.implicit_wait_disabled = True
+        track_actions(self.driver)  # Let snapshots notice clicks, typing and other actions
+        self.stable_anchor = None  # Root of the part of the screen `wait_until_stable` watches; None = whole screen
+        self._snapshot = None
+        self._snapshot_time = 0.0
 
-    def get_element(self, element):
+    @page_steps
+    def get_element(self, element, timeout: float = None):
         """
-        Locate a single element on the page.
+        Locate a single element on the page, waiting for it to be present.
 
         :param element: A tuple containing the locator strategy and the locator selector
                         (e.g., (By.XPATH, '//element_xpath')).
+        :param timeout: Maximum wait in seconds. Defaults to the page timeout; 0 checks once without waiting.
         :return: The located element if found, or None if the element is not found.
         """
         try:
-            return self.driver.find_element(*element)
-        except NoSuchElementException:
+            return (yield self.wait_for(element, PRESENT, timeout))
+        except TimeoutException:
             return None
 
     def set_wait(self, timeout: int):
         """
-        Adjust the implicit wait timeout for the driver.
+        Adjust the default explicit wait timeout of this page object.
+
+        :param timeout: The duration (in seconds) to use as the new default wait timeout.
+        """
+        self.timeout = timeout
 
-        :param timeout: The duration (in seconds) to set as the new implicit wait timeout.
+    @page_steps
+    def wait_until(self, predicate, timeout: float = None, condition: str = "custom"):
         """
-        self.driver.implicitly_wait(timeout)
+        Poll a predicate until it returns a truthy value.
+
+        Polling starts every 50 ms and backs off to every 500 ms. Stale element references
+        raised by the predicate count as "not yet". Every wait is recorded in the wait
+        recorder with the time it actually took.
+
+        :param predicate: Callable evaluated on every poll. On an async page its result is awaited.
+        :param timeout: Maximum wait in seconds. Defaults to the page timeout; 0 evaluates the predicate once.
+        :param condition: Name of the condition, used in the wait records and error message.
+        :return: The first truthy value returned by the predicate.
+        :raises TimeoutException: If the predicate did not return a truthy value within the timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        label = self._caller()
+        start = time.monotonic()
+        deadline = start + timeout
+        intervals = poll_intervals()
+        polls = 0
+        while True:
+            polls += 1
+            try:
+                result = yield predicate()
+            except StaleElementReferenceException:
+                result = None
+            if result:
+                wait_recorder.record(label, condition, timeout, time.monotonic() - start, True, polls)
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                wait_recorder.record(label, condition, timeout, time.monotonic() - start, False, polls)
+                raise TimeoutException(f"{label}: condition '{condition}' not met within {timeout} seconds.")
+            yield self._sleep(min(next(intervals), remaining))
+
+    @page_steps
+    def wait_for(self, locator, condition: str = PRESENT, timeout: float = None, text: str = None):
+        """
+        Wait for an element condition.
+
+        Conditions:
+            - PRESENT: an element matches the locator.
+            - VISIBLE: the first matching element is displayed.
+            - TEXT_EQUALS: the first matching element's text equals `text`.
+            - ABSENT: no element matches the locator.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :param condition: One of PRESENT, VISIBLE, TEXT_EQUALS or ABSENT (see Pages/waits.py).
+        :param timeout: Maximum wait in seconds. Defaults to the page timeout; 0 checks once.
+        :param text: The expected text for TEXT_EQUALS.
+        :return: The first matching element, or True for ABSENT.
+        :raises TimeoutException: If the condition was not met within the timeout.
+
+        Elements found with PRESENT are put into the element cache, so interacting with them
+        through `act` afterwards costs no further lookup.
+        """
+        native = self.native(locator)
+        element = yield self.wait_until(lambda: self._check_condition(native, condition, text), timeout, condition)
+        if condition == PRESENT:
+            element_cache.put(self.driver, native, element)
+        return element
+
+    @page_steps
+    def _check_condition(self, native, condition: str, text: str = None):
+        """
+        Check an element condition once (see `wait_for`).
+
+        :return: The first matching element, True for ABSENT, or None if the condition is not met.
+        """
+        elements = yield self.driver.find_elements(*native)
+        if condition == ABSENT:
+            return not elements
+        if not elements:
+            return None
+        element = elements[0]
+        if condition == VISIBLE and not (yield element.is_displayed()):
+            return None
+        if condition == TEXT_EQUALS and (yield element.get_attribute("text")) != text:
+            return None
+        return element
+
+    @page_steps
+    def act(self, locator, action, timeout: float = None):
+        """
+        Look up an element and run an action on it.
+
+        The element comes from the element cache when it was already found on this screen (see
+        Pages/element_cache.py). If its handle turns out to be stale, the screen has changed: the
+        cached handles are dropped, the element is looked up again and the action is retried once.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :param action: Callable taking the element. On an async page its result is awaited.
+        :param timeout: Maximum wait in seconds for the element. Defaults to the page timeout.
+        :return: The return value of the action.
+        :raises TimeoutException: If the element is not found within the timeout.
+        """
+        element = element_cache.get(self.driver, self.native(locator)) or (yield self.wait_for(locator, PRESENT, timeout))
+        try:
+            return (yield action(element))
+        except StaleElementReferenceException:
+            element_cache.invalidate(self.driver)
+            return (yield action((yield self.wait_for(locator, PRESENT, timeout))))
+
+    @page_steps
+    def click(self, locator, timeout: float = None):
+        """
+        Click an element (see `act`).
+        """
+        yield self.act(locator, lambda element: element.click(), timeout)
+
+    @page_steps
+    def clear_text(self, locator, timeout: float = None):
+        """
+        Clear a text field (see `act`).
+        """
+        yield self.act(locator, lambda element: element.clear(), timeout)
+
+    @page_steps
+    def type_text(self, locator, text: str, timeout: float = None):
+        """
+        Replace the content of a text field (see `act`).
+        """
+        yield self.act(locator, lambda element: self._replace_text(element, text), timeout)
+
+    @page_steps
+    def _replace_text(self, element, text: str):
+        """
+        Clear a text field element and type the text into it.
+        """
+        yield element.clear()
+        yield element.send_keys(text)
+
+    @page_steps
+    def wait_until_stable(self, samples: int = 3, timeout: float = None) -> float:
+        """
+        Wait until the screen stops changing, e.g. after an action that starts an animation,
+        re-renders the cart badge or brings the app back to the foreground.
+
+        The screen is fetched on the usual polling schedule and reduced to a fingerprint of the
+        class, text, content description and bounds of every node under the page's `stable_anchor`
+        (the whole screen if it has none), see `PageSnapshot.fingerprint`. The wait ends as soon as
+        `samples` consecutive fingerprints are the same. The last fetch becomes the page's snapshot,
+        so reading the settled screen needs no extra round trip.
+
+        :param samples: Number of consecutive identical samples that count as settled.
+        :param timeout: Maximum wait in seconds. Defaults to the page timeout.
+        :return: How long the screen took to settle, in seconds.
+        :raises TimeoutException: If the screen kept changing for the whole timeout.
+        """
+        state = {"fingerprint": None, "streak": 0}
+        start = time.monotonic()
+        yield self.wait_until(lambda: self._stability_sample(state, samples), timeout, STABLE)
+        return time.monotonic() - start
+
+    @page_steps
+    def _stability_sample(self, state: dict, samples: int) -> bool:
+        """
+        Take one sample of `wait_until_stable`. The fetched screen becomes the page's snapshot.
+
+        :param state: The fingerprint of the previous sample and the number of identical samples in a row.
+        :return: True once `samples` consecutive samples have the same fingerprint.
+        """
+        source = yield self._page_source()
+        self._snapshot = PageSnapshot(source, self.driver.action_generation)
+        self._snapshot_time = time.monotonic()
+        fingerprint = self._snapshot.fingerprint(self.stable_anchor)
+        state["streak"] = state["streak"] + 1 if fingerprint == state["fingerprint"] else 1
+        state["fingerprint"] = fingerprint
+        return state["streak"] >= samples
+
+    @page_steps
+    def is_visible(self, locator, timeout: float = None) -> bool:
+        """
+        Check whether an element is displayed, waiting for it up to the timeout.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :param timeout: Maximum wait in seconds. Defaults to the page timeout; 0 checks once.
+        :return: True if the element is displayed, False otherwise.
+        """
+        try:
+            return (yield self.wait_for(locator, VISIBLE, timeout)) is not None
+        except TimeoutException:
+            return False
+
+    @page_steps
+    def is_absent(self, locator, timeout: float = 0) -> bool:
+        """
+        Check that no element matches the locator.
+
+        This is the fast path for negative checks: with the default timeout of 0 it costs a single
+        `find_elements` call and returns in milliseconds, instead of waiting for a lookup to time out.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :param timeout: Time in seconds to wait for the element to disappear. Defaults to 0.
+        :return: True if no element matches, False if one is still present.
+        """
+        try:
+            return (yield self.wait_for(locator, ABSENT, timeout))
+        except TimeoutException:
+            return False
+
+    def native(self, locator):
+        """
+        Get the fastest exact equivalent of a locator for lookups on the device, e.g. an XPath
+        rewritten into a UiSelector chain. Snapshot queries keep using the original locator.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :return: The compiled locator tuple.
+        """
+        return locator_compiler.compile(locator, self.sibling_selectors)
+
+    @page_steps
+    def soft_reset(self) -> bool:
+        """
+        Bring this screen back to its initial state without restarting the app.
+        Used between the cases of batched tests (see the 'batched' marker in conftest.py).
+        Pages that support it override this method.
+
+        :return: True if the screen is back in its initial state, False if the app needs a full reset.
+        """
+        return False
+
+    @page_steps
+    def snapshot(self) -> PageSnapshot:
+        """
+        Get a local snapshot of the current screen for read-only queries.
+
+        The snapshot is fetched with a single `page_source` call and reused by later calls
+        until an action (click, send_keys, gestures, app lifecycle commands) is sent through
+        the driver, or until it is older than SNAPSHOT_MAX_AGE.
+
+        :return: A PageSnapshot of the current screen.
+        """
+        generation = self.driver.action_generation
+        if (self._snapshot is None or self._snapshot.generation != generation
+                or time.monotonic() - self._snapshot_time > SNAPSHOT_MAX_AGE):
+            self._snapshot = PageSnapshot((yield self._page_source()), generation)
+            self._snapshot_time = time.monotonic()
+        return self._snapshot
+
+    def _page_source(self) -> str:
+        """
+        Fetch the XML of the current screen.
+        """
+        return self.driver.page_source
+
+    def _perform(self, actions):
+        """
+        Send a W3C Actions sequence built with an ActionBuilder.
+        """
+        actions.perform()
+
+    def invalidate_snapshot(self):
+        """
+        Drop the current snapshot, so the next query fetches the screen again.
+        """
+        self._snapshot = None
+
+    def _caller(self) -> str:
+        """
+        Name the page-object method that issued the current wait, e.g. 'LoginPage.is_on_login_page'.
+        """
+        return current_page_method.get() or type(self).__name__
+
+
+_decorate_methods(BasePage)
@@ -0,0 +1,100 @@
+import json
+import threading
+from appium.webdriver.common.appiumby import AppiumBy
+
+# Locator strategies naming a view rather than its state; their handles survive clicks and typing
+IDENTITY_STRATEGIES = {AppiumBy.ACCESSIBILITY_ID, AppiumBy.ID}
+
+
+class ElementCache:
+    """
+    ElementCache keeps the WebElement handles found on the current screen, so interacting with
+    the same element again costs no lookup round trip.
+
+    Handles are cached per driver and locator, together with the driver's generations (see
+    `track_actions` in Pages/page_snapshot.py). Navigation, gestures and app lifecycle commands
+    start a new screen generation, which drops every cached handle. Handles found by accessibility
+    id or resource id are kept across clicks and typing, since they name a view and not its state;
+    handles found by any other locator (e.g. an XPath on a button label) are dropped by any action.
+
+    A click can still navigate away from a cached view. Its handle then raises
+    StaleElementReferenceException on use; `BasePage.act` invalidates the cache and looks the
+    element up again. Presence checks never read from the cache, only interactions do.
+    Code that restarts the app without going through the driver must call `clear`, or every
+    cached handle costs a failed action before it is looked up again.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0  # Interactions served from the cache, i.e. lookup round trips saved
+        self.misses = 0  # Interactions that had to look the element up
+        self.stale = 0  # Cached handles that turned out to be stale
+        self._lock = threading.Lock()
+
+    def get(self, driver, locator):
+        """
+        Get the cached handle of a locator, if it is still valid.
+
+        :param driver: Appium WebDriver instance.
+        :param locator: The (native) locator tuple the element was found with.
+        :return: The WebElement, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = getattr(driver, "element_handles", {}).get(locator)
+            if entry and entry[0] == driver.screen_generation and (
+                    locator[0] in IDENTITY_STRATEGIES or entry[1] == driver.action_generation):
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, driver, locator, element):
+        """
+        Cache the handle found for a locator.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            handles = getattr(driver, "element_handles", None)
+            if not handles or next(iter(handles.values()))[0] != driver.screen_generation:
+                handles = driver.element_handles = {}  # Handles of earlier screens are of no use any more
+            handles[locator] = (driver.screen_generation, driver.action_generation, element)
+
+    def invalidate(self, driver):
+        """
+        Drop every cached handle of the driver after one of them turned out to be stale.
+        """
+        self.clear(driver)
+        with self._lock:
+            self.stale += 1
+
+    def clear(self, driver):
+        """
+        Drop every cached handle of the driver, e.g. after the app process was restarted
+        without a lifecycle command sent through the driver.
+        """
+        with self._lock:
+            driver.screen_generation = getattr(driver, "screen_generation", 0) + 1
+            driver.element_handles = {}
+
+    def report(self) -> dict:
+        """
+        Summarize the cache use: hits (round trips saved), misses, stale handles and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "stale": self.stale,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+    def dump(self, path: str):
+        """
+        Write the report to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
+
+
+# Shared cache for every page object of the test run
+element_cache = ElementCache()
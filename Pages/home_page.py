@@ -1,7 +1,10 @@
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.common import NoSuchElementException
-from selenium.webdriver.common.by import By
-from Pages.base_page import BasePage
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.actions import interaction
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.pointer_input import PointerInput
+from Pages.base_page import BasePage, Output, page_iterator, page_steps
+from Pages.page_snapshot import bounds
 import logging
 
 logger = logging.getLogger("test_logger")  # Debug logger (if needed)
@@ -20,58 +23,172 @@ class HomePage(BasePage):
         """
         super().__init__(driver)  # Initialize the base class
         self.inventory_title = (AppiumBy.XPATH, '//android.widget.TextView[@text="PRODUCTS"]')  # Define the XPath to identify the inventory title
+        self.cart_icon = (AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Cart"]')  # Cart icon in the header
+        self.cart_badge = (AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Cart"]//android.widget.TextView')  # Quantity badge on the cart icon
+        self.item = (AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Item"]')  # Product tile
+        self.item_title = (AppiumBy.XPATH, './/android.widget.TextView[@content-desc="test-Item title"]')  # Title within a product tile
+        self.item_price = (AppiumBy.ACCESSIBILITY_ID, "test-Price")  # Price within a product tile
+        self.item_button = (AppiumBy.XPATH, './/android.view.ViewGroup[@content-desc="test-ADD TO CART" or @content-desc="test-REMOVE"]')  # Button within a product tile
+        self.product_list = (AppiumBy.ACCESSIBILITY_ID, "test-PRODUCTS")  # Scrollable product list
 
+    @page_steps
     def add_to_cart(self, item_title: str):
         """
         Add an item to the cart by its title.
 
         :param item_title: The title of the item to add to the cart.
-        :raises: NoSuchElementException if the "ADD TO CART" button is not found.
+        :raises: TimeoutException if the "ADD TO CART" button is not found.
         """
         # Generate the XPath for the "ADD TO CART" button of the specific item
         add_button_xpath = self.get_item_button_xpath(item_title, button_type="ADD TO CART")
-        add_button = self.driver.find_element(AppiumBy.XPATH, add_button_xpath)  # Find the button using XPath
+        add_button = (AppiumBy.XPATH, add_button_xpath)
+        yield self.find_item_button(add_button, item_title)  # Scrolls to the item if needed
 
-        # Click the "ADD TO CART" button
-        add_button.click()
+        # Click the "ADD TO CART" button, reusing the handle just found
+        yield self.click(add_button)
 
+    @page_steps
     def remove_from_cart(self, item_title: str):
         """
         Remove an item from the cart by its title.
 
         :param item_title: The title of the item to remove from the cart.
-        :raises: NoSuchElementException if the "REMOVE" button is not found.
+        :raises: TimeoutException if the "REMOVE" button is not found.
         """
         # Generate the XPath for the "REMOVE" button of the specific item
         remove_button_xpath = self.get_item_button_xpath(item_title, button_type="REMOVE")
-        remove_button = self.driver.find_element(AppiumBy.XPATH, remove_button_xpath)  # Find the button using XPath
+        remove_button = (AppiumBy.XPATH, remove_button_xpath)
+        yield self.find_item_button(remove_button, item_title)  # Scrolls to the item if needed
 
-        # Click the "REMOVE" button
-        remove_button.click()
+        # Click the "REMOVE" button, reusing the handle just found
+        yield self.click(remove_button)
 
-    def get_cart_quantity(self) -> int | None:
+    @page_steps
+    def add_many(self, item_titles: list[str]) -> int | None:
+        """
+        Add several items to the cart at once.
+
+        The "ADD TO CART" buttons of all items on screen are located in a single page snapshot and
+        tapped in one W3C Actions sequence, then the cart badge is checked once. Items on screen
+        that are already in the cart are skipped. Items that are not on screen are added one by one
+        with `add_to_cart`, which scrolls to them.
+
+        :param item_titles: The titles of the items to add. Duplicates are added once.
+        :return: The cart quantity after adding the items (see `get_cart_quantity`).
+        :raises: TimeoutException if the button of an item that is not on screen is not found, or if
+                 the cart badge does not show the expected quantity (a tap did not register).
+        """
+        return (yield self._tap_many(item_titles, "ADD TO CART", self.add_to_cart, +1))
+
+    @page_steps
+    def remove_many(self, item_titles: list[str]) -> int | None:
+        """
+        Remove several items from the cart at once, like `add_many` does for adding them.
+        Items on screen that are not in the cart are skipped.
+
+        :param item_titles: The titles of the items to remove. Duplicates are removed once.
+        :return: The cart quantity after removing the items (see `get_cart_quantity`).
+        :raises: TimeoutException if the button of an item that is not on screen is not found, or if
+                 the cart badge does not show the expected quantity (a tap did not register).
+        """
+        return (yield self._tap_many(item_titles, "REMOVE", self.remove_from_cart, -1))
+
+    @page_steps
+    def _tap_many(self, item_titles: list[str], button_type: str, one_by_one, change: int) -> int | None:
+        """
+        Tap the given button of several items in one W3C Actions sequence and wait for the cart badge.
+        """
+        titles = list(dict.fromkeys(item_titles))  # Tapping a button twice would undo the first tap
+        snapshot = yield self.snapshot()
+        expected = (yield self.get_cart_quantity()) or 0
+        taps, off_screen = self._locate_taps(snapshot, titles, button_type)
+
+        if taps:
+            yield self._perform(self._tap_sequence(taps))
+            expected += change * len(taps)
+        for title in off_screen:
+            yield one_by_one(title)
+            expected += change
+
+        # Check the badge once, re-reading the screen until it shows the expected count
+        try:
+            yield self.wait_until(lambda: self._cart_quantity_is(expected), condition="cart quantity")
+        except TimeoutException as error:
+            actual = yield self.get_cart_quantity()
+            raise TimeoutException(f"{self._caller()}: cart quantity is {actual}, expected {expected}"
+                                   f" after tapping '{button_type}' of {len(titles)} items.") from error
+        return (yield self.get_cart_quantity())
+
+    @page_steps
+    def _cart_quantity_is(self, expected: int) -> bool:
+        """
+        Read the screen again and check whether the cart badge shows the expected quantity.
+        """
+        return (yield self.get_cart_quantity(fresh=True)) == expected
+
+    def _locate_taps(self, snapshot, titles: list[str], button_type: str) -> tuple[list, list]:
+        """
+        Find the centers of the given button of the items on screen. Items on screen that show the
+        other button are already in the cart (or not in it) and are skipped.
+
+        :return: The tap coordinates, and the titles of the items that are not on screen.
+        """
+        other_type = "REMOVE" if button_type == "ADD TO CART" else "ADD TO CART"
+        taps, off_screen = [], []
+        for title in titles:
+            button = snapshot.find((AppiumBy.XPATH, self.get_item_button_xpath(title, button_type)))
+            if button is None:
+                if snapshot.is_present((AppiumBy.XPATH, self.get_item_button_xpath(title, other_type))):
+                    logger.info("Item '%s' shows '%s' already, not tapping '%s'.", title, other_type, button_type)
+                else:
+                    off_screen.append(title)
+                continue
+            left, top, right, bottom = bounds(button)
+            taps.append(((left + right) // 2, (top + bottom) // 2))
+        return taps, off_screen
+
+    def _tap_sequence(self, taps: list) -> ActionBuilder:
+        """
+        Build one W3C Actions sequence tapping the given coordinates one after the other.
+        """
+        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "finger"))
+        for x, y in taps:
+            actions.pointer_action.move_to_location(x, y).pointer_down().pause(0.05).pointer_up()
+        return actions
+
+    @page_steps
+    def get_cart_quantity(self, fresh: bool = False) -> int | None:
         """
         Retrieve the quantity of items in the cart.
 
+        :param fresh: Read the screen again even if the current snapshot is still considered up to date
+                      (e.g. when polling for the badge to update).
+
         :return:
             - An integer representing the quantity if found.
             - 0 if the cart icon is present but no items are in it.
             - None if the cart icon is not found, or if quantity contains unexpected characters.
         """
-        cart_present = None  # Placeholder to track cart presence
-        try:
-            cart_present = self.driver.find_element(By.XPATH, '//android.view.ViewGroup[@content-desc="test-Cart"]')  # Find the cart icon
-            cart_quantity = self.driver.find_element(By.XPATH, '//android.view.ViewGroup[@content-desc="test-Cart"]//android.widget.TextView').get_attribute("text")  # Get cart quantity text
-            if cart_quantity.isdigit():
-                return int(cart_quantity)  # Valid cart quantity
-            else:
-                return None  # Unexpected characters in cart quantity
-        except NoSuchElementException:
-            if cart_present:
-                return 0  # Cart is present but no items yet
-            else:
-                return None  # Cart icon not present
+        if fresh:
+            self.invalidate_snapshot()
+        return self._read_cart_quantity((yield self.snapshot()))  # One page source call answers both lookups
+
+    def _read_cart_quantity(self, snapshot) -> int | None:
+        """
+        Read the cart quantity from a snapshot (see `get_cart_quantity`).
+        """
+        if not snapshot.is_present(self.cart_icon):
+            return None  # Cart icon not present
+
+        cart_quantity = snapshot.attribute(self.cart_badge, "text")  # Get cart quantity text
+        if cart_quantity is None:
+            return 0  # Cart is present but no items yet
+        if cart_quantity.isdigit():
+            return int(cart_quantity)  # Valid cart quantity
+        else:
+            return None  # Unexpected characters in cart quantity
 
+    @page_steps
     def is_logged_in(self):
         """
         Verifies if the user is logged in by checking the visibility of the inventory title.
@@ -79,34 +196,147 @@ class HomePage(BasePage):
         Returns:
             bool: True if the user is on the home screen, False otherwise.
         """
-        try:
-            element = self.get_element(self.inventory_title)  # Get the element for the inventory title
-            return element is not None and element.is_displayed()  # Check if the element is displayed
-        except NoSuchElementException:
-            return False  # If element is not found, user is not logged in
+        return (yield self.is_visible(self.inventory_title))  # Wait for the inventory title to be displayed
 
+    @page_steps
     def get_available_items(self) -> list[str]:
         """
         Get the titles of all available items on the home page.
 
         :return: A list of item titles. Returns an empty list if no items are found.
         """
-        items = self.driver.find_elements(By.XPATH, '//android.view.ViewGroup[@content-desc="test-Item"]')  # Find all item elements
-        logger.info(f"Number of items found: {len(items)}")  # Log the number of items found
+        return self._read_item_titles((yield self.snapshot()))  # One page source call instead of 2N+1 element lookups
+
+    def _read_item_titles(self, snapshot) -> list[str]:
+        """
+        Read the titles of the items in a snapshot (see `get_available_items`).
+        """
+        items = snapshot.find_all(self.item)  # Find all item elements
+        logger.info("Number of items found: %s", len(items))  # Log the number of items found
 
         titles = []
         for item in items:
-            try:
-                # Get the title of each item
-                item_title = item.find_element(By.XPATH,
-                                               './/android.widget.TextView[@content-desc="test-Item title"]').get_attribute('text')
-                logger.info(f"Item title: {item_title}")  # Log the item title
-                titles.append(item_title)  # Append the item title to the list
-            except NoSuchElementException:
+            # Get the title of each item
+            item_title = snapshot.attribute(self.item_title, "text", within=item)
+            if item_title is None:
                 logger.warning("Item found, but title could not be retrieved.")  # Log warning if title is not found
+                continue
+            logger.debug("Item title: %s", item_title)  # Log the item title
+            titles.append(item_title)  # Append the item title to the list
 
         return titles  # Return the list of item titles
 
+    @page_iterator
+    def iter_items(self, max_scrolls: int = 100, from_top: bool = True, seen: set = None):
+        """
+        Iterate over the products of the list, scrolling down through it as needed.
+
+        The list is first scrolled back to the top, so every product is yielded, in list order.
+        Items are read from a page snapshot of the current scroll position, then the list is
+        scrolled by one step and the next snapshot is read, until the end of the list is reached.
+        Items seen at several scroll positions are yielded once. Items cut off at the edge of the
+        list are yielded from the next scroll position, once they are fully rendered. As this is
+        a generator, a caller that stops early (e.g. once it found its item) saves the remaining scrolls.
+
+        :param max_scrolls: Maximum number of scroll steps, as a safeguard against endless lists.
+        :param from_top: False starts from the current scroll position and skips the products above it.
+        :param seen: Titles not to yield; the yielded titles are added to it. A scroll step that
+                     reveals only titles of this set ends the iteration.
+        :return: A generator of item records: dictionaries with 'title', 'price', 'button'
+                 ('ADD TO CART' or 'REMOVE') and 'bounds' (left, top, right, bottom).
+        """
+        seen = set() if seen is None else seen
+        at_end = False
+        if from_top:
+            yield self.scroll_to_top(max_scrolls)
+        for scrolls in range(max_scrolls + 1):
+            snapshot = yield self.snapshot()
+            new_items = 0
+            for record in self._read_new_items(snapshot, seen):
+                new_items += 1
+                yield Output(record)
+
+            if at_end or (scrolls and not new_items):
+                return  # End of the list, or the last scroll did not reveal anything new
+            product_list = snapshot.find(self.product_list)
+            if product_list is None:
+                return
+            at_end = not (yield self.scroll_list(bounds(product_list)))
+
+    def _read_new_items(self, snapshot, seen: set):
+        """
+        Read the item records of a snapshot (see `iter_items`), skipping the titles in `seen`
+        and adding the others to it.
+        """
+        for item in snapshot.find_all(self.item):
+            title = snapshot.attribute(self.item_title, "text", within=item)
+            button = snapshot.find(self.item_button, within=item)
+            if title is None or button is None or title in seen:
+                continue  # Cut off at the edge of the list, or already yielded
+            seen.add(title)
+            yield {"title": title, "price": snapshot.attribute(self.item_price, "text", within=item),
+                   "button": button.get("content-desc").removeprefix("test-"), "bounds": bounds(item)}
+
+    @page_steps
+    def scroll_list(self, list_bounds: tuple, direction: str = "down") -> bool:
+        """
+        Scroll the product list by about three quarters of its height.
+
+        :param list_bounds: Bounds (left, top, right, bottom) of the product list.
+        :param direction: 'down' or 'up'.
+        :return: True if the list can be scrolled further in that direction.
+        """
+        return bool((yield self.driver.execute_script("mobile: scrollGesture", self._scroll_gesture(list_bounds, direction))))
+
+    @page_steps
+    def scroll_to_top(self, max_scrolls: int = 100):
+        """
+        Scroll the product list back to its top. Costs a single gesture if it is already there.
+
+        :param max_scrolls: Maximum number of scroll steps.
+        """
+        product_list = (yield self.snapshot()).find(self.product_list)
+        if product_list is None:
+            return
+        list_bounds = bounds(product_list)
+        for _ in range(max_scrolls):
+            if not (yield self.scroll_list(list_bounds, "up")):
+                return
+
+    @staticmethod
+    def _scroll_gesture(list_bounds: tuple, direction: str) -> dict:
+        """
+        Arguments of the `mobile: scrollGesture` scrolling a list by about three quarters of its height.
+        """
+        left, top, right, bottom = list_bounds
+        return {"left": left, "top": top, "width": right - left, "height": bottom - top,
+                "direction": direction, "percent": 0.75}
+
+    @page_steps
+    def find_item_button(self, locator, item_title: str):
+        """
+        Find the button of an item, scrolling through the list until the item shows up.
+
+        The button is first looked up on the current screen. If it is not there, the list is
+        scrolled down from the current position (with `iter_items`), then, if the item was not
+        below, from the top down to where the first pass started, stopping as soon as the item is found.
+
+        :param locator: Locator of the button.
+        :param item_title: The title of the item the button belongs to.
+        :return: The button element.
+        :raises: TimeoutException if the button is not found, at once if the item is not in the list.
+        """
+        button = yield self.get_element(locator, timeout=0)
+        if button is not None:
+            return button
+        seen = set()
+        for from_top in (False, True):
+            items = self.iter_items(from_top=from_top, seen=seen)
+            while (item := (yield self._next(items, None))) is not None:
+                if item["title"] == item_title:
+                    return (yield self.wait_for(locator))
+        raise TimeoutException(f"Item '{item_title}' is not in the product list.")
+
     @staticmethod
     def get_item_button_xpath(item_title: str, button_type: str) -> str:
         """
@@ -0,0 +1,160 @@
+import json
+import re
+import threading
+from appium.webdriver.common.appiumby import AppiumBy
+
+# XPath attributes that have a UiSelector equivalent
+UISELECTOR_ATTRIBUTES = {"text": "text", "content-desc": "description", "resource-id": "resourceId"}
+
+# One location step: separator, node test and optional predicate, e.g. '//android.widget.TextView[@text="PRODUCTS"]'
+_STEP = re.compile(r"""(//|/following-sibling::)([\w.]+|\*)(?:\[([^\[\]]*)\])?""")
+# One condition of a predicate, e.g. '@content-desc="test-Cart"'
+_CONDITION = re.compile(r"""\s*@([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')\s*""")
+_AND = re.compile(r"and\s+")
+
+
+class LocatorCompiler:
+    """
+    LocatorCompiler rewrites XPath locators into native UiAutomator2 locators.
+
+    UiAutomator2 answers an XPath lookup by dumping and walking the whole screen hierarchy,
+    while accessibility ids and `-android uiautomator` UiSelector chains are resolved by the
+    accessibility framework directly. Only the XPath subset with a documented UiSelector
+    counterpart is translated: descendant steps with class names and equality checks on text,
+    content-desc and resource-id. Anything else (functions, positions, child and parent axes, ...)
+    stays XPath. The unit tests compare both lookups on the fake Appium server's emulation of
+    UiSelector, not on UiAutomator2, so a translation is checked on a device before a page relies
+    on it. Compiled locators are cached, and the locators that were left as XPath are reported.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.unoptimized = {}  # XPath -> reason it was left as is
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def compile(self, locator, sibling_selectors: bool = False) -> tuple[str, str]:
+        """
+        Translate a locator into the fastest equivalent locator.
+
+        :param locator: A tuple containing the locator strategy and the locator selector.
+        :param sibling_selectors: Also translate '/following-sibling::' steps into UiSelector.fromParent.
+                                  fromParent matches preceding siblings as well, so this is only
+                                  equivalent when the sibling locator is unique among all siblings.
+        :return: The compiled locator tuple, or the locator itself if it cannot be translated.
+        """
+        strategy, selector = locator
+        if strategy != AppiumBy.XPATH or not self.enabled:
+            return locator
+        key = (selector, sibling_selectors)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        try:
+            compiled = translate(selector, sibling_selectors)
+        except ValueError as reason:
+            compiled = locator
+            with self._lock:
+                self.unoptimized[selector] = str(reason)
+        with self._lock:
+            self._cache[key] = compiled
+        return compiled
+
+    def report(self) -> dict:
+        """
+        Summarize the compiled locators and the ones left as XPath.
+
+        :return: A dictionary with the number of compiled locators and the unoptimized XPaths with reasons.
+        """
+        with self._lock:
+            return {"compiled": sum(1 for (selector, _), compiled in self._cache.items() if compiled[1] != selector),
+                    "unoptimized": dict(self.unoptimized)}
+
+    def dump(self, path: str):
+        """
+        Write the report to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
+
+
+def translate(xpath: str, sibling_selectors: bool = False) -> tuple[str, str]:
+    """
+    Translate an absolute XPath into an accessibility id or UiSelector locator.
+
+    :param xpath: The XPath expression.
+    :param sibling_selectors: Allow '/following-sibling::' steps (see LocatorCompiler.compile).
+    :return: The native locator tuple.
+    :raises ValueError: If the XPath has no native counterpart; the message says why.
+    """
+    steps, position = [], 0
+    while position < len(xpath):
+        match = _STEP.match(xpath, position)
+        if not match:
+            if re.match(r"/[\w*]", xpath[position:]):
+                raise ValueError("child axis")
+            raise ValueError(f"unsupported syntax at '{xpath[position:]}'")
+        separator, node_test, predicate = match.groups()
+        if separator != "//" and not sibling_selectors:
+            raise ValueError("following-sibling axis")
+        if separator != "//" and not steps:
+            raise ValueError("starts with an axis")
+        steps.append((separator, node_test, conditions(predicate)))
+        position = match.end()
+    if not steps:
+        raise ValueError("empty expression")
+
+    # A single '//*[@content-desc="..."]' step is an accessibility id lookup
+    if len(steps) == 1 and steps[0][1] == "*" and list(steps[0][2]) == ["content-desc"]:
+        return AppiumBy.ACCESSIBILITY_ID, steps[0][2]["content-desc"]
+
+    chain = ""
+    for separator, node_test, attributes in reversed(steps):
+        selector = "new UiSelector()"
+        if node_test != "*":
+            selector += f'.className("{java_string(node_test)}")'
+        for name, value in attributes.items():
+            selector += f'.{UISELECTOR_ATTRIBUTES[name]}("{java_string(value)}")'
+        if chain:
+            selector += f".{chain_method}({chain})"
+        chain, chain_method = selector, "childSelector" if separator == "//" else "fromParent"
+    return AppiumBy.ANDROID_UIAUTOMATOR, chain
+
+
+def conditions(predicate: str | None) -> dict:
+    """
+    Parse a predicate made of '@attribute="value"' checks joined by 'and'.
+
+    :raises ValueError: If the predicate uses anything else.
+    """
+    if predicate is None:
+        return {}
+    attributes, position = {}, 0
+    while position < len(predicate):
+        match = _CONDITION.match(predicate, position)
+        if not match:
+            raise ValueError(f"unsupported predicate '{predicate[position:].strip()}'")
+        name, value = match.group(1), match.group(2) if match.group(2) is not None else match.group(3)
+        if name not in UISELECTOR_ATTRIBUTES:
+            raise ValueError(f"attribute @{name} has no UiSelector equivalent")
+        if name in attributes:
+            raise ValueError(f"attribute @{name} tested twice")
+        position = match.end()
+        joiner = _AND.match(predicate, position)
+        if joiner and joiner.end() < len(predicate):
+            position = joiner.end()
+        elif position < len(predicate):
+            raise ValueError(f"unsupported predicate '{predicate[position:].strip()}'")
+        attributes[name] = value
+    return attributes
+
+
+def java_string(value: str) -> str:
+    """
+    Escape a value for a Java string literal in a UiSelector expression.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Shared compiler for every page object of the test run
+locator_compiler = LocatorCompiler()
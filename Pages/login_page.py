@@ -1,6 +1,6 @@
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.common.exceptions import NoSuchElementException
-from Pages.base_page import BasePage
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from Pages.base_page import BasePage, page_steps
 
 class LoginPage(BasePage):
     """
@@ -23,7 +23,11 @@ class LoginPage(BasePage):
         self.username_field = (AppiumBy.ACCESSIBILITY_ID, "test-Username")
         self.password_field = (AppiumBy.ACCESSIBILITY_ID, "test-Password")
         self.login_button = (AppiumBy.ACCESSIBILITY_ID, "test-LOGIN")
+        self.error_box = (AppiumBy.ACCESSIBILITY_ID, "test-Error message")
+        self.error_dismiss = (AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Error message"]/android.view.ViewGroup')
+        self.stable_anchor = (AppiumBy.ACCESSIBILITY_ID, "test-Login")  # The login form, with its error message
 
+    @page_steps
     def perform_login(self, username: str, password: str):
         """
         Perform a login attempt using the provided username and password.
@@ -34,19 +38,14 @@ class LoginPage(BasePage):
         :param username: The username to input into the login form.
         :param password: The password to input into the login form.
         """
-        # Clear and fill in the username field
-        username_field = self.driver.find_element(*self.username_field)
-        username_field.clear()
-        username_field.send_keys(username)
-
-        # Clear and fill in the password field
-        password_field = self.driver.find_element(*self.password_field)
-        password_field.clear()
-        password_field.send_keys(password)
+        # Clear and fill in the username and password fields; typing keeps the cached field handles valid
+        yield self.type_text(self.username_field, username)
+        yield self.type_text(self.password_field, password)
 
         # Click the login button to attempt login
-        self.driver.find_element(*self.login_button).click()
+        yield self.click(self.login_button)
 
+    @page_steps
     def is_on_login_page(self):
         """
         Check if the current page is the login page.
@@ -56,22 +55,57 @@ class LoginPage(BasePage):
 
         :return: True if login page is loaded and login button is visible, False otherwise.
         """
-        login_button = self.get_element(self.login_button)
-        return login_button is not None and login_button.is_displayed()
+        return (yield self.is_visible(self.login_button))
 
-    def is_error_message_present(self, text: str) -> bool:
+    @page_steps
+    def is_error_message_present(self, text: str, timeout: float = None) -> bool:
         """
         Check if an error message with the given text is displayed on the screen.
 
-        This method searches for a TextView element that matches the provided
-        error message and verifies if it is displayed.
+        This method first waits until the outcome of the login attempt is on screen - an error
+        box, or the login form gone - and then checks the error text once. A different error
+        or a successful login therefore answers False right away instead of after a timeout.
 
         :param text: The exact text of the error message to look for.
+        :param timeout: Maximum wait in seconds for the outcome. Defaults to the page timeout.
         :return: True if the error message is found and displayed, False otherwise.
         """
         try:
-            # Locate the error message by its exact text
-            error_message = self.driver.find_element(AppiumBy.XPATH, f'//android.widget.TextView[@text="{text}"]')
-            return error_message.is_displayed()
-        except NoSuchElementException:
+            yield self.wait_until(self._login_outcome, timeout, "login outcome")
+        except TimeoutException:
+            return False
+
+        # Locate the error message by its exact text
+        error_message = (AppiumBy.XPATH, f'//android.widget.TextView[@text="{text}"]')
+        return (yield self.is_visible(error_message, timeout=0))
+
+    @page_steps
+    def _login_outcome(self) -> bool:
+        """
+        Check once whether the outcome of a login attempt is on screen: an error box, or the login form gone.
+        """
+        return bool((yield self.driver.find_elements(*self.error_box))
+                    or not (yield self.driver.find_elements(*self.login_button)))
+
+    @page_steps
+    def soft_reset(self) -> bool:
+        """
+        Bring the login form back to its initial state without restarting the app.
+
+        Both fields are cleared and the error message, if any, is dismissed. This is much cheaper
+        than terminating the app and clearing its data, and is enough between two login attempts.
+
+        :return: True if the clean login form is shown, False if the app needs a full reset
+                 (e.g. the previous attempt logged in, or the error could not be dismissed).
+        """
+        try:
+            if not (yield self.is_visible(self.login_button, timeout=0)):
+                return False
+            yield self.clear_text(self.username_field, timeout=0)
+            yield self.clear_text(self.password_field, timeout=0)
+            dismiss = yield self.get_element(self.error_dismiss, timeout=0)
+            if dismiss:
+                yield dismiss.click()
+            return (yield self.is_absent(self.error_box, timeout=1))
+        except WebDriverException:
             return False
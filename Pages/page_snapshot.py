@@ -0,0 +1,183 @@
+import hashlib
+from functools import lru_cache
+from appium.webdriver.common.appiumby import AppiumBy
+from lxml import etree
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+# WebDriver commands that may change what is on screen
+ACTION_COMMANDS = {
+    Command.CLICK_ELEMENT, Command.SEND_KEYS_TO_ELEMENT, Command.CLEAR_ELEMENT, "clear",
+    Command.W3C_ACTIONS, Command.GO_BACK, Command.GET, "background", "hideKeyboard", "pressKeyCode", "keyEvent",
+}
+# Commands that navigate or move the screen content (gestures); app lifecycle scripts count as well
+NAVIGATION_COMMANDS = {Command.W3C_ACTIONS, Command.GO_BACK, Command.GET, "background"}
+# `mobile:` execute methods that only read state and therefore keep snapshots valid
+READ_ONLY_SCRIPTS = {
+    "mobile: getCurrentPackage", "mobile: getCurrentActivity", "mobile: queryAppState",
+    "mobile: isAppInstalled", "mobile: getPerformanceData", "mobile: getPerformanceDataTypes",
+}
+
+
+def track_actions(driver):
+    """
+    Make the driver count the commands that may change the screen.
+
+    Every action (click, typing, gestures, app lifecycle scripts, ...) bumps
+    `driver.action_generation`, which is how snapshots taken before the action know they
+    are outdated - including actions sent directly through WebElement methods. Navigation,
+    gestures and `mobile:` scripts also bump `driver.screen_generation`, which drops the
+    cached element handles (see Pages/element_cache.py).
+    Installing the tracker twice on the same driver has no effect.
+
+    :param driver: Appium WebDriver instance.
+    """
+    if hasattr(driver, "action_generation"):
+        return
+    driver.action_generation = 0
+    driver.screen_generation = 0
+    execute = driver.execute
+
+    def tracked_execute(driver_command, params=None):
+        script = driver_command == Command.W3C_EXECUTE_SCRIPT and (params or {}).get("script") not in READ_ONLY_SCRIPTS
+        if driver_command in ACTION_COMMANDS or script:
+            driver.action_generation += 1
+        if driver_command in NAVIGATION_COMMANDS or script:
+            driver.screen_generation += 1
+        return execute(driver_command, params)
+
+    driver.execute = tracked_execute
+
+
+def bounds(node) -> tuple[int, int, int, int] | None:
+    """
+    Parse the UiAutomator2 bounds attribute of a snapshot node, e.g. '[0,400][1080,850]'.
+
+    :return: A tuple (left, top, right, bottom), or None if the node has no bounds.
+    """
+    value = node.get("bounds")
+    if not value:
+        return None
+    return tuple(int(number) for number in value.replace("][", ",").strip("[]").split(","))
+
+
+@lru_cache(maxsize=256)
+def _compiled_xpath(xpath: str) -> etree.XPath:
+    """
+    Compile an XPath expression once and reuse it for every snapshot.
+    """
+    return etree.XPath(xpath)
+
+
+class PageSnapshot:
+    """
+    PageSnapshot is a local, read-only copy of the screen hierarchy.
+
+    It is built from a single `page_source` call and answers read-only queries (presence,
+    counts, texts, attributes) without further round trips to the Appium server. Accessibility
+    ids, resource ids and class names are served from an index built in one pass over the tree;
+    XPath locators are evaluated on the tree with compiled, cached expressions.
+    """
+
+    def __init__(self, source: str, generation: int = 0):
+        """
+        Initialize the PageSnapshot.
+
+        :param source: The page source (UiAutomator2 XML hierarchy).
+        :param generation: The driver's action generation at the time the source was fetched.
+        """
+        self.root = etree.fromstring(source.encode("utf-8"))
+        self.generation = generation
+        self._index = None
+        self._results = {}
+
+    def find_all(self, locator, within=None) -> list:
+        """
+        Find every node matching the locator.
+
+        :param locator: A tuple containing the locator strategy and the locator selector
+                        (e.g., (AppiumBy.ACCESSIBILITY_ID, 'test-Cart')).
+        :param within: Optional node to search under. XPath locators are then evaluated relative
+                       to it (e.g. './/android.widget.TextView').
+        :return: A list of matching nodes, in document order.
+        :raises ValueError: If the locator strategy cannot be resolved locally.
+        """
+        strategy, selector = locator
+        if within is not None:
+            if strategy == AppiumBy.XPATH:
+                return _compiled_xpath(selector)(within)
+            return [node for node in within.iter() if node is not within and node in self._lookup(strategy, selector)]
+
+        if locator not in self._results:
+            if strategy == AppiumBy.XPATH:
+                self._results[locator] = _compiled_xpath(selector)(self.root)
+            else:
+                self._results[locator] = self._lookup(strategy, selector)
+        return self._results[locator]
+
+    def find(self, locator, within=None):
+        """
+        Find the first node matching the locator.
+
+        :return: The first matching node, or None if nothing matches.
+        """
+        nodes = self.find_all(locator, within)
+        return nodes[0] if nodes else None
+
+    def is_present(self, locator) -> bool:
+        """
+        Check whether at least one node matches the locator.
+        """
+        return bool(self.find_all(locator))
+
+    def count(self, locator) -> int:
+        """
+        Count the nodes matching the locator.
+        """
+        return len(self.find_all(locator))
+
+    def texts(self, locator, within=None) -> list[str]:
+        """
+        Get the 'text' attribute of every node matching the locator.
+        """
+        return [node.get("text") for node in self.find_all(locator, within)]
+
+    def attribute(self, locator, name: str, within=None) -> str | None:
+        """
+        Get an attribute of the first node matching the locator.
+
+        :param name: Attribute name as used by UiAutomator2 (e.g. 'text', 'content-desc', 'bounds').
+        :return: The attribute value, or None if no node matches.
+        """
+        node = self.find(locator, within)
+        return node.get(name) if node is not None else None
+
+    def fingerprint(self, locator=None) -> str:
+        """
+        Digest of the class, text, content description and bounds of every node under the first node
+        matching the locator, or of the whole screen if the locator is None or matches nothing.
+        Two snapshots of an unchanged screen have the same one.
+        """
+        node = self.find(locator) if locator else None
+        digest = hashlib.blake2b(digest_size=16)
+        for element in (self.root if node is None else node).iter():
+            digest.update("\x1f".join((element.tag, element.get("text", ""), element.get("content-desc", ""),
+                                       element.get("bounds", ""))).encode("utf-8") + b"\x1e")
+        return digest.hexdigest()
+
+    def _lookup(self, strategy: str, selector: str) -> list:
+        if self._index is None:
+            self._index = {}
+            for node in self.root.iter():
+                for key in ((AppiumBy.ACCESSIBILITY_ID, node.get("content-desc")),
+                            (By.ID, node.get("resource-id")), (By.CLASS_NAME, node.tag)):
+                    if key[1]:
+                        self._index.setdefault(key, []).append(node)
+
+        if strategy == By.ID and ":id/" not in selector:
+            # UiAutomator2 accepts ids without the package prefix
+            return [node for (kind, value), nodes in self._index.items() if kind == By.ID
+                    and value.endswith(f":id/{selector}") for node in nodes]
+        if strategy not in (AppiumBy.ACCESSIBILITY_ID, By.ID, By.CLASS_NAME):
+            raise ValueError(f"Locator strategy '{strategy}' cannot be resolved from a page snapshot.")
+        return self._index.get((strategy, selector), [])
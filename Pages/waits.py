@@ -0,0 +1,93 @@
+import json
+import threading
+
+# Conditions understood by BasePage.wait_for
+PRESENT = "present"
+VISIBLE = "visible"
+ABSENT = "absent"
+TEXT_EQUALS = "text_equals"
+STABLE = "stable"  # Used by BasePage.wait_until_stable
+
+# Polling schedule: start fast, back off towards the maximum interval
+FIRST_POLL = 0.05
+MAX_POLL = 0.5
+BACKOFF = 1.5
+
+
+def poll_intervals(first: float = FIRST_POLL, maximum: float = MAX_POLL, backoff: float = BACKOFF):
+    """
+    Generate the sleep intervals between two polls of a wait: 50 ms, 75 ms, 112 ms, ... up to 500 ms.
+
+    Short first intervals let conditions that are met almost immediately finish quickly,
+    the backoff keeps long waits from flooding the Appium server with requests.
+    """
+    interval = first
+    while True:
+        yield interval
+        interval = min(interval * backoff, maximum)
+
+
+class WaitRecorder:
+    """
+    WaitRecorder keeps track of how long each wait actually took.
+
+    Every wait is recorded under the page-object method that issued it, together with its
+    condition, its timeout and whether the condition was met. The summary shows how much of
+    each timeout is really needed, so timeouts can be tuned from real data.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, label: str, condition: str, timeout: float, elapsed: float, satisfied: bool, polls: int):
+        """
+        Record one finished wait.
+
+        :param label: The page-object method that waited (e.g. 'LoginPage.is_on_login_page').
+        :param condition: The awaited condition (present, visible, absent, text_equals, ...).
+        :param timeout: The timeout of the wait in seconds.
+        :param elapsed: How long the wait actually took in seconds.
+        :param satisfied: True if the condition was met, False if the wait timed out.
+        :param polls: Number of times the condition was evaluated.
+        """
+        with self._lock:
+            self.records.append({"label": label, "condition": condition, "timeout": timeout,
+                                 "elapsed": round(elapsed, 4), "satisfied": satisfied, "polls": polls})
+
+    def summary(self) -> dict:
+        """
+        Aggregate the recorded waits per page-object method and condition.
+
+        :return: A dictionary keyed by 'label [condition]' with count, timeouts, and elapsed statistics.
+        """
+        groups = {}
+        with self._lock:
+            for record in self.records:
+                groups.setdefault(f"{record['label']} [{record['condition']}]", []).append(record)
+
+        summary = {}
+        for key, records in sorted(groups.items()):
+            elapsed = sorted(record["elapsed"] for record in records)
+            summary[key] = {
+                "count": len(records),
+                "timed_out": sum(1 for record in records if not record["satisfied"]),
+                "timeout": max(record["timeout"] for record in records),
+                "mean": round(sum(elapsed) / len(elapsed), 4),
+                "p95": elapsed[min(len(elapsed) - 1, int(len(elapsed) * 0.95))],
+                "max": elapsed[-1],
+            }
+        return summary
+
+    def dump(self, path: str):
+        """
+        Write the summary and the raw records to a JSON file.
+
+        :param path: Destination file path.
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"summary": self.summary(), "records": self.records}, handle, indent=2)
+
+
+# Shared recorder for every page object of the test run
+wait_recorder = WaitRecorder()
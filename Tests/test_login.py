@@ -7,7 +7,6 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-@pytest.mark.order(2)
 def test_valid_login(driver):
     """
     Test the login functionality with valid credentials.
@@ -41,7 +40,7 @@ def test_valid_login(driver):
     home_page = HomePage(driver)
     assert home_page.is_logged_in(), "Home page not loaded: User is not logged in."
 
-@pytest.mark.order(1)
+@pytest.mark.batched(page=LoginPage)  # All cases share one session; only the login form is reset between them
 @pytest.mark.parametrize(
     "username, password, expected_message",
     [
@@ -0,0 +1,21 @@
+import pytest
+from Utils.fake_appium_server import FakeAppiumServer
+
+
+@pytest.fixture
+def fake_server():
+    """
+    Provides a running fake Appium server simulating the Swag Labs app.
+    """
+    with FakeAppiumServer() as server:
+        yield server
+
+
+@pytest.fixture
+def fake_driver(fake_server):
+    """
+    Provides an Appium driver connected to the fake Appium server.
+    """
+    driver = fake_server.connect()
+    yield driver
+    driver.quit()
@@ -0,0 +1,62 @@
+import hashlib
+from Utils.apk_cache import ApkInstallCache
+
+PACKAGE = "com.swaglabsmobileapp"
+
+
+class StubAdb:
+    """
+    Stands in for a device: remembers the installed APK bytes and every shell command.
+    """
+
+    def __init__(self):
+        self.installed = None
+        self.update_time = 0
+        self.commands = []
+
+    def shell(self, *args):
+        self.commands.append(args)
+        if args[:2] == ("pm", "path"):
+            return f"package:/data/app/{PACKAGE}-1/base.apk\n" if self.installed else ""
+        if args[:2] == ("dumpsys", "package"):
+            return f"    versionCode=27 minSdk=21\n    lastUpdateTime=2026-10-18 08:00:{self.update_time:02d}\n"
+        if args[0] == "sha256sum":
+            return f"{hashlib.sha256(self.installed).hexdigest()}  {args[1]}\n"
+        return ""
+
+    def install(self, apk_path):
+        with open(apk_path, "rb") as handle:
+            self.installed = handle.read()
+        self.update_time += 1
+
+
+def test_same_build_is_installed_once_per_device(tmp_path):
+    """
+    Objective: Verify the APK is installed once, then reused via the index without hashing on the device.
+    """
+    apk = tmp_path / "app.apk"
+    apk.write_bytes(b"build 1")
+    device = StubAdb()
+    cache = ApkInstallCache(str(tmp_path / "index.json"), adb_factory=lambda udid: device)
+
+    assert cache.ensure_installed("emulator-5554", str(apk), PACKAGE) is True
+    assert cache.ensure_installed("emulator-5554", str(apk), PACKAGE) is False
+    assert (cache.installs, cache.skipped) == (1, 1)
+    assert not any(command[0] == "sha256sum" for command in device.commands), "Indexed build was hashed again."
+
+
+def test_changed_or_unindexed_builds_are_verified_by_hash(tmp_path):
+    """
+    Objective: Verify a build already on the device is detected by hash, and a new build is installed.
+    """
+    apk = tmp_path / "app.apk"
+    apk.write_bytes(b"build 1")
+    device = StubAdb()
+    device.install(str(apk))  # Installed outside the framework, so not in the index
+    cache = ApkInstallCache(str(tmp_path / "index.json"), adb_factory=lambda udid: device)
+
+    assert cache.ensure_installed("emulator-5554", str(apk), PACKAGE) is False
+
+    apk.write_bytes(b"build two")
+    assert cache.ensure_installed("emulator-5554", str(apk), PACKAGE) is True
+    assert device.installed == b"build two"
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from Benchmarks.sessions import CAPABILITIES, async_flow, run_sessions
+from Pages.async_pages import AsyncHomePage, AsyncLoginPage
+from Utils.async_driver import AsyncDriver, AsyncHttpClient
+
+LOCKED_OUT_ERROR = "Sorry, this user has been locked out."
+
+
+def test_async_page_objects_drive_a_session(fake_server):
+    """
+    Objective: Verify the async page objects log in, use the cart, wait for the screen to settle and report
+    login errors like the sync ones, and that W3C errors are raised as the usual selenium exceptions.
+    """
+    async def scenario():
+        client = AsyncHttpClient()
+        driver = await AsyncDriver.create(client, fake_server.url, CAPABILITIES)
+        quantity = await async_flow(driver)
+        settle_time = await AsyncHomePage(driver).wait_until_stable()
+        with pytest.raises(NoSuchElementException):
+            await driver.find_element("accessibility id", "test-LOGIN")
+        await driver.quit()
+
+        driver = await AsyncDriver.create(client, fake_server.url, CAPABILITIES)
+        login_page = AsyncLoginPage(driver)
+        await login_page.perform_login("locked_out_user", "secret_sauce")
+        locked_out = await login_page.is_error_message_present(LOCKED_OUT_ERROR)
+        reset = await login_page.soft_reset()
+        await driver.quit()
+        await client.close()
+        return quantity, settle_time < 1, locked_out, reset
+
+    assert asyncio.run(scenario()) == (1, True, True, True)
+    assert fake_server.sessions_deleted == 2
+
+
+def test_many_sessions_share_few_connections(fake_server):
+    """
+    Objective: Verify one event loop runs 10 sessions concurrently over at most max_per_host connections.
+    """
+    async def scenario():
+        client = AsyncHttpClient(max_per_host=4)
+
+        async def run():
+            driver = await AsyncDriver.create(client, fake_server.url, CAPABILITIES)
+            quantity = await async_flow(driver)
+            await driver.quit()
+            return quantity
+
+        quantities = await asyncio.gather(*(run() for _ in range(10)))
+        await client.close()
+        return quantities, client
+
+    quantities, client = asyncio.run(scenario())
+    assert quantities == [1] * 10
+    assert fake_server.sessions_created == 10
+    assert fake_server.connections <= 4 and client.requests == len(fake_server.requests)
+
+
+def test_async_sessions_outrun_sequential_sync_sessions():
+    """
+    Objective: Verify the session benchmark runs the same requests in both modes and that the
+    async page objects finish 10 sessions much faster than the sync ones one after the other.
+    """
+    report = run_sessions(sessions=10, latency=0.01, modes=("sequential", "async"))
+
+    sequential, concurrent = report["results"]["sequential"], report["results"]["async"]
+    assert sequential["requests"] == concurrent["requests"]
+    assert concurrent["wall_time"] < sequential["wall_time"] / 3
@@ -0,0 +1,31 @@
+import copy
+from Benchmarks.runner import compare, run_benchmarks
+
+
+def test_benchmarks_count_round_trips_per_operation():
+    """
+    Objective: Verify the benchmark reports round trips and timings for each catalog size.
+    """
+    report = run_benchmarks(catalogs=(6, 50), repeat=2, only="HomePage")
+
+    assert set(report["results"]) >= {"HomePage.get_available_items[6]", "HomePage.get_available_items[50]"}
+    assert report["results"]["HomePage.get_available_items[50]"]["round_trips"] == 1
+    assert report["results"]["HomePage.add_to_cart[6]"]["round_trips"] == 2
+    assert all(result["p50"] <= result["p95"] <= result["max"] for result in report["results"].values())
+
+
+def test_compare_fails_on_extra_round_trips_and_slowdowns():
+    """
+    Objective: Verify the comparison flags added round trips and median slowdowns beyond the threshold only.
+    """
+    baseline = {"results": {"HomePage.add_to_cart[6]": {"round_trips": 2, "p50": 0.010},
+                            "HomePage.get_cart_quantity[6]": {"round_trips": 1, "p50": 0.010}}}
+    current = copy.deepcopy(baseline)
+    assert compare(baseline, current) == []
+
+    current["results"]["HomePage.add_to_cart[6]"]["round_trips"] = 3
+    current["results"]["HomePage.get_cart_quantity[6]"]["p50"] = 0.020
+    regressions = compare(baseline, current)
+
+    assert len(regressions) == 2
+    assert compare(baseline, current, max_round_trips=1, max_slowdown=1.5) == []
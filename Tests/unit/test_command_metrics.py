@@ -0,0 +1,52 @@
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Utils.command_metrics import CommandRecorder, summarize, summary_html
+
+
+def test_commands_are_recorded_per_test_and_page_object_method(fake_driver):
+    """
+    Objective: Verify each WebDriver command is recorded with its name, locator strategy, latency,
+    payload sizes and issuing page-object method, grouped per test.
+    """
+    recorder = CommandRecorder()
+    recorder.install(fake_driver)
+    recorder.install(fake_driver)  # Installing twice must not record commands twice
+
+    recorder.start_test("test_login")
+    LoginPage(fake_driver).perform_login("standard_user", "secret_sauce")
+    recorder.start_test("test_items")
+    HomePage(fake_driver).get_available_items()
+    recorder.start_test("test_iter")
+    next(HomePage(fake_driver).iter_items())
+    fake_driver.page_source  # Sent by the test between two items
+
+    login = recorder.for_test("test_login")
+    assert [record["command"] for record in login].count("findElements") == 3  # username, password, button
+    assert {record["page_method"] for record in login} == {"LoginPage.__init__", "LoginPage.perform_login"}
+    assert login[0]["command"] == "setTimeouts"  # Implicit wait switched off once per session
+    assert login[1]["using"] == "accessibility id" and login[1]["latency"] > 0
+    items = recorder.for_test("test_items")
+    assert [(record["command"], record["page_method"]) for record in items] == \
+        [("getPageSource", "HomePage.get_available_items")]
+    assert items[0]["response_bytes"] > 1000
+    *iteration, between = [record["page_method"] for record in recorder.for_test("test_iter")]
+    assert iteration and set(iteration) == {"HomePage.iter_items"} and between is None
+
+
+def test_summary_groups_by_method_and_flags_slow_lookups():
+    """
+    Objective: Verify the per-method summary and the slow-lookup list shown in the report.
+    """
+    records = [
+        {"command": "findElement", "using": "xpath", "selector": "//a", "latency": 0.9, "request_bytes": 10,
+         "response_bytes": 20, "page_method": "HomePage.add_to_cart", "error": "no such element"},
+        {"command": "clickElement", "using": None, "selector": None, "latency": 0.1, "request_bytes": 2,
+         "response_bytes": 4, "page_method": "HomePage.add_to_cart", "error": None},
+    ]
+
+    summary = summarize(records)
+
+    assert summary["methods"]["HomePage.add_to_cart"]["commands"] == 2
+    assert summary["methods"]["HomePage.add_to_cart"]["total"] == 1.0
+    assert summary["slow_lookups"][0]["selector"] == "//a"
+    assert "Slow lookups" in summary_html(records)
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from Utils.device_pool import DevicePool, Device, NoDeviceAvailableError, load_devices
+from Utils.fake_appium_server import FakeAppiumServer
+
+
+@pytest.fixture
+def servers():
+    """
+    Provides three fake Appium servers, one per simulated device.
+    """
+    servers = [FakeAppiumServer().start() for _ in range(3)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def devices(servers):
+    """
+    Provides one Device per fake Appium server.
+    """
+    return [Device(f"emulator-{5554 + 2 * index}", server.url, index=index) for index, server in enumerate(servers)]
+
+
+def test_each_worker_gets_its_own_device_and_endpoint(tmp_path, servers, devices):
+    """
+    Objective: Verify concurrent workers lease distinct devices and their sessions land on distinct
+    Appium endpoints with unique driver ports.
+    """
+    leases = [DevicePool(devices, str(tmp_path)).lease(f"gw{index}", timeout=0) for index in range(3)]
+
+    assert len({lease.device.udid for lease in leases}) == 3, "Two workers leased the same device."
+    assert len({lease.device.system_port for lease in leases}) == 3, "Workers share a systemPort."
+
+    for lease in leases:
+        server = next(server for server in servers if server.url == lease.device.appium_url)
+        server.connect(**lease.device.capabilities()).quit()
+    assert [server.sessions_created for server in servers] == [1, 1, 1]
+
+    with pytest.raises(NoDeviceAvailableError):
+        DevicePool(devices, str(tmp_path)).lease("gw3", timeout=0)
+
+    for lease in leases:
+        lease.release()
+    assert os.listdir(tmp_path) == [], "Lease files were not removed on release."
+
+
+def test_lease_of_crashed_worker_is_reclaimed(tmp_path, devices):
+    """
+    Objective: Verify a device leased by a worker process that died is handed to another worker.
+    """
+    crashed = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    pool = DevicePool(devices[:1], str(tmp_path))
+    lease_file = tmp_path / "emulator-5554.lease"
+    lease_file.write_text(json.dumps({"pid": int(crashed.stdout), "host": os.uname().nodename, "worker": "gw0"}))
+
+    lease = pool.lease("gw1", timeout=0)
+
+    assert lease.device.udid == "emulator-5554"
+    lease.release()
+
+
+def test_lease_without_heartbeat_expires(tmp_path, devices):
+    """
+    Objective: Verify a lease whose heartbeat stopped for longer than the TTL is taken over.
+    """
+    lease_file = tmp_path / "emulator-5554.lease"
+    lease_file.write_text(json.dumps({"pid": 1, "host": "another-ci-host", "worker": "gw0"}))
+    os.utime(lease_file, (0, 0))
+
+    lease = DevicePool(devices[:1], str(tmp_path), lease_ttl=5).lease("gw1", timeout=0)
+
+    assert lease.device.udid == "emulator-5554"
+    lease.release()
+
+
+def test_devices_are_loaded_from_environment(monkeypatch):
+    """
+    Objective: Verify the compact 'udid@url' environment format and the derived unique ports.
+    """
+    monkeypatch.setenv("APPIUM_DEVICES", "emulator-5554@http://localhost:4723, emulator-5556@http://localhost:4725")
+
+    devices = load_devices()
+
+    assert [device.appium_url for device in devices] == ["http://localhost:4723", "http://localhost:4725"]
+    assert [device.system_port for device in devices] == [8200, 8201]
+    assert [device.chromedriver_port for device in devices] == [9515, 9516]
@@ -0,0 +1,80 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from Pages.element_cache import element_cache
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+
+
+def reset_counters():
+    element_cache.hits = element_cache.misses = element_cache.stale = 0
+
+
+def test_repeated_logins_reuse_the_form_handles(fake_server, fake_driver):
+    """
+    Objective: Verify a second login attempt on the same form finds no element again.
+    """
+    login_page = LoginPage(fake_driver)
+    reset_counters()
+
+    login_page.perform_login("standard_user", "wrong_password")
+    lookups = fake_server.count("POST", r"/elements?$")
+    login_page.perform_login("standard_user", "secret_sauce")
+
+    assert fake_server.count("POST", r"/elements?$") == lookups, "The second login looked the fields up again."
+    assert (element_cache.hits, element_cache.misses) == (3, 3)
+    assert HomePage(fake_driver).is_logged_in()
+
+
+def test_stale_handle_is_evicted_and_retried_once(fake_server, fake_driver):
+    """
+    Objective: Verify a handle that went stale (the app restarted by itself) is looked up again and the action succeeds.
+    """
+    login_page = LoginPage(fake_driver)
+    login_page.perform_login("", "")
+    reset_counters()
+    fake_server.sessions[fake_driver.session_id].app.restart()  # New views, old handles are stale
+
+    login_page.perform_login("standard_user", "secret_sauce")
+
+    assert element_cache.stale == 1
+    assert HomePage(fake_driver).is_logged_in()
+
+
+def test_restarts_drop_the_cached_handles(fake_server, fake_driver):
+    """
+    Objective: Verify an app restart through the driver, or one announced with clear, costs no failed action.
+    """
+    login_page = LoginPage(fake_driver)
+    login_page.perform_login("", "")
+    reset_counters()
+
+    fake_driver.terminate_app("com.swaglabsmobileapp")
+    fake_driver.activate_app("com.swaglabsmobileapp")  # The app process changes through the driver
+    login_page.perform_login("", "")
+    fake_server.sessions[fake_driver.session_id].app.restart()  # Behind the driver's back
+    element_cache.clear(fake_driver)
+    clicks = fake_server.count("POST", r"/click$")
+    login_page.perform_login("standard_user", "secret_sauce")
+
+    assert element_cache.stale == 0 and fake_server.count("POST", r"/click$") == clicks + 1
+    assert HomePage(fake_driver).is_logged_in()
+
+
+def test_state_locators_do_not_survive_clicks(fake_server):
+    """
+    Objective: Verify a button found by its label is reused right after the lookup but not after a click changed it.
+    """
+    driver = fake_server.connect()
+    app = fake_server.sessions[driver.session_id].app
+    app.screen = "products"
+    home_page = HomePage(driver)
+    reset_counters()
+
+    add_button = home_page.native((AppiumBy.XPATH, home_page.get_item_button_xpath("Sauce Labs Backpack", "ADD TO CART")))
+
+    home_page.add_to_cart("Sauce Labs Backpack")  # Found by label, clicked from the cache
+    assert element_cache.get(driver, add_button) is None, "The handle outlived the click that changed its label."
+    home_page.remove_from_cart("Sauce Labs Backpack")
+
+    assert (element_cache.hits, element_cache.misses) == (2, 1)
+    assert app.cart == set()
+    driver.quit()
@@ -0,0 +1,53 @@
+import io
+import json
+import os
+import pytest
+from Utils.failure_artifacts import INDEX, ArtifactStore
+
+
+def test_capture_writes_deduplicated_artifacts(fake_driver, tmp_path):
+    """
+    Objective: Verify two failures on the same screen store the screenshot and page source once, and are both indexed.
+    """
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.capture(fake_driver, "test_a", [{"command": "findElement"}])
+    second = store.capture(fake_driver, "test_b", [{"command": "click"}])
+    store.close()
+
+    assert first["screenshot"] == second["screenshot"] and first["page_source"] == second["page_source"]
+    assert first["commands"] != second["commands"]
+    assert (store.written, store.deduplicated) == (4, 2)
+    assert "test-LOGIN" in (tmp_path / first["page_source"]).read_text(encoding="utf-8")
+    assert json.loads((tmp_path / second["commands"]).read_text()) == [{"command": "click"}]
+    index = [json.loads(line) for line in (tmp_path / INDEX).read_text().splitlines()]
+    assert [entry["test"] for entry in index] == ["test_a", "test_b"]
+
+
+def test_oldest_artifacts_are_evicted(tmp_path):
+    """
+    Objective: Verify the artifacts directory stays under its size limit by deleting the oldest files.
+    """
+    store = ArtifactStore(str(tmp_path), max_bytes=2500)
+
+    names = [store.submit(bytes([index]) * 1000, ".bin") for index in range(5)]
+    store.close()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(names[-2:])
+    assert store.evicted == 3
+
+
+def test_screenshots_are_downscaled_to_webp(tmp_path):
+    """
+    Objective: Verify screenshots are converted to WebP and downscaled when Pillow is installed.
+    """
+    image_module = pytest.importorskip("PIL.Image")
+    png = io.BytesIO()
+    image_module.new("RGB", (1080, 2400), "white").save(png, format="PNG")
+    store = ArtifactStore(str(tmp_path), max_width=540)
+
+    name = store.submit(png.getvalue(), ".webp", encode=True)
+    store.close()
+
+    stored = image_module.open(tmp_path / name)
+    assert (stored.format, stored.size) == ("WEBP", (540, 1200))
@@ -0,0 +1,43 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from Utils.flaky_tests import RETRYABLE_KINDS, FlakeStore, RetryPolicy, classify
+
+
+def test_failures_are_classified_and_retried_by_kind(request):
+    """
+    Objective: Verify failures are classified by their exception and only the retryable kinds are
+    retried, up to the limit of the `flaky` marker.
+    """
+    kinds = [classify(error) for error in (TimeoutException("slow"), StaleElementReferenceException("gone"),
+                                           AssertionError("cart"), ConnectionResetError(), TypeError())]
+    assert kinds == ["timeout", "stale_element", "assertion", "session", "other"]
+
+    policy = RetryPolicy(retries=1, backoff=0.5)
+    assert policy.for_item(request.node) == (1, 0.5)
+    request.node.add_marker(pytest.mark.flaky(reruns=3))
+    assert policy.for_item(request.node) == (3, 0.5)
+    assert policy.retryable(TimeoutException("slow"))
+    assert not policy.retryable(AssertionError("cart")) and not policy.retryable(TypeError())
+    assert not policy.retryable(None)
+    assert RetryPolicy(kinds=RETRYABLE_KINDS + ("assertion",)).retryable(AssertionError("cart"))
+
+
+def test_flaky_tests_are_quarantined_but_broken_ones_are_not(tmp_path):
+    """
+    Objective: Verify the flake rate covers the last runs of each test and that only tests that fail
+    often but still pass sometimes are quarantined.
+    """
+    store = FlakeStore(str(tmp_path / "flakes.sqlite"), history=5)
+    for run in range(8):
+        store.record([
+            ("test_stable", "passed", 1, []),
+            ("test_flaky", "flaky" if run % 2 else "passed", 2 if run % 2 else 1, ["timeout"] if run % 2 else []),
+            ("test_broken", "failed", 2, ["assertion", "assertion"]),
+            ("test_recovered", "failed" if run < 3 else "passed", 1, ["no_such_element"] if run < 3 else []),
+        ])
+
+    rates = store.rates()
+    assert rates["test_flaky"] == {"runs": 5, "flaky": 3, "failed": 0, "kinds": {"timeout": 3}, "rate": 0.6}
+    assert rates["test_recovered"]["rate"] == 0.0 and rates["test_broken"]["kinds"] == {"assertion": 10}
+    assert set(store.quarantined(threshold=0.2)) == {"test_flaky"}
+    assert store.quarantined(threshold=0.2, min_runs=6) == {}
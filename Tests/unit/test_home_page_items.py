@@ -0,0 +1,119 @@
+import itertools
+import time
+import pytest
+from selenium.common.exceptions import TimeoutException
+from Pages.home_page import HomePage
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import FakeSwagLabsApp, catalog
+
+
+def connect_to_catalog(server):
+    """
+    Create a session on the server and a HomePage for it.
+    """
+    driver = server.connect()
+    return driver, HomePage(driver)
+
+
+def test_iter_items_harvests_a_long_list_once_per_item():
+    """
+    Objective: Verify iter_items scrolls to the end of a 200-item list and yields every item once, in order.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=200, viewport=4, logged_in=True)) as server:
+        driver, home_page = connect_to_catalog(server)
+
+        items = list(home_page.iter_items())
+
+        assert [item["title"] for item in items] == catalog(200)
+        assert items[0]["price"] == "$9.99" and items[0]["button"] == "ADD TO CART"
+        assert items[0]["bounds"] == (0, 400, 1080, 850)
+        driver.quit()
+
+
+def test_lookups_stop_scrolling_once_the_item_is_found():
+    """
+    Objective: Verify early consumers and add_to_cart only scroll as far as needed.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=200, viewport=4, logged_in=True)) as server:
+        driver, home_page = connect_to_catalog(server)
+
+        assert len(list(itertools.islice(home_page.iter_items(), 3))) == 3
+        assert fake_scrolls(server) == 1  # Scrolling up, which finds the list already at the top
+
+        home_page.add_to_cart("Sauce Labs Product 20")
+
+        assert server.sessions[driver.session_id].app.cart == {"Sauce Labs Product 20"}
+        assert 0 < fake_scrolls(server) < 10
+        driver.quit()
+
+
+def test_lookups_find_items_above_the_screen_and_fail_fast_on_unknown_items():
+    """
+    Objective: Verify add_to_cart finds an item above the current scroll position and that an item
+    missing from the list fails once the list is exhausted, without waiting for the timeout.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=40, viewport=4, logged_in=True)) as server:
+        driver, home_page = connect_to_catalog(server)
+        home_page.add_to_cart("Sauce Labs Product 30")
+        scrolls = fake_scrolls(server)
+
+        home_page.add_to_cart("Sauce Labs Product 10")
+
+        assert server.sessions[driver.session_id].app.cart == {"Sauce Labs Product 30", "Sauce Labs Product 10"}
+        assert [item["title"] for item in home_page.iter_items()] == catalog(40)
+        assert fake_scrolls(server) - scrolls < 40
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutException, match="not in the product list"):
+            home_page.add_to_cart("Sauce Labs Product 99")
+        assert time.monotonic() - start < home_page.timeout / 2
+        driver.quit()
+
+
+def fake_scrolls(server) -> int:
+    """
+    Count the scroll gestures sent to the server (the only scripts these tests send).
+    """
+    return server.count("POST", r"/execute/sync$")
+
+
+def test_bulk_cart_operations_cost_a_constant_number_of_round_trips():
+    """
+    Objective: Verify add_many/remove_many tap every on-screen button in one actions request and check the badge once.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=6, logged_in=True)) as server:
+        driver, home_page = connect_to_catalog(server)
+        titles = catalog(6)
+        requests_before = len(server.requests)
+
+        assert home_page.add_many(titles) == 6
+        assert len(server.requests) - requests_before == 3  # Snapshot, actions, badge check
+        assert server.count("POST", r"/actions$") == 1
+
+        assert home_page.remove_many(titles[:4] + titles[:1]) == 2
+        assert server.sessions[driver.session_id].app.cart == set(titles[4:])
+
+        # Items already in the target state are skipped, without scrolling through the list for them
+        start = time.monotonic()
+        assert home_page.add_many(titles[3:]) == 3
+        assert home_page.remove_many(titles[:2]) == 3
+        assert time.monotonic() - start < home_page.timeout / 2
+        assert fake_scrolls(server) == 0
+        assert server.sessions[driver.session_id].app.cart == set(titles[3:])
+        driver.quit()
+
+
+def test_bulk_cart_operations_fail_when_a_tap_does_not_register():
+    """
+    Objective: Verify add_many raises with the expected and actual cart quantity when a tap is lost,
+    instead of returning the wrong quantity silently.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=6, logged_in=True)) as server:
+        driver, home_page = connect_to_catalog(server)
+        tap_sequence = home_page._tap_sequence
+        home_page._tap_sequence = lambda taps: tap_sequence(taps[1:])  # The first tap gets lost
+        home_page.set_wait(0.3)
+
+        with pytest.raises(TimeoutException, match="cart quantity is 2, expected 3"):
+            home_page.add_many(catalog(3))
+        driver.quit()
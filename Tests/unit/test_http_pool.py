@@ -0,0 +1,65 @@
+import pytest
+from urllib3.exceptions import NewConnectionError, ProtocolError
+from Utils.http_pool import HttpPool
+from Utils.traffic_cassette import CassetteRecorder, load_cassette
+
+
+def test_sessions_share_keep_alive_connections(fake_server):
+    """
+    Objective: Verify several sessions send all their commands over the pooled keep-alive
+    connections instead of opening a connection per session or per command.
+    """
+    pool = HttpPool(max_per_host=2)
+    drivers = [fake_server.connect(pool.connection(fake_server.url)) for _ in range(3)]
+    for driver in drivers:
+        for _ in range(5):
+            driver.page_source
+    for driver in drivers:
+        driver.quit()
+
+    report = pool.report()[f"127.0.0.1:{fake_server.port}"]
+    assert fake_server.connections == 1, "Commands sent one after the other did not reuse the connection."
+    assert report["connections"] == 1 and report["requests"] == len(fake_server.requests)
+    assert report["reuse_rate"] > 0.9
+    pool.close()
+
+
+def test_dropped_connection_is_retried_for_idempotent_commands(fake_server, tmp_path):
+    """
+    Objective: Verify a read command and an element lookup are sent again after the connection
+    was dropped, while a click is not repeated, and that a retried command is recorded once.
+    """
+    pool = HttpPool(backoff=0)
+    recorder = CassetteRecorder(str(tmp_path / "run.jsonl.gz"))
+    driver = fake_server.connect(pool.connection(fake_server.url, recorder))
+
+    fake_server.drop_next()
+    assert "test-Username" in driver.page_source
+    fake_server.drop_next()
+    login_button = driver.find_element("accessibility id", "test-LOGIN")
+    assert pool.report()[f"127.0.0.1:{fake_server.port}"]["retries"] == 2
+
+    fake_server.drop_next()
+    with pytest.raises(ProtocolError):
+        login_button.click()
+    assert fake_server.count("POST", r"/click$") == 1, "A click was sent twice."
+    assert pool.report()[f"127.0.0.1:{fake_server.port}"]["failures"] == 1
+    driver.quit()
+    recorder.close()
+    paths = [exchange["path"].rsplit("/", 1)[-1] for exchange in load_cassette(recorder.path)]
+    assert paths.count("source") == 1 and paths.count("element") == 1 and "click" not in paths
+    pool.close()
+
+
+def test_failed_connect_is_retried_then_raised():
+    """
+    Objective: Verify a server that refuses connections is retried the configured number of times.
+    """
+    pool = HttpPool(retries=2, backoff=0, connect_timeout=1)
+    connection = pool.connection("http://127.0.0.1:1")
+
+    with pytest.raises(NewConnectionError):
+        connection._request("GET", "http://127.0.0.1:1/status")
+    assert pool.report()["127.0.0.1:1"] == {"requests": 3, "connections": 3, "retries": 2, "failures": 1,
+                                            "reuse_rate": 0.0}
+    pool.close()
@@ -0,0 +1,51 @@
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from Pages.home_page import HomePage
+from Pages.locator_compiler import LocatorCompiler, translate
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import FakeSwagLabsApp
+
+
+def test_supported_xpaths_become_native_locators():
+    """
+    Objective: Verify accessibility-id and UiSelector translations, and that other XPaths are left alone.
+    """
+    assert translate('//*[@content-desc="test-Cart"]') == (AppiumBy.ACCESSIBILITY_ID, "test-Cart")
+    assert translate('//android.view.ViewGroup[@content-desc="test-Cart"]//android.widget.TextView') == (
+        AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.view.ViewGroup").description("test-Cart")'
+                                      '.childSelector(new UiSelector().className("android.widget.TextView"))')
+    assert translate('//android.widget.TextView[@text="Username and password do not match"]') == (
+        AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").text("Username and password do not match")')
+
+    compiler = LocatorCompiler()
+    for xpath in ('//android.widget.TextView[contains(@text, "Sauce")]', "//android.view.ViewGroup[2]",
+                  './/android.widget.TextView', HomePage.get_item_button_xpath("Sauce Labs Onesie", "REMOVE")):
+        assert compiler.compile((AppiumBy.XPATH, xpath)) == (AppiumBy.XPATH, xpath)
+    assert len(compiler.report()["unoptimized"]) == 4
+    sibling = HomePage.get_item_button_xpath("Sauce Labs Onesie", "REMOVE")
+    assert ".fromParent(" in compiler.compile((AppiumBy.XPATH, sibling), sibling_selectors=True)[1]
+
+
+@pytest.mark.parametrize("button", ["ADD TO CART", "REMOVE"])
+def test_compiled_locators_find_the_same_elements_on_the_emulation(button):
+    """
+    Objective: Verify every HomePage locator finds the same elements compiled as it finds as XPath.
+
+    This runs on the fake Appium server's emulation of UiSelector (Utils/fake_appium_server.py),
+    so it checks the compiler against the semantics the emulation assumes, not against UiAutomator2.
+    The item buttons are found through a following-sibling step, which HomePage leaves as XPath.
+    """
+    app = FakeSwagLabsApp(items=50, logged_in=True)
+    app.cart = {"Sauce Labs Onesie"}
+    with FakeAppiumServer(app_factory=lambda: app) as server:
+        driver = server.connect()
+        home_page = HomePage(driver)
+        locators = [home_page.inventory_title, home_page.cart_icon, home_page.cart_badge, home_page.item,
+                    (AppiumBy.XPATH, home_page.get_item_button_xpath("Sauce Labs Onesie", button)),
+                    (AppiumBy.XPATH, home_page.get_item_button_xpath("Sauce Labs Product 42", button))]
+        for locator in locators:
+            native = home_page.native(locator)
+            assert (native[0] == AppiumBy.XPATH) == ("following-sibling" in locator[1]), f"{locator[1]} -> {native[1]}"
+            assert [element.id for element in driver.find_elements(*native)] == \
+                   [element.id for element in driver.find_elements(*locator)], f"{native[1]} differs from {locator[1]}."
+        driver.quit()
@@ -0,0 +1,46 @@
+import json
+import logging
+from Utils.log_pipeline import LogPipeline
+
+
+class Formatted:
+    """
+    Log argument counting how often it is formatted.
+    """
+    count = 0
+
+    def __str__(self):
+        Formatted.count += 1
+        return "value"
+
+
+def test_records_are_formatted_in_the_background_and_capped_per_test(tmp_path):
+    """
+    Objective: Verify the pipeline writes one JSON event per record with the test, method and extra fields,
+    and that records below the level or beyond the per-test limit are never formatted.
+    """
+    pipeline = LogPipeline(str(tmp_path / "steps.jsonl"), level=logging.INFO, limit=3, logger="pipeline_test")
+    logger = logging.getLogger("pipeline_test")
+    logger.propagate = False  # Keep the records away from the pipeline of this pytest run
+    pipeline.start()
+    try:
+        logger.info("Outside of tests: %s", Formatted())
+        pipeline.test = "Tests/test_cart.py::test_add"
+        logger.debug("Below the level: %s", Formatted())
+        for number in range(5):
+            logger.info("Record %d: %s", number, Formatted(), extra={"step": number, "duration": 0.5})
+        logger.warning("Beyond the limit, but a warning")
+        pipeline.test = None
+    finally:
+        pipeline.stop()
+        logger.propagate = True
+
+    events = [json.loads(line) for line in (tmp_path / "steps.jsonl").read_text().splitlines()]
+    assert [event["message"] for event in events] == [
+        "Outside of tests: value", "Record 0: value", "Record 1: value", "Record 2: value",
+        "Beyond the limit, but a warning"]
+    assert events[2]["test"] == "Tests/test_cart.py::test_add" and events[0]["test"] is None
+    assert events[2]["step"] == 1 and events[2]["duration"] == 0.5
+    assert events[2]["method"] == "test_log_pipeline.test_records_are_formatted_in_the_background_and_capped_per_test"
+    assert Formatted.count == 4
+    assert pipeline.summary("Tests/test_cart.py::test_add") == {"kept": 4, "dropped": 2, "info": 3, "warning": 1}
@@ -0,0 +1,36 @@
+from Pages.home_page import HomePage
+from Utils.login_state import LoginState
+from Utils.session_pool import SessionPool
+
+APP_PACKAGE = "com.swaglabsmobileapp"
+
+
+def test_ui_login_once_then_deep_link(fake_server, fake_driver):
+    """
+    Objective: Verify only the first login goes through the form and later ones are restored with one deep link.
+    """
+    state = LoginState("standard_user", "secret_sauce", APP_PACKAGE)
+    pool = SessionPool(fake_server.connect, APP_PACKAGE)
+
+    state.apply(fake_driver)
+    typed = fake_server.count("POST", r"/value$")
+    pool.reset_app(fake_driver)  # Logged out again, like between two tests
+    state.apply(fake_driver)
+
+    assert (state.ui_logins, state.restores) == (1, 1)
+    assert typed == 2 and fake_server.count("POST", r"/value$") == 2, "The second login used the login form."
+    assert HomePage(fake_driver).is_logged_in()
+
+
+def test_falls_back_to_ui_login_when_deep_link_fails(fake_driver):
+    """
+    Objective: Verify an unknown deep link falls back to the login form for the rest of the run.
+    """
+    state = LoginState("standard_user", "secret_sauce", APP_PACKAGE, deep_link="swaglabs://unknown/")
+    pool = SessionPool(None, APP_PACKAGE)
+
+    state.apply(fake_driver)
+    pool.reset_app(fake_driver)
+    state.apply(fake_driver)
+
+    assert (state.ui_logins, state.restores, state.deep_link_works) == (2, 0, False)
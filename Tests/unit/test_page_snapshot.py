@@ -0,0 +1,82 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Pages.page_snapshot import PageSnapshot
+
+SOURCE = """<hierarchy>
+  <android.view.ViewGroup content-desc="test-Cart">
+    <android.view.ViewGroup><android.widget.TextView text="2"/></android.view.ViewGroup>
+  </android.view.ViewGroup>
+  <android.view.ViewGroup content-desc="test-Item">
+    <android.widget.TextView content-desc="test-Item title" text="Backpack"/>
+  </android.view.ViewGroup>
+  <android.view.ViewGroup content-desc="test-Item">
+    <android.widget.TextView content-desc="test-Item title" text="Bike Light"/>
+  </android.view.ViewGroup>
+</hierarchy>"""
+
+
+def test_snapshot_answers_queries_locally():
+    """
+    Objective: Verify presence, count, text and attribute queries for XPath and accessibility id locators.
+    """
+    snapshot = PageSnapshot(SOURCE)
+    item = (AppiumBy.ACCESSIBILITY_ID, "test-Item")
+    title = (AppiumBy.XPATH, './/android.widget.TextView[@content-desc="test-Item title"]')
+
+    assert snapshot.count(item) == 2
+    assert snapshot.is_present((AppiumBy.ACCESSIBILITY_ID, "test-Cart"))
+    assert not snapshot.is_present((AppiumBy.XPATH, '//android.widget.TextView[@text="PRODUCTS"]'))
+    assert snapshot.attribute((AppiumBy.XPATH, '//*[@content-desc="test-Cart"]//android.widget.TextView'), "text") == "2"
+    assert [snapshot.attribute(title, "text", within=node) for node in snapshot.find_all(item)] == ["Backpack", "Bike Light"]
+
+
+def test_fingerprint_covers_the_anchor_subtree_only():
+    """
+    Objective: Verify the fingerprint changes with a text under the anchor, not with changes elsewhere.
+    """
+    cart = (AppiumBy.ACCESSIBILITY_ID, "test-Cart")
+    badge_changed = PageSnapshot(SOURCE.replace('text="2"', 'text="3"'))
+    title_changed = PageSnapshot(SOURCE.replace('text="Backpack"', 'text="Backpack (sold out)"'))
+
+    assert PageSnapshot(SOURCE).fingerprint() == PageSnapshot(SOURCE).fingerprint()
+    assert badge_changed.fingerprint(cart) != PageSnapshot(SOURCE).fingerprint(cart)
+    assert title_changed.fingerprint(cart) == PageSnapshot(SOURCE).fingerprint(cart)
+    assert title_changed.fingerprint() != PageSnapshot(SOURCE).fingerprint()
+
+
+def log_in(driver):
+    """
+    Log in to the fake app with the standard user.
+    """
+    LoginPage(driver).perform_login("standard_user", "secret_sauce")
+
+
+def test_read_heavy_page_object_methods_cost_one_round_trip(fake_server, fake_driver):
+    """
+    Objective: Verify get_available_items and get_cart_quantity are answered from a single page source call.
+    """
+    log_in(fake_driver)
+    home_page = HomePage(fake_driver)
+    requests_before = len(fake_server.requests)
+
+    titles = home_page.get_available_items()
+    quantity = home_page.get_cart_quantity()
+
+    assert len(titles) == 6 and titles[0] == "Sauce Labs Backpack"
+    assert quantity == 0
+    assert len(fake_server.requests) - requests_before == 1, "Read-only queries were not served from the snapshot."
+
+
+def test_snapshot_is_invalidated_by_actions(fake_server, fake_driver):
+    """
+    Objective: Verify an action sent through the driver (here a click) invalidates the snapshot.
+    """
+    log_in(fake_driver)
+    home_page = HomePage(fake_driver)
+    item = home_page.get_available_items()[0]
+
+    home_page.add_to_cart(item)
+
+    assert home_page.get_cart_quantity() == 1
+    assert fake_server.count("GET", r"/source$") == 2
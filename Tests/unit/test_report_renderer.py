@@ -0,0 +1,48 @@
+from multiprocessing import Pool
+from Utils.report_renderer import render_report
+from Utils.results_sink import ResultsSink
+
+
+def report_tests(args):
+    path, worker = args
+    sink = ResultsSink(path)
+    sink.run = "run-1"
+    for number in range(3):
+        nodeid = f"Tests/test_cart.py::test_{worker}_{number}"
+        sink.append(nodeid, "setup", "passed", 0.1, worker=f"gw{worker}")
+        failed = worker == 1 and number == 2
+        if worker == 2 and number == 0:  # Passes on its rerun
+            sink.append(nodeid, "call", "rerun", 0.5, "StaleElementReferenceException", worker=f"gw{worker}")
+        sink.append(nodeid, "call", "failed" if failed else "passed", 0.5, "AssertionError: <cart> is empty" if failed
+                    else None, [{"url": "debug/artifacts/shot.png", "name": "Screenshot"}] if failed else None, f"gw{worker}")
+        sink.append(nodeid, "teardown", "passed", 0.1, worker=f"gw{worker}")
+    sink.close()
+
+
+def test_workers_append_reports_and_the_report_is_paginated(tmp_path):
+    """
+    Objective: Verify reports appended by several workers at the same time end up in one run, and that
+    the rendered report pages the tests, tells flaky tests apart, lists the failures and reloads itself until the run is finished.
+    """
+    database, output = str(tmp_path / "debug" / "reports.sqlite"), tmp_path / "report"
+    sink = ResultsSink(database)
+    sink.start_run("run-1", ["-n", "3"])
+    with Pool(3) as pool:
+        pool.map(report_tests, [(database, worker) for worker in range(3)])
+
+    index = render_report(database, str(output), page_size=4, root=str(tmp_path))
+    text = open(index).read()
+    assert "9 tests: <span class='failed'>1 failed</span>" in text and "7 passed" in text and "1 flaky" in text
+    assert "http-equiv=\"refresh\"" in text and "running for" in text
+    assert ".html#test-" in text and "test_1_2</a>" in text  # The failure links to its page
+    assert sorted(path.name for path in output.iterdir()) == ["index.html", "page-1.html", "page-2.html", "page-3.html"]
+    pages = "".join((output / f"page-{number}.html").read_text() for number in (1, 2, 3))
+    assert pages.count("<tr id=") == 9
+    assert "AssertionError: &lt;cart&gt; is empty" in pages and "href='../debug/artifacts/shot.png'" in pages
+
+    sink.finish_run(1)
+    render_report(database, str(output), page_size=10, root=str(tmp_path))
+    text = open(index).read()
+    assert "refresh" not in text and "(exit status 1)" in text
+    assert sorted(path.name for path in output.iterdir()) == ["index.html", "page-1.html"]
+    sink.close()
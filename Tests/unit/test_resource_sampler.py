@@ -0,0 +1,55 @@
+import time
+from Pages.home_page import HomePage
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import BASE_RSS_KB, CART_ITEM_KB, FakeSwagLabsApp
+from Utils.resource_sampler import ResourceSampler, frame_delta, load_series
+
+APP_PACKAGE = "com.swaglabsmobileapp"
+
+
+def test_samples_resources_in_the_background(tmp_path):
+    """
+    Objective: Verify the sampler collects CPU, memory and frame series over its own connection while the test runs.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(items=20, viewport=4, logged_in=True)) as server:
+        driver = server.connect()
+        home_page = HomePage(driver)
+        sampler = ResourceSampler(server.url, driver.session_id, APP_PACKAGE, interval=0.01).start()
+
+        home_page.add_many(["Sauce Labs Backpack", "Sauce Labs Bike Light"])
+        home_page.add_to_cart("Sauce Labs Product 19")  # Scrolls to the end of the list
+        time.sleep(0.05)
+        sampler.stop()
+        summary = sampler.summary()
+        sampler.dump(str(tmp_path / "resources.json.gz"), "test")
+        driver.quit()
+
+    assert summary["samples"] >= 3 and sampler.errors == 0
+    assert summary["peak_rss_kb"] >= BASE_RSS_KB + 3 * CART_ITEM_KB
+    assert summary["cpu_max"] >= summary["cpu_mean"] > 0
+    assert summary["janky_frames"] >= 1 and summary["frames"] > summary["janky_frames"]
+    assert load_series(str(tmp_path / "resources.json.gz"))["columns"]["rss_kb"] == sampler.series()["rss_kb"]
+
+
+def test_drops_unavailable_sources():
+    """
+    Objective: Verify gfxinfo is dropped when `mobile: shell` is not allowed, and the other series are still sampled.
+    """
+    with FakeAppiumServer(relaxed_security=False) as server:
+        driver = server.connect()
+        sampler = ResourceSampler(server.url, driver.session_id, APP_PACKAGE, interval=0.01).start()
+        time.sleep(0.05)
+        sampler.stop()
+        driver.quit()
+
+    assert sampler.sources == ["cpuinfo", "memoryinfo"] and sampler.errors == 1
+    assert sampler.summary()["frames"] is None and sampler.summary()["peak_pss_kb"] is not None
+    assert server.count("POST", r"/execute/sync$") == 2 * sampler.summary()["samples"] + 1
+
+
+def test_frame_delta_survives_app_restarts():
+    """
+    Objective: Verify cumulative frame counters are summed across a restart of the app process.
+    """
+    assert frame_delta([100, 140, 10, 30]) == 70
+    assert frame_delta([None, None]) is None
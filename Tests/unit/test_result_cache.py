@@ -0,0 +1,116 @@
+import importlib
+import importlib.util
+import sys
+from multiprocessing import Pool
+from types import SimpleNamespace
+from Utils.result_cache import Fingerprinter, ResultCache
+
+
+def record_results(args):
+    path, worker = args
+    cache = ResultCache(path)
+    for number in range(25):
+        cache.record(f"test_{worker}_{number}", "fingerprint", "passed", 0.1)
+
+
+def test_workers_record_results_concurrently(tmp_path):
+    """
+    Objective: Verify results recorded by several processes at the same time are all kept.
+    """
+    path = str(tmp_path / "results.sqlite")
+    with Pool(4) as pool:
+        pool.map(record_results, [(path, worker) for worker in range(4)])
+
+    results = ResultCache(path).load()
+    assert len(results) == 100
+    assert results["test_3_24"]["outcome"] == "passed"
+
+    ResultCache(path).record("test_3_24", "other", "failed")
+    assert ResultCache(path).load()["test_3_24"]["fingerprint"] == "other"
+    ResultCache(path).clear()
+    assert ResultCache(path).load() == {}
+
+
+def test_fingerprint_follows_apk_page_modules_and_parameters(tmp_path, monkeypatch):
+    """
+    Objective: Verify the fingerprint covers the APK, the page modules imported through other page
+    modules and the test parameters, and nothing else.
+    """
+    (tmp_path / "fake_pages").mkdir()
+    (tmp_path / "fake_pages" / "__init__.py").write_text("")
+    (tmp_path / "fake_pages" / "base.py").write_text("TIMEOUT = 10\n")
+    (tmp_path / "fake_pages" / "login.py").write_text("from fake_pages.base import TIMEOUT\nclass Login:\n    pass\n")
+    (tmp_path / "fake_tests.py").write_text("from fake_pages.login import Login\nimport json\n\n"
+                                            "def test_login(driver):\n    assert Login\n")
+    (tmp_path / "app.apk").write_bytes(b"build 1")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("fake_tests")
+    item = SimpleNamespace(module=module, function=module.test_login, path=tmp_path / "fake_tests.py",
+                           fixturenames=["driver"], callspec=SimpleNamespace(params={"user": "standard_user"}),
+                           config=SimpleNamespace(pluginmanager=SimpleNamespace(get_plugins=lambda: [])))
+
+    def fingerprint():
+        return Fingerprinter(str(tmp_path / "app.apk"), packages=("fake_pages",)).fingerprint(item)
+
+    first = fingerprint()
+    assert Fingerprinter("", packages=("fake_pages",)).page_modules(module) == sorted(
+        [str(tmp_path / "fake_pages" / "base.py"), str(tmp_path / "fake_pages" / "login.py")])
+    assert fingerprint() == first
+
+    (tmp_path / "fake_pages" / "base.py").write_text("TIMEOUT = 20\n")
+    second = fingerprint()
+    (tmp_path / "app.apk").write_bytes(b"build 2")
+    third = fingerprint()
+    item.callspec.params["user"] = "problem_user"
+    fourth = fingerprint()
+
+    assert len({first, second, third, fourth}) == 4
+    for name in ("fake_tests", "fake_pages.login", "fake_pages.base", "fake_pages"):
+        sys.modules.pop(name, None)
+
+
+def test_fingerprint_follows_the_fixture_modules_and_devices(tmp_path, monkeypatch):
+    """
+    Objective: Verify the fingerprint covers the framework modules the fixtures use, through the
+    helper functions of the conftest.py and the modules those import, and the configured devices.
+    """
+    (tmp_path / "fake_utils").mkdir()
+    (tmp_path / "fake_utils" / "__init__.py").write_text("")
+    (tmp_path / "fake_utils" / "retry.py").write_text("RETRIES = 1\n")
+    (tmp_path / "fake_utils" / "state.py").write_text("from fake_utils.retry import RETRIES\nclass State:\n    pass\n")
+    (tmp_path / "fake_utils" / "report.py").write_text("TITLE = 'report'\n")
+    (tmp_path / "conftest.py").write_text("from fake_utils import report\nfrom fake_utils.state import State\n\n"
+                                          "def make_state():\n    return State()\n\n"
+                                          "def logged_in(driver):\n    return make_state()\n\n"
+                                          "def report_title():\n    return report.TITLE\n")
+    (tmp_path / "fake_tests.py").write_text("def test_cart(logged_in):\n    assert logged_in\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    spec = importlib.util.spec_from_file_location("fake_conftest", tmp_path / "conftest.py")
+    conftest = importlib.util.module_from_spec(spec)
+    sys.modules["fake_conftest"] = conftest
+    spec.loader.exec_module(conftest)
+    module = importlib.import_module("fake_tests")
+    item = SimpleNamespace(module=module, function=module.test_cart, path=tmp_path / "fake_tests.py",
+                           fixturenames=["logged_in", "driver"],
+                           config=SimpleNamespace(pluginmanager=SimpleNamespace(get_plugins=lambda: [conftest])))
+    devices = [SimpleNamespace(udid="emulator-5554", platform_version="15", appium_url="http://localhost:4723")]
+
+    def fingerprint():
+        return Fingerprinter("", packages=("fake_utils",), devices=devices).fingerprint(item)
+
+    assert Fingerprinter("", packages=("fake_utils",)).fixture_modules(item) == sorted(
+        [str(tmp_path / "fake_utils" / "retry.py"), str(tmp_path / "fake_utils" / "state.py")])
+    first = fingerprint()
+    (tmp_path / "fake_utils" / "report.py").write_text("TITLE = 'results'\n")  # No fixture of the test uses it
+    assert fingerprint() == first
+
+    (tmp_path / "fake_utils" / "retry.py").write_text("RETRIES = 2\n")
+    second = fingerprint()
+    devices[0].platform_version = "14"
+    third = fingerprint()
+    devices[0].appium_url = "http://localhost:4725"
+    fourth = fingerprint()
+
+    assert len({first, second, third, fourth}) == 4
+    for name in ("fake_conftest", "fake_tests", "fake_utils.state", "fake_utils.retry", "fake_utils.report", "fake_utils"):
+        sys.modules.pop(name, None)
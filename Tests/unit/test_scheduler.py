@@ -0,0 +1,75 @@
+import pytest
+from types import SimpleNamespace
+from Utils.scheduler import DurationStore, build_units, longest_first
+
+MODULE = SimpleNamespace(__name__="Tests.test_demo")
+
+
+class FakeItem:
+    """
+    The parts of a pytest item the scheduler reads.
+    """
+
+    def __init__(self, name: str, *marks, params: str = ""):
+        self.originalname = name
+        self.nodeid = f"Tests/test_demo.py::{name}{params}"
+        self.module = MODULE
+        self.marks = marks
+
+    def iter_markers(self, name: str):
+        return (mark for mark in self.marks if mark.name == name)
+
+    def get_closest_marker(self, name: str):
+        return next(self.iter_markers(name), None)
+
+
+def test_longest_first_balances_workers():
+    """
+    Objective: Verify LPT spreads tests of uneven durations so the longest worker is close to total / workers.
+    """
+    items = [FakeItem(f"test_{number}") for number in range(8)]
+    durations = {item.nodeid: duration for item, duration in zip(items, [30, 10, 25, 5, 20, 15, 10, 5])}
+
+    plan = longest_first(build_units(items, durations), 3)
+    loads = [sum(unit.duration for unit in assigned) for assigned in plan]
+
+    assert sorted(loads) == [40, 40, 40]
+    assert sum(len(assigned) for assigned in plan) == 8
+
+
+def test_batched_cases_and_dependencies_stay_together():
+    """
+    Objective: Verify batched cases form one unit, and a dependent test runs after its dependency on the same worker.
+    """
+    batched = pytest.mark.batched(page=object).mark
+    items = [FakeItem("test_checkout", pytest.mark.depends_on("test_login").mark),
+             FakeItem("test_cases", batched, params="[a]"), FakeItem("test_cases", batched, params="[b]"),
+             FakeItem("test_login"), FakeItem("test_other")]
+
+    units = build_units(items, {})
+
+    assert [[item.nodeid.split("::")[1] for item in unit.items] for unit in units] == [
+        ["test_login", "test_checkout"], ["test_cases[a]", "test_cases[b]"], ["test_other"]]
+
+
+def test_dependency_cycle_is_rejected():
+    """
+    Objective: Verify a dependency cycle is reported instead of silently dropping tests.
+    """
+    items = [FakeItem("test_a", pytest.mark.depends_on("test_b").mark),
+             FakeItem("test_b", pytest.mark.depends_on("test_a").mark)]
+
+    with pytest.raises(ValueError, match="cycle"):
+        build_units(items, {})
+
+
+def test_duration_store_keeps_a_moving_average(tmp_path):
+    """
+    Objective: Verify stored durations are averaged over runs and the xdist group suffix is dropped.
+    """
+    store = DurationStore(str(tmp_path / "durations.json"))
+
+    store.update({"Tests/test_demo.py::test_a@worker1": 10.0})
+    store.update({"Tests/test_demo.py::test_a": 20.0, "Tests/test_demo.py::test_b": 4.0})
+
+    assert store.load() == {"Tests/test_demo.py::test_a": 15.0, "Tests/test_demo.py::test_b": 4.0}
@@ -0,0 +1,81 @@
+from Pages.login_page import LoginPage
+from Utils.session_pool import SessionPool
+
+APP_PACKAGE = "com.swaglabsmobileapp"
+
+
+def test_released_session_is_reused_after_in_session_reset(fake_server):
+    """
+    Objective: Verify a released session is handed out again after a fast in-session reset,
+    without creating a second session.
+    """
+    pool = SessionPool(fake_server.connect, APP_PACKAGE)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first, "The warm session was not reused."
+    assert fake_server.sessions_created == 1
+    assert fake_server.sessions[first.session_id].data_clears == 1, "App data was not cleared between tests."
+    assert fake_server.count("POST", r"/execute/sync") >= 4  # terminate, clear, activate, health check
+    pool.release(second)
+    pool.close()
+    assert fake_server.sessions_deleted == 1
+
+
+def test_unhealthy_session_is_replaced(fake_server):
+    """
+    Objective: Verify a session that fails the reset/health check is quit and replaced by a new one.
+    """
+    pool = SessionPool(fake_server.connect, APP_PACKAGE)
+
+    first = pool.acquire()
+    pool.release(first)
+    fake_server.kill_session(first.session_id)
+    second = pool.acquire()
+
+    assert second is not first, "A dead session was handed out."
+    assert fake_server.sessions_created == 2
+    assert pool.created == 2 and pool.reused == 0
+    pool.release(second)
+    pool.close()
+
+
+def test_pool_size_zero_quits_every_session(fake_server):
+    """
+    Objective: Verify a pool of size 0 keeps the old behaviour of one session per test.
+    """
+    pool = SessionPool(fake_server.connect, APP_PACKAGE, max_size=0)
+
+    for _ in range(3):
+        pool.release(pool.acquire())
+
+    assert fake_server.sessions_created == 3
+    assert fake_server.sessions_deleted == 3
+
+
+def test_soft_reset_keeps_the_app_running_between_login_cases(fake_server):
+    """
+    Objective: Verify a successful soft reset replaces the full reset, and a failed one falls back to it.
+    """
+    pool = SessionPool(fake_server.connect, APP_PACKAGE)
+    soft_reset = lambda driver: LoginPage(driver).soft_reset()
+
+    driver = pool.acquire()
+    LoginPage(driver).perform_login("locked_out_user", "secret_sauce")
+    pool.release(driver)
+    driver = pool.acquire(soft_reset)
+
+    login_page = LoginPage(driver)
+    assert fake_server.sessions[driver.session_id].data_clears == 0, "The app was reset although the form was."
+    assert login_page.is_absent(login_page.error_box) and pool.soft_resets == 1
+
+    login_page.perform_login("standard_user", "secret_sauce")  # Leaves the login screen
+    pool.release(driver)
+    driver = pool.acquire(soft_reset)
+
+    assert fake_server.sessions[driver.session_id].data_clears == 1, "No full reset after leaving the login screen."
+    assert pool.soft_resets == 1
+    pool.release(driver)
+    pool.close()
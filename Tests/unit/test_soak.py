@@ -0,0 +1,75 @@
+import time
+from Pages.home_page import HomePage
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import FakeSwagLabsApp
+from Utils.soak import SoakRun, drift, percentiles, summary_text
+
+
+def test_runs_default_or_requested_cycles():
+    """
+    Objective: Verify a run stops after the default cycle count, the requested one, or the duration.
+    """
+    for run, expected in [(SoakRun(), 5), (SoakRun(cycles=12), 12)]:
+        while run.next_cycle():
+            pass
+        assert run.cycle == expected
+
+    run = SoakRun(duration=0.05)
+    while run.next_cycle():
+        time.sleep(0.01)
+    assert 2 <= run.cycle <= 6 and run.finished - run.started >= 0.05
+
+
+def test_percentiles_and_drift():
+    """
+    Objective: Verify the percentiles and the drift of a latency series slowing down over time.
+    """
+    samples = [(second, "add_to_cart", (10 + second) / 1000, False) for second in range(100)]
+
+    stats = percentiles([sample[2] for sample in samples])
+    trend = drift(samples)
+
+    assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == (60.0, 105.0, 109.0, 109.0)
+    assert (trend["first_quarter_ms"], trend["last_quarter_ms"]) == (22.0, 97.0)
+    assert trend["slope_ms_per_minute"] == 60.0
+
+
+def test_measures_cart_updates():
+    """
+    Objective: Verify each add/remove is timed until the cart badge shows the new count.
+    """
+    with FakeAppiumServer(app_factory=lambda: FakeSwagLabsApp(logged_in=True)) as server:
+        driver = server.connect()
+        home_page = HomePage(driver)
+        item = home_page.get_available_items()[0]
+        run = SoakRun(cycles=3)
+
+        while run.next_cycle():
+            assert run.measure("add_to_cart", lambda: home_page.add_to_cart(item),
+                               lambda: home_page.get_cart_quantity(fresh=True), 1) == 1
+            assert run.measure("remove_from_cart", lambda: home_page.remove_from_cart(item),
+                               lambda: home_page.get_cart_quantity(fresh=True), 0) == 0
+
+        summary = run.summary()
+        assert summary["cycles"] == 3 and summary["timeouts"] == {}
+        assert summary["latency"]["add_to_cart"]["count"] == 3 and summary["latency"]["all"]["count"] == 6
+        driver.quit()
+
+
+def test_timed_out_actions_are_counted_and_polled_on_the_wait_schedule():
+    """
+    Objective: Verify an action that never shows is polled with backoff, not in a tight loop, and
+    is kept in the percentiles with the full timeout and counted as timed out.
+    """
+    reads = []
+    run = SoakRun(cycles=1, timeout=0.5)
+    run.next_cycle()
+
+    assert run.measure("add_to_cart", lambda: None, lambda: reads.append(time.monotonic()) or 0, 1) == 0
+    assert run.measure("remove_from_cart", lambda: None, lambda: 0, 0) == 0
+
+    assert 4 <= len(reads) <= 10, f"{len(reads)} reads in 0.5 s"
+    summary = run.summary()
+    assert summary["timeouts"] == {"add_to_cart": 1}
+    assert summary["latency"]["add_to_cart"]["max"] >= 500 and summary["latency"]["all"]["count"] == 2
+    assert "timed out: add_to_cart 1x" in summary_text("soak", summary)
@@ -0,0 +1,68 @@
+from appium import webdriver
+from appium.options.common import AppiumOptions
+from selenium.common.exceptions import WebDriverException
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Utils.http_pool import HttpPool
+from Utils.traffic_cassette import CassetteRecorder, ReplayServer
+
+
+def connect(url, recorder=None):
+    """
+    Create an Appium session on the given server, optionally recording its traffic.
+    """
+    connection = HttpPool().connection(url, recorder)
+    options = AppiumOptions().load_capabilities({"platformName": "Android", "appium:appPackage": "com.swaglabsmobileapp"})
+    return webdriver.Remote(connection, options=options)
+
+
+def shop(driver, item_index=0):
+    """
+    Log in, add one item to the cart and return the cart quantity.
+    """
+    LoginPage(driver).perform_login("standard_user", "secret_sauce")
+    home_page = HomePage(driver)
+    home_page.add_to_cart(home_page.get_available_items()[item_index])
+    home_page.invalidate_snapshot()
+    return home_page.get_cart_quantity()
+
+
+def record(fake_server, cassette):
+    recorder = CassetteRecorder(str(cassette))
+    driver = connect(fake_server.url, recorder)
+    quantity = shop(driver)
+    driver.quit()
+    recorder.close()
+    return recorder, quantity
+
+
+def test_replay_reproduces_recorded_run(fake_server, tmp_path):
+    """
+    Objective: Verify a login and add-to-cart flow replays from the cassette with the recorded results.
+    """
+    recorder, recorded_quantity = record(fake_server, tmp_path / "run.jsonl.gz")
+
+    with ReplayServer(recorder.path) as replay:
+        driver = connect(replay.url)
+        assert shop(driver) == recorded_quantity == 1
+        driver.quit()
+
+    assert recorder.exchanges == len(fake_server.requests)
+    assert replay.mismatches == []
+
+
+def test_replay_flags_requests_that_differ(fake_server, tmp_path):
+    """
+    Objective: Verify a request the recording does not contain is reported as a mismatch.
+    """
+    recorder, _ = record(fake_server, tmp_path / "run.jsonl.gz")
+
+    with ReplayServer(recorder.path) as replay:
+        driver = connect(replay.url)
+        try:
+            shop(driver, item_index=1)  # Looks up a different item than the recording
+        except WebDriverException:
+            pass
+        driver.quit()
+
+    assert any("Sauce Labs Bike Light" in key for key in replay.mismatches)
@@ -0,0 +1,150 @@
+import time
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Pages.waits import wait_recorder
+from Utils.fake_appium_server import FakeAppiumServer
+from Utils.fake_swag_labs import FakeSwagLabsApp, LIST_TOP
+
+
+class AnimatedApp(FakeSwagLabsApp):
+    """
+    Products screen whose list slides in over the first few requests, like a running animation.
+    """
+
+    def __init__(self, frames: int):
+        super().__init__(logged_in=True)
+        self.frames_left = frames
+
+    def render(self):
+        root = super().render()
+        if self.frames_left:
+            self.frames_left -= 1
+            products = root.xpath('//*[@content-desc="test-PRODUCTS"]')[0]
+            products.set("bounds", f"[0,{LIST_TOP + 50 * self.frames_left}][1080,2400]")
+        return root
+
+
+def test_implicit_wait_is_disabled_once_per_session(fake_server, fake_driver):
+    """
+    Objective: Verify page-object constructors no longer send an implicit wait command each.
+    """
+    for _ in range(3):
+        LoginPage(fake_driver)
+        HomePage(fake_driver)
+
+    assert fake_server.count("POST", r"/timeouts$") == 1
+
+
+def test_negative_checks_finish_in_milliseconds(fake_driver):
+    """
+    Objective: Verify negative lookups return immediately instead of waiting for a timeout.
+    """
+    home_page = HomePage(fake_driver)  # Still on the login screen
+    start = time.monotonic()
+
+    assert home_page.is_absent(home_page.inventory_title)
+    assert home_page.get_element(home_page.inventory_title, timeout=0) is None
+    assert home_page.get_cart_quantity() is None
+
+    assert time.monotonic() - start < 1.0
+
+
+def test_wrong_error_message_is_rejected_without_timeout(fake_driver):
+    """
+    Objective: Verify is_error_message_present answers False as soon as a different error is shown.
+    """
+    login_page = LoginPage(fake_driver)
+    login_page.perform_login("", "")
+    start = time.monotonic()
+
+    assert not login_page.is_error_message_present("Password is required")
+    assert login_page.is_error_message_present("Username is required")
+    assert time.monotonic() - start < 1.0
+
+
+def test_waits_are_recorded_per_page_object_method(fake_driver):
+    """
+    Objective: Verify each wait is recorded with its page-object method, condition and outcome.
+    """
+    login_page = LoginPage(fake_driver)
+    wait_recorder.records.clear()
+
+    assert login_page.is_on_login_page()
+    with pytest.raises(TimeoutException):
+        login_page.wait_for((AppiumBy.ACCESSIBILITY_ID, "test-Menu"), timeout=0.2)
+
+    labels = [(record["label"], record["condition"], record["satisfied"]) for record in wait_recorder.records]
+    assert labels[0] == ("LoginPage.is_on_login_page", "visible", True)
+    assert labels[1][1:] == ("present", False)
+    assert wait_recorder.records[1]["polls"] > 1, "The wait did not poll until the timeout."
+    assert "LoginPage.is_on_login_page [visible]" in wait_recorder.summary()
+
+
+def test_wait_until_stable_returns_once_the_screen_settles():
+    """
+    Objective: Verify wait_until_stable waits out an animation, returns after N identical samples and
+    reads the settled screen from its last sample.
+    """
+    with FakeAppiumServer(app_factory=lambda: AnimatedApp(frames=4)) as server:
+        driver = server.connect()
+        home_page = HomePage(driver)
+        wait_recorder.records.clear()
+
+        settle_time = home_page.wait_until_stable(samples=3)
+        sources = server.count("GET", r"/source$")
+        quantity = home_page.get_cart_quantity()
+
+        assert 4 < sources <= 4 + 3, "Settling did not stop right after three identical samples."
+        assert server.count("GET", r"/source$") == sources, "The settled screen was fetched again."
+        assert quantity == 0 and 0 < settle_time < 2
+        assert wait_recorder.records[-1]["condition"] == "stable" and wait_recorder.records[-1]["satisfied"]
+        driver.quit()
+
+
+class BadgeApp(FakeSwagLabsApp):
+    """
+    Products screen whose cart badge is re-rendered with a new count over the first few requests,
+    while nothing moves.
+    """
+
+    def __init__(self, frames: int):
+        super().__init__(logged_in=True)
+        self.cart = {"Sauce Labs Backpack"}
+        self.frames_left = frames
+
+    def render(self):
+        root = super().render()
+        if self.frames_left:
+            self.frames_left -= 1
+            root.xpath('//*[@content-desc="test-Cart"]//android.widget.TextView')[0].set("text", str(self.frames_left + 2))
+        return root
+
+
+def test_wait_until_stable_waits_for_content_changes():
+    """
+    Objective: Verify a re-rendered cart badge keeps the screen from settling, although no element moves.
+    """
+    with FakeAppiumServer(app_factory=lambda: BadgeApp(frames=4)) as server:
+        driver = server.connect()
+        home_page = HomePage(driver)
+
+        home_page.wait_until_stable(samples=3)
+
+        assert server.count("GET", r"/source$") == 4 + 3, "The wait settled while the badge was still changing."
+        assert home_page.get_cart_quantity() == 1
+        driver.quit()
+
+
+def test_wait_until_stable_times_out_on_a_screen_that_keeps_changing():
+    """
+    Objective: Verify a screen that never settles raises a timeout instead of returning a moving state.
+    """
+    with FakeAppiumServer(app_factory=lambda: AnimatedApp(frames=10 ** 6)) as server:
+        driver = server.connect()
+
+        with pytest.raises(TimeoutException):
+            HomePage(driver).wait_until_stable(timeout=0.3)
+        driver.quit()
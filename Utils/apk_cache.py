@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger("test_logger")
+
+
+class AdbError(RuntimeError):
+    """
+    Raised when an adb command fails.
+    """
+
+
+class Adb:
+    """
+    Adb is a thin wrapper around the `adb` command line for one device.
+    The APK cache only needs a handful of shell commands and `install`, which keeps this
+    layer small enough to be replaced by a stub in tests.
+    """
+
+    def __init__(self, udid: str, executable: str = None):
+        """
+        Initialize the Adb wrapper.
+
+        :param udid: Device serial as shown by `adb devices`.
+        :param executable: Path of the adb binary. Defaults to $ADB, then 'adb' on the PATH.
+        """
+        self.udid = udid
+        self.executable = executable or os.getenv("ADB", "adb")
+
+    def run(self, *args: str, timeout: float = 300) -> str:
+        """
+        Run an adb command against the device and return its output.
+
+        :raises AdbError: If adb is missing, times out or exits with an error.
+        """
+        command = [self.executable, "-s", self.udid, *args]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as error:
+            raise AdbError(f"{' '.join(command)} failed: {error}") from error
+        if result.returncode != 0:
+            raise AdbError(f"{' '.join(command)} failed: {result.stderr.strip() or result.stdout.strip()}")
+        return result.stdout
+
+    def shell(self, *args: str) -> str:
+        return self.run("shell", *args, timeout=60)
+
+    def install(self, apk_path: str):
+        self.run("install", "-r", apk_path)
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 of a file, reading it in 1 MiB chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ApkInstallCache:
+    """
+    ApkInstallCache installs the APK under test only on devices that do not have that exact build yet.
+
+    A build is identified by the SHA-256 of the APK file; since the signature is part of the
+    file, the hash covers package, version and signing certificate at once. On each device the
+    installed build is checked by hashing the installed base.apk (`pm path` + `sha256sum`).
+    When it matches, the push and install are skipped; sessions are then created without the
+    `app` capability, so Appium only clears the app data. A local JSON index remembers which
+    build was installed on which device and when, so a device whose package was not updated
+    since does not need to be hashed again.
+    """
+
+    def __init__(self, index_path: str, adb_factory=Adb):
+        """
+        Initialize the ApkInstallCache.
+
+        :param index_path: JSON file of the local index of device and build pairs.
+        :param adb_factory: Callable taking a device udid and returning an Adb-like object.
+        """
+        self.index_path = index_path
+        self.adb_factory = adb_factory
+        self.installs = 0  # Number of APK installs done
+        self.skipped = 0  # Number of installs skipped because the build was already on the device
+        self._hashes = {}  # (path, size, mtime) -> sha256 of local APKs
+        self._lock = threading.Lock()
+
+    def apk_hash(self, apk_path: str) -> str:
+        """
+        SHA-256 of a local APK, computed once per file version.
+        """
+        stat = os.stat(apk_path)
+        key = (os.path.abspath(apk_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(apk_path)
+        return self._hashes[key]
+
+    def installed_build(self, adb, package: str) -> dict | None:
+        """
+        Describe the build of a package installed on a device.
+
+        :return: A dictionary with versionCode, lastUpdateTime and path of the installed base.apk,
+                 or None if the package is not installed.
+        """
+        paths = [line[len("package:"):].strip() for line in adb.shell("pm", "path", package).splitlines()
+                 if line.startswith("package:")]
+        if not paths:
+            return None
+        dumpsys = adb.shell("dumpsys", "package", package)
+        version = re.search(r"versionCode=(\d+)", dumpsys)
+        updated = re.search(r"lastUpdateTime=([^\r\n]+)", dumpsys)
+        return {"path": next((path for path in paths if path.endswith("base.apk")), paths[0]),
+                "version_code": version.group(1) if version else None,
+                "last_update": updated.group(1).strip() if updated else None}
+
+    def ensure_installed(self, udid: str, apk_path: str, package: str) -> bool:
+        """
+        Make sure exactly this build of the app is installed on the device.
+
+        :param udid: Device serial.
+        :param apk_path: Local path of the APK under test.
+        :param package: Package name of the app.
+        :return: True if the APK had to be installed, False if the installed build was reused.
+        :raises AdbError: If the device cannot be inspected or the install fails.
+        """
+        adb = self.adb_factory(udid)
+        sha256 = self.apk_hash(apk_path)
+        build = self.installed_build(adb, package)
+        known = self._load().get(udid, {}).get(package)
+
+        if build and known and known["sha256"] == sha256 and known["last_update"] == build["last_update"] \
+                and known["version_code"] == build["version_code"]:
+            matches = True  # Indexed, and the package was not touched since
+        elif build:
+            matches = adb.shell("sha256sum", build["path"]).split()[0] == sha256
+        else:
+            matches = False
+
+        if matches:
+            self.skipped += 1
+            logger.info("%s build %s already installed on %s, skipping the install.", package, sha256[:12], udid)
+        else:
+            adb.install(apk_path)
+            build = self.installed_build(adb, package)
+            self.installs += 1
+            logger.info("Installed %s build %s on %s.", package, sha256[:12], udid)
+        self._store(udid, package, {"sha256": sha256, "version_code": build["version_code"] if build else None,
+                                    "last_update": build["last_update"] if build else None, "checked": time.time()})
+        return not matches
+
+    def _load(self) -> dict:
+        try:
+            with open(self.index_path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, udid: str, package: str, entry: dict):
+        """
+        Update one entry of the index. The file is re-read first and replaced atomically,
+        so parallel workers updating other devices do not overwrite each other.
+        """
+        with self._lock:
+            index = self._load()
+            index.setdefault(udid, {})[package] = entry
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            temporary = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(index, handle, indent=2)
+            os.replace(temporary, self.index_path)
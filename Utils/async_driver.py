@@ -0,0 +1,258 @@
+import asyncio
+import json
+from string import Template
+from urllib.parse import quote, urlsplit
+
+from appium.webdriver.errorhandler import MobileErrorHandler
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from Pages.page_snapshot import ACTION_COMMANDS, NAVIGATION_COMMANDS, READ_ONLY_SCRIPTS
+
+# W3C/Appium routes of the commands the async page objects use
+ROUTES = {
+    Command.NEW_SESSION: ("POST", "/session"),
+    Command.QUIT: ("DELETE", "/session/$sessionId"),
+    Command.SET_TIMEOUTS: ("POST", "/session/$sessionId/timeouts"),
+    Command.GET_PAGE_SOURCE: ("GET", "/session/$sessionId/source"),
+    Command.FIND_ELEMENT: ("POST", "/session/$sessionId/element"),
+    Command.FIND_ELEMENTS: ("POST", "/session/$sessionId/elements"),
+    Command.FIND_CHILD_ELEMENTS: ("POST", "/session/$sessionId/element/$id/elements"),
+    Command.CLICK_ELEMENT: ("POST", "/session/$sessionId/element/$id/click"),
+    Command.CLEAR_ELEMENT: ("POST", "/session/$sessionId/element/$id/clear"),
+    Command.SEND_KEYS_TO_ELEMENT: ("POST", "/session/$sessionId/element/$id/value"),
+    Command.GET_ELEMENT_TEXT: ("GET", "/session/$sessionId/element/$id/text"),
+    Command.GET_ELEMENT_ATTRIBUTE: ("GET", "/session/$sessionId/element/$id/attribute/$name"),
+    "isElementDisplayed": ("GET", "/session/$sessionId/element/$id/displayed"),
+    Command.GET_ELEMENT_RECT: ("GET", "/session/$sessionId/element/$id/rect"),
+    Command.W3C_EXECUTE_SCRIPT: ("POST", "/session/$sessionId/execute/sync"),
+    Command.W3C_ACTIONS: ("POST", "/session/$sessionId/actions"),
+}
+# Keys of a W3C element reference (Appium also sends the legacy JSONWP key)
+ELEMENT_KEYS = ("element-6066-11e4-a52e-4f735466cecf", "ELEMENT")
+
+
+class AsyncHttpClient:
+    """
+    AsyncHttpClient is a minimal HTTP/1.1 client on asyncio streams, shared by many sessions.
+
+    Connections are kept alive and reused per host; at most `max_per_host` requests per host
+    are in flight, the others wait for a free connection. It only speaks what the Appium
+    protocol needs: JSON bodies, Content-Length or chunked responses, no redirects.
+    """
+
+    def __init__(self, max_per_host: int = 16, connect_timeout: float = 10, read_timeout: float = 300):
+        """
+        Initialize the AsyncHttpClient.
+
+        :param max_per_host: Maximum number of open connections per Appium server.
+        :param connect_timeout: Maximum time in seconds to open a connection.
+        :param read_timeout: Maximum time in seconds to wait for a response.
+        """
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.requests = 0
+        self.connections = 0  # Connections opened; requests minus connections were sent on reused ones
+        self._idle = {}  # (host, port) -> idle (reader, writer) pairs
+        self._slots = {}  # (host, port) -> Semaphore limiting the connections in use
+
+    async def request(self, method: str, url: str, body: bytes = None) -> tuple[int, bytes]:
+        """
+        Send one request.
+
+        :return: A tuple of (status code, response body).
+        """
+        parts = urlsplit(url)
+        host = (parts.hostname, parts.port or 80)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        slots = self._slots.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with slots:
+            idle = self._idle.setdefault(host, [])
+            while idle and idle[-1][0].at_eof():
+                idle.pop()[1].close()  # Closed by the server while idle
+            if idle:
+                reader, writer = idle.pop()
+            else:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(*host), self.connect_timeout)
+                self.connections += 1
+            self.requests += 1
+            try:
+                status, keep_alive, data = await asyncio.wait_for(
+                    self._exchange(reader, writer, method, f"{parts.hostname}:{host[1]}", path, body),
+                    self.read_timeout)
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, data
+
+    @staticmethod
+    async def _exchange(reader, writer, method: str, host: str, path: str, body: bytes):
+        head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\nAccept: application/json\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json;charset=UTF-8\r\nContent-Length: {len(body)}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed without a response")
+        version, status = status_line.split(b" ", 2)[:2]
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                data += await reader.readexactly(size)
+                await reader.readline()
+            await reader.readline()
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        keep_alive = headers.get("connection", "").lower() != "close" and version == b"HTTP/1.1"
+        return int(status), keep_alive, data
+
+    async def close(self):
+        """
+        Close every idle connection.
+        """
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+            idle.clear()
+
+
+class AsyncDriver:
+    """
+    AsyncDriver is an asyncio counterpart of the Appium WebDriver for one session.
+
+    It sends the W3C/Appium commands the page objects use over a shared AsyncHttpClient, so
+    one process can drive many sessions concurrently. Errors are raised as the same selenium
+    exceptions as with the sync driver, and actions bump `action_generation` and
+    `screen_generation` like `track_actions` does, so page snapshots and the element cache
+    work unchanged.
+    """
+
+    def __init__(self, client: AsyncHttpClient, appium_url: str, session_id: str, capabilities: dict):
+        self.client = client
+        self.appium_url = appium_url.rstrip("/")
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.action_generation = 0
+        self.screen_generation = 0
+        self.implicit_wait_disabled = True  # Switched off in `create`
+
+    @classmethod
+    async def create(cls, client: AsyncHttpClient, appium_url: str, capabilities: dict) -> "AsyncDriver":
+        """
+        Create a new Appium session.
+
+        :param client: The HTTP client shared by the sessions.
+        :param appium_url: Base URL of the Appium server.
+        :param capabilities: The session capabilities, e.g. {'platformName': 'Android', ...}.
+        :return: AsyncDriver instance of the new session.
+        """
+        driver = cls(client, appium_url, None, capabilities)
+        response = await driver.execute(Command.NEW_SESSION,
+                                        {"capabilities": {"alwaysMatch": capabilities, "firstMatch": [{}]}})
+        driver.session_id = response["value"]["sessionId"]
+        driver.capabilities = response["value"].get("capabilities", capabilities)
+        await driver.execute(Command.SET_TIMEOUTS, {"implicit": 0})
+        return driver
+
+    async def execute(self, command: str, params: dict = None) -> dict:
+        """
+        Send one command of ROUTES.
+
+        :return: The parsed response, with its 'value'.
+        :raises WebDriverException: The selenium exception matching the W3C error of the response.
+        """
+        params = dict(params or {})
+        script = command == Command.W3C_EXECUTE_SCRIPT and params.get("script") not in READ_ONLY_SCRIPTS
+        if command in ACTION_COMMANDS or script:
+            self.action_generation += 1
+        if command in NAVIGATION_COMMANDS or script:
+            self.screen_generation += 1
+        method, route = ROUTES[command]
+        path = Template(route).substitute(sessionId=self.session_id, id=quote(params.pop("id", ""), safe=""),
+                                          name=quote(params.pop("name", ""), safe=""))
+        body = json.dumps(params).encode("utf-8") if method == "POST" else None
+        status, data = await self.client.request(method, self.appium_url + path, body)
+        text = data.decode("utf-8")
+        if status >= 400:
+            MobileErrorHandler().check_response({"status": status, "value": text})
+            raise WebDriverException(f"HTTP {status}: {text}")
+        return json.loads(text) if text else {"value": None}
+
+    async def find_element(self, by: str, value: str) -> "AsyncElement":
+        response = await self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+        return self._element(response["value"])
+
+    async def find_elements(self, by: str, value: str) -> list["AsyncElement"]:
+        response = await self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})
+        return [self._element(reference) for reference in response["value"]]
+
+    async def get_page_source(self) -> str:
+        return (await self.execute(Command.GET_PAGE_SOURCE))["value"]
+
+    async def execute_script(self, script: str, *args):
+        return (await self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)}))["value"]
+
+    async def perform_actions(self, actions: list[dict]):
+        """
+        Send a W3C Actions sequence, e.g. the encoded devices of an ActionBuilder.
+        """
+        await self.execute(Command.W3C_ACTIONS, {"actions": actions})
+
+    async def quit(self):
+        await self.execute(Command.QUIT)
+
+    def _element(self, reference: dict) -> "AsyncElement":
+        return AsyncElement(self, next(reference[key] for key in ELEMENT_KEYS if key in reference))
+
+
+class AsyncElement:
+    """
+    AsyncElement is a WebElement of an AsyncDriver session.
+    """
+
+    def __init__(self, driver: AsyncDriver, element_id: str):
+        self.driver = driver
+        self.id = element_id
+
+    async def _execute(self, command: str, params: dict = None):
+        return (await self.driver.execute(command, {"id": self.id, **(params or {})}))["value"]
+
+    async def click(self):
+        await self._execute(Command.CLICK_ELEMENT)
+
+    async def clear(self):
+        await self._execute(Command.CLEAR_ELEMENT)
+
+    async def send_keys(self, text: str):
+        await self._execute(Command.SEND_KEYS_TO_ELEMENT, {"text": text, "value": list(text)})
+
+    async def text(self) -> str:
+        return await self._execute(Command.GET_ELEMENT_TEXT)
+
+    async def get_attribute(self, name: str):
+        return await self._execute(Command.GET_ELEMENT_ATTRIBUTE, {"name": name})
+
+    async def is_displayed(self) -> bool:
+        return await self._execute("isElementDisplayed")
+
+    async def rect(self) -> dict:
+        return await self._execute(Command.GET_ELEMENT_RECT)
+
+    async def find_elements(self, by: str, value: str) -> list["AsyncElement"]:
+        response = await self.driver.execute(Command.FIND_CHILD_ELEMENTS, {"id": self.id, "using": by, "value": value})
+        return [self.driver._element(reference) for reference in response["value"]]
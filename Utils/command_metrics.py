@@ -0,0 +1,168 @@
+import html
+import json
+import threading
+import time
+from collections import deque
+from Pages.base_page import current_page_method
+
+# Lookups slower than this (in seconds) are listed as slow in the summaries
+SLOW_LOOKUP = 0.5
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+
+class CommandRecorder:
+    """
+    CommandRecorder records every WebDriver command sent by the test run.
+
+    It wraps the driver's command executor, so each HTTP round trip to the Appium server is
+    recorded with its command name, locator strategy, latency, payload sizes and the
+    page-object method that issued it. Records are grouped per test, which allows per-test
+    and per-page-object-method breakdowns in the report.
+    """
+
+    def __init__(self, recent: int = 50):
+        """
+        Initialize the CommandRecorder.
+
+        :param recent: Number of most recent commands kept for failure diagnostics.
+        """
+        self.tests = {}  # Command records per test node id
+        self.recent = deque(maxlen=recent)
+        self.current_test = None
+        self._lock = threading.Lock()
+
+    def install(self, driver):
+        """
+        Hook the recorder into the driver's command executor.
+        Installing the recorder twice on the same driver has no effect.
+
+        :param driver: Appium WebDriver instance.
+        """
+        executor = driver.command_executor
+        if getattr(executor, "command_recorder", None) is self:
+            return
+        executor.command_recorder = self
+        execute = executor.execute
+
+        def recorded_execute(command, params):
+            request_bytes = len(json.dumps(params, default=str))
+            start = time.perf_counter()
+            response = execute(command, params)
+            latency = time.perf_counter() - start
+            self.record(command, params, response, latency, request_bytes)
+            return response
+
+        executor.execute = recorded_execute
+
+    def record(self, command: str, params: dict, response: dict, latency: float, request_bytes: int):
+        """
+        Store one command record.
+
+        :param command: The WebDriver command name (e.g. 'findElement').
+        :param params: The command parameters.
+        :param response: The parsed response of the Appium server.
+        :param latency: HTTP round-trip time in seconds.
+        :param request_bytes: Size of the JSON request payload.
+        """
+        value = response.get("value") if isinstance(response, dict) else response
+        error = value.get("error") if isinstance(value, dict) else None
+        record = {
+            "test": self.current_test,
+            "command": command,
+            "using": params.get("using") if isinstance(params, dict) else None,
+            "selector": params.get("value") if isinstance(params, dict) and "using" in params else None,
+            "latency": round(latency, 5),
+            "request_bytes": request_bytes,
+            "response_bytes": len(value) if isinstance(value, str) else len(json.dumps(value, default=str)),
+            "page_method": current_page_method.get(),
+            "error": error,
+        }
+        with self._lock:
+            self.tests.setdefault(self.current_test, []).append(record)
+            self.recent.append(record)
+
+    def start_test(self, nodeid: str):
+        """
+        Attribute the following commands to the given test.
+
+        :param nodeid: The pytest node id of the test.
+        """
+        self.current_test = nodeid
+
+    def for_test(self, nodeid: str) -> list[dict]:
+        """
+        Get the command records of one test.
+        """
+        with self._lock:
+            return list(self.tests.get(nodeid, []))
+
+    def last(self, count: int) -> list[dict]:
+        """
+        Get the most recent command records.
+        """
+        with self._lock:
+            return list(self.recent)[-count:]
+
+    def dump(self, path: str):
+        """
+        Write every record, grouped per test with per-method summaries, to a JSON file.
+
+        :param path: Destination file path.
+        """
+        data = {str(test): {"summary": summarize(records), "commands": records} for test, records in self.tests.items()}
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+
+
+def summarize(records: list[dict]) -> dict:
+    """
+    Aggregate command records per page-object method.
+
+    :param records: Command records, usually of a single test.
+    :return: A dictionary with totals, a per-method breakdown and the slow lookups.
+    """
+    methods = {}
+    for record in records:
+        method = methods.setdefault(record["page_method"] or "(test code)",
+                                    {"commands": 0, "total": 0.0, "max": 0.0, "bytes": 0, "by_command": {}})
+        method["commands"] += 1
+        method["total"] += record["latency"]
+        method["max"] = max(method["max"], record["latency"])
+        method["bytes"] += record["request_bytes"] + record["response_bytes"]
+        method["by_command"][record["command"]] = method["by_command"].get(record["command"], 0) + 1
+    for method in methods.values():
+        method["total"] = round(method["total"], 4)
+
+    slow = [record for record in records if record["command"] in FIND_COMMANDS and record["latency"] >= SLOW_LOOKUP]
+    return {
+        "commands": len(records),
+        "total": round(sum(record["latency"] for record in records), 4),
+        "methods": dict(sorted(methods.items(), key=lambda item: -item[1]["total"])),
+        "slow_lookups": [{key: record[key] for key in ("page_method", "using", "selector", "latency", "error")}
+                         for record in slow],
+    }
+
+
+def summary_html(records: list[dict]) -> str:
+    """
+    Render the per-method summary of a test as an HTML table for the pytest-html report.
+    """
+    summary = summarize(records)
+    rows = ""
+    for name, method in summary["methods"].items():
+        breakdown = ", ".join(f"{command}×{count}" for command, count in method["by_command"].items())
+        rows += (f"<tr><td>{html.escape(name)}</td><td>{method['commands']}</td><td>{method['total'] * 1000:.0f}</td>"
+                 f"<td>{method['max'] * 1000:.0f}</td><td>{html.escape(breakdown)}</td></tr>")
+    slow = "".join(
+        f"<li>{html.escape(str(lookup['page_method']))}: {html.escape(str(lookup['using']))}="
+        f"{html.escape(str(lookup['selector']))} took {lookup['latency'] * 1000:.0f} ms"
+        f"{' (' + html.escape(lookup['error']) + ')' if lookup['error'] else ''}</li>"
+        for lookup in summary["slow_lookups"])
+    return (f"<p>WebDriver commands: {summary['commands']}, total latency {summary['total'] * 1000:.0f} ms</p>"
+            f"<table><tr><th>Page-object method</th><th>Commands</th><th>Total ms</th><th>Max ms</th>"
+            f"<th>Breakdown</th></tr>{rows}</table>"
+            + (f"<p>Slow lookups:</p><ul>{slow}</ul>" if slow else ""))
+
+
+# Shared recorder for every driver of the test run
+command_recorder = CommandRecorder()
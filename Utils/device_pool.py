@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger("test_logger")
+
+# Base ports of the per-device Appium driver servers; device N gets base + N
+SYSTEM_PORT_BASE = 8200
+CHROMEDRIVER_PORT_BASE = 9515
+MJPEG_SERVER_PORT_BASE = 7810
+
+DEFAULT_DEVICES = [{"udid": "emulator-5554", "appium_url": "http://localhost:4723", "platform_version": "15"}]
+
+
+class NoDeviceAvailableError(RuntimeError):
+    """
+    Raised when every device of the pool stays leased for longer than the lease wait timeout.
+    """
+
+
+class Device:
+    """
+    Device describes one device (or emulator) and the Appium server driving it.
+    Every device gets its own UiAutomator2 system port, chromedriver port and MJPEG port,
+    so several sessions can run side by side on one host without port clashes.
+    """
+
+    def __init__(self, udid: str, appium_url: str, platform_version: str = "15", system_port: int = None,
+                 chromedriver_port: int = None, mjpeg_server_port: int = None, index: int = 0):
+        """
+        Initialize the Device.
+
+        :param udid: Device serial as shown by `adb devices`, e.g. 'emulator-5554'.
+        :param appium_url: URL of the Appium server driving this device.
+        :param platform_version: Android version of the device.
+        :param system_port: UiAutomator2 server port. Derived from the device index if not provided.
+        :param chromedriver_port: Chromedriver port. Derived from the device index if not provided.
+        :param mjpeg_server_port: MJPEG screen streaming port. Derived from the device index if not provided.
+        :param index: Position of the device in the pool, used to derive the default ports.
+        """
+        self.udid = udid
+        self.appium_url = appium_url
+        self.platform_version = str(platform_version)
+        self.system_port = system_port or SYSTEM_PORT_BASE + index
+        self.chromedriver_port = chromedriver_port or CHROMEDRIVER_PORT_BASE + index
+        self.mjpeg_server_port = mjpeg_server_port or MJPEG_SERVER_PORT_BASE + index
+
+    def capabilities(self) -> dict:
+        """
+        The device-specific part of the desired capabilities.
+
+        :return: A dictionary of capabilities to merge into the session capabilities.
+        """
+        return {
+            "platformVersion": self.platform_version,
+            "deviceName": self.udid,
+            "appium:udid": self.udid,
+            "appium:systemPort": self.system_port,
+            "appium:chromedriverPort": self.chromedriver_port,
+            "appium:mjpegServerPort": self.mjpeg_server_port,
+        }
+
+    def __repr__(self):
+        return f"Device({self.udid} @ {self.appium_url})"
+
+
+def load_devices(config_file: str = None) -> list[Device]:
+    """
+    Load the device pool configuration.
+
+    The first source found wins:
+        1. The APPIUM_DEVICES environment variable, either a JSON list of device objects or
+           a comma separated list of 'udid@appium_url' entries.
+        2. The given JSON config file (or the file named by the DEVICES_FILE environment variable),
+           containing a list of device objects.
+        3. The single default device 'emulator-5554' on 'http://localhost:4723'.
+
+    Device objects use the keyword arguments of `Device`, e.g.
+    {"udid": "emulator-5556", "appium_url": "http://localhost:4725", "system_port": 8201}.
+
+    :param config_file: Optional path to a JSON device config file.
+    :return: A list of devices.
+    """
+    raw = os.getenv("APPIUM_DEVICES")
+    config_file = config_file or os.getenv("DEVICES_FILE")
+    if raw:
+        if raw.lstrip().startswith("["):
+            entries = json.loads(raw)
+        else:
+            entries = []
+            for entry in filter(None, (part.strip() for part in raw.split(","))):
+                udid, _, appium_url = entry.partition("@")
+                entries.append({"udid": udid, "appium_url": appium_url or "http://localhost:4723"})
+    elif config_file:
+        with open(config_file, encoding="utf-8") as handle:
+            entries = json.load(handle)
+    else:
+        entries = DEFAULT_DEVICES
+
+    return [Device(index=index, **entry) for index, entry in enumerate(entries)]
+
+
+def worker_index(worker_id: str = None) -> int:
+    """
+    Get the numeric index of the current pytest-xdist worker.
+
+    :param worker_id: The xdist worker id (e.g. 'gw3'). Read from PYTEST_XDIST_WORKER if not provided.
+    :return: The worker number, or 0 when not running under xdist.
+    """
+    worker_id = worker_id or os.getenv("PYTEST_XDIST_WORKER", "")
+    match = re.search(r"(\d+)$", worker_id)
+    return int(match.group(1)) if match else 0
+
+
+class DeviceLease:
+    """
+    DeviceLease is the exclusive claim of one worker on one device.
+
+    The claim is a lease file created atomically in a directory shared by all workers.
+    A heartbeat thread keeps the file fresh; a lease whose owner process is gone, or whose
+    heartbeat has stopped for longer than the lease TTL, is considered abandoned and can be
+    taken over, so devices come back to the pool when a worker crashes.
+    """
+
+    def __init__(self, device: Device, lease_file: str, heartbeat: float):
+        """
+        Initialize the DeviceLease.
+
+        :param device: The leased device.
+        :param lease_file: Path of the lease file owned by this lease.
+        :param heartbeat: Interval in seconds at which the lease file is refreshed.
+        """
+        self.device = device
+        self.lease_file = lease_file
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, args=(heartbeat,),
+                                        name=f"lease-{device.udid}", daemon=True)
+        self._thread.start()
+
+    def _beat(self, heartbeat: float):
+        while not self._stop.wait(heartbeat):
+            try:
+                os.utime(self.lease_file)
+            except FileNotFoundError:
+                logger.warning("Lease on %s was taken over by another worker.", self.device)
+                return
+
+    def release(self):
+        """
+        Stop the heartbeat and give the device back to the pool.
+        """
+        self._stop.set()
+        self._thread.join()
+        try:
+            os.remove(self.lease_file)
+        except FileNotFoundError:
+            pass
+
+
+class DevicePool:
+    """
+    DevicePool hands every pytest-xdist worker its own device and Appium endpoint.
+
+    All workers share one lease directory. Each worker starts looking at the device matching
+    its worker number, so with as many devices as workers nobody has to wait, and falls back
+    to any free device otherwise.
+    """
+
+    def __init__(self, devices: list[Device], lease_dir: str, lease_ttl: float = 60.0):
+        """
+        Initialize the DevicePool.
+
+        :param devices: The devices available to the test run.
+        :param lease_dir: Directory holding the lease files, shared by all workers.
+        :param lease_ttl: Seconds without heartbeat after which a lease is considered abandoned.
+        """
+        self.devices = devices
+        self.lease_dir = lease_dir
+        self.lease_ttl = lease_ttl
+        os.makedirs(lease_dir, exist_ok=True)
+
+    def lease(self, worker_id: str = None, timeout: float = 300.0, poll: float = 1.0) -> DeviceLease:
+        """
+        Lease a free device, waiting for one to become free if necessary.
+
+        :param worker_id: The xdist worker id. Read from PYTEST_XDIST_WORKER if not provided.
+        :param timeout: Maximum time in seconds to wait for a free device.
+        :param poll: Interval in seconds between attempts while all devices are leased.
+        :return: A DeviceLease for the claimed device.
+        :raises NoDeviceAvailableError: If no device became free within the timeout.
+        """
+        start = worker_index(worker_id) % len(self.devices)
+        candidates = self.devices[start:] + self.devices[:start]
+        deadline = time.monotonic() + timeout
+        while True:
+            for device in candidates:
+                lease_file = self._lease_file(device)
+                if self._try_claim(lease_file, worker_id) or (self._reclaim_if_abandoned(lease_file)
+                                                              and self._try_claim(lease_file, worker_id)):
+                    logger.info("Worker %s leased %s.", worker_id or "main", device)
+                    return DeviceLease(device, lease_file, heartbeat=self.lease_ttl / 3)
+            if time.monotonic() >= deadline:
+                raise NoDeviceAvailableError(f"No free device among {len(self.devices)} after {timeout} seconds.")
+            time.sleep(poll)
+
+    def _lease_file(self, device: Device) -> str:
+        return os.path.join(self.lease_dir, re.sub(r"[^\w.-]", "_", device.udid) + ".lease")
+
+    @staticmethod
+    def _try_claim(lease_file: str, worker_id: str) -> bool:
+        try:
+            fd = os.open(lease_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as handle:
+            json.dump({"pid": os.getpid(), "host": socket.gethostname(), "worker": worker_id}, handle)
+        return True
+
+    def _reclaim_if_abandoned(self, lease_file: str) -> bool:
+        """
+        Remove the lease file if its owner is gone. Only one of several workers racing
+        for the same abandoned lease wins the atomic rename.
+
+        :return: True if the lease was abandoned and has been removed.
+        """
+        try:
+            with open(lease_file, encoding="utf-8") as handle:
+                owner = json.load(handle)
+            age = time.time() - os.path.getmtime(lease_file)
+        except (FileNotFoundError, ValueError):
+            # Vanished, or still being written by its creator
+            return False
+
+        owner_dead = owner.get("host") == socket.gethostname() and not _pid_alive(owner.get("pid"))
+        if not owner_dead and age < self.lease_ttl:
+            return False
+
+        tombstone = f"{lease_file}.{uuid.uuid4().hex}.stale"
+        try:
+            os.replace(lease_file, tombstone)
+        except FileNotFoundError:
+            return False  # Another worker reclaimed it first
+        os.remove(tombstone)
+        logger.warning("Reclaimed abandoned device lease %s from %s.", os.path.basename(lease_file), owner)
+        return True
+
+
+def _pid_alive(pid) -> bool:
+    """
+    Check whether a process with the given pid is running on this host.
+    Without a reliable check (Windows) the lease TTL decides instead.
+    """
+    if not isinstance(pid, int) or os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,192 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError
+
+try:
+    from PIL import Image  # Optional: screenshots are converted to WebP when Pillow is installed
+except ImportError:
+    Image = None
+
+logger = logging.getLogger("test_logger")
+
+# Name of the index listing the artifacts of every failed test, one JSON line per failure
+INDEX = "index.jsonl"
+
+
+class ArtifactStore:
+    """
+    ArtifactStore keeps the screenshot, page source and last WebDriver commands of failed tests.
+
+    The data is read from the device on the calling thread, since the session is reset as soon
+    as the test is over. Everything after that runs on a worker thread: screenshots are downscaled
+    and converted to WebP (when Pillow is installed), and files are written to disk. Files are
+    named after the SHA-256 of their content, so identical screenshots or page sources of
+    different failures are stored once, and parametrized cases never overwrite each other.
+    When the directory grows over its size limit, the oldest artifacts are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024, max_width: int = 720):
+        """
+        Initialize the ArtifactStore.
+
+        :param directory: Directory the artifacts are written to.
+        :param max_bytes: Maximum total size of the artifacts; the oldest are deleted beyond it.
+        :param max_width: Screenshots wider than this are downscaled (only with Pillow).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_width = max_width
+        self.webp = Image is not None
+        self.written = 0  # Number of files written
+        self.deduplicated = 0  # Number of files not written because the same content was already stored
+        self.evicted = 0  # Number of files deleted to stay under max_bytes
+        self._queue = queue.Queue()
+        self._sizes = None  # File name -> size of the stored artifacts, oldest first
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def capture(self, driver, test: str, commands: list[dict]) -> dict:
+        """
+        Read the failure artifacts from the driver and hand them over to the worker thread.
+        Only the two round trips to the device run on the calling thread.
+
+        :param driver: Appium WebDriver instance of the failed test.
+        :param test: The pytest node id of the failed test.
+        :param commands: The last WebDriver command records before the failure.
+        :return: The relative file names per artifact kind ('screenshot', 'page_source', 'commands');
+                 artifacts that could not be read from the device are left out.
+        """
+        artifacts = {}
+        try:
+            png = driver.get_screenshot_as_png()
+            artifacts["screenshot"] = self.submit(png, ".webp" if self.webp else ".png", encode=self.webp)
+        except (WebDriverException, HTTPError) as error:
+            logger.warning("Could not take the failure screenshot of %s: %s", test, error)
+        try:
+            artifacts["page_source"] = self.submit(driver.page_source.encode("utf-8"), ".xml")
+        except (WebDriverException, HTTPError) as error:
+            logger.warning("Could not read the failure page source of %s: %s", test, error)
+        artifacts["commands"] = self.submit(json.dumps(commands, indent=2, default=str).encode("utf-8"), ".json")
+        self._queue.put(("index", json.dumps({"test": test, "time": time.time(), "artifacts": artifacts})))
+        return artifacts
+
+    def submit(self, data: bytes, extension: str, encode: bool = False) -> str:
+        """
+        Queue one artifact for writing.
+
+        :param data: Raw content of the artifact.
+        :param extension: File extension of the stored artifact, e.g. '.xml'.
+        :param encode: Convert the PNG in `data` to a downscaled WebP before writing.
+        :return: The file name the artifact is stored under, relative to the directory.
+        """
+        name = hashlib.sha256(data).hexdigest()[:20] + extension
+        self._start()
+        self._queue.put((name, data, encode))
+        return name
+
+    def flush(self):
+        """
+        Wait until every queued artifact is on disk.
+        """
+        if self._thread:
+            self._queue.join()
+
+    def close(self):
+        """
+        Write the queued artifacts and stop the worker thread.
+        """
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                if job[0] == "index":
+                    self._append_index(job[1])
+                else:
+                    self._write(*job)
+            except (OSError, ValueError) as error:
+                logger.warning("Could not write failure artifact: %s", error)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, name: str, data: bytes, encode: bool):
+        """
+        Encode and store one artifact, unless the same content is already stored.
+        """
+        if self._sizes is None:
+            self._sizes = self._scan()
+        file_path = os.path.join(self.directory, name)
+        if name in self._sizes and os.path.exists(file_path):
+            self.deduplicated += 1
+            os.utime(file_path)  # Keep it as the most recent artifact
+            self._sizes[name] = self._sizes.pop(name)
+            return
+        if encode:
+            data = self._encode_screenshot(data)
+        temporary = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(data)
+        os.replace(temporary, file_path)
+        self._sizes[name] = len(data)
+        self.written += 1
+        self._evict()
+
+    def _encode_screenshot(self, png: bytes) -> bytes:
+        """
+        Downscale a PNG screenshot to max_width and convert it to WebP.
+        """
+        image = Image.open(io.BytesIO(png))
+        if image.width > self.max_width:
+            image = image.resize((self.max_width, round(image.height * self.max_width / image.width)))
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=80)
+        return output.getvalue()
+
+    def _evict(self):
+        """
+        Delete the oldest artifacts until the directory is under max_bytes again.
+        """
+        total = sum(self._sizes.values())
+        while total > self.max_bytes and len(self._sizes) > 1:
+            name = next(iter(self._sizes))
+            total -= self._sizes.pop(name)
+            try:
+                os.remove(os.path.join(self.directory, name))
+                self.evicted += 1
+            except FileNotFoundError:
+                pass  # Already evicted by another worker process
+
+    def _scan(self) -> dict:
+        """
+        List the artifacts already on disk, oldest first.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entries = [entry for entry in os.scandir(self.directory)
+                   if entry.is_file() and entry.name != INDEX and not entry.name.endswith(".tmp")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        return {entry.name: entry.stat().st_size for entry in entries}
+
+    def _append_index(self, line: str):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, INDEX), "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
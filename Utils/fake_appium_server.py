@@ -0,0 +1,495 @@
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import unquote
+from lxml import etree
+from Utils.fake_swag_labs import FakeSwagLabsApp, ITEM_HEIGHT, KEY
+
+W3C_ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+# 1x1 transparent PNG, served as screenshot
+BLANK_PNG_BASE64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+
+
+class FakeSession:
+    """
+    FakeSession holds the server-side state of one Appium session on the fake server.
+    It tracks the app package, whether the app is running, how often its data has been
+    cleared, and the simulated app whose screens the session interacts with.
+    """
+
+    def __init__(self, capabilities: dict, app):
+        """
+        Initialize the FakeSession.
+
+        :param capabilities: The W3C capabilities sent with the new session request.
+        :param app: The simulated app (e.g. FakeSwagLabsApp) driven by this session.
+        """
+        self.session_id = uuid.uuid4().hex
+        self.capabilities = capabilities
+        self.app = app
+        self.app_package = capabilities.get("appium:appPackage", "com.swaglabsmobileapp")
+        self.app_running = True
+        self.data_clears = 0
+        self.alive = True
+
+
+class FakeAppiumServer:
+    """
+    FakeAppiumServer is a minimal in-process WebDriver/Appium endpoint.
+    It speaks enough of the W3C protocol for `appium.webdriver.Remote` to create,
+    use and delete sessions, so framework code can be tested without a device.
+
+    Usage:
+        with FakeAppiumServer() as server:
+            driver = webdriver.Remote(server.url, options=...)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 app_factory: Callable = FakeSwagLabsApp, relaxed_security: bool = True):
+        """
+        Initialize the FakeAppiumServer.
+
+        :param host: Interface to bind the HTTP server to.
+        :param port: Port to listen on. Defaults to 0, which picks a free port.
+        :param latency: Simulated server-side latency in seconds added to every request.
+        :param app_factory: Callable creating the simulated app of each new session.
+        :param relaxed_security: Allow `mobile: shell`, like an Appium server started with --relaxed-security.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.app_factory = app_factory
+        self.relaxed_security = relaxed_security
+        self.sessions: dict[str, FakeSession] = {}
+        self.requests: list[tuple[str, str]] = []  # (method, path) of every request served
+        self.sessions_created = 0
+        self.sessions_deleted = 0
+        self.connections = 0  # TCP connections accepted; keep-alive clients reuse them
+        self.drop_requests = 0  # Number of next requests to answer by closing the connection
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the running server, e.g. 'http://127.0.0.1:41234'.
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Start serving requests on a background thread.
+
+        :return: The server itself, for chaining.
+        """
+        handler = type("FakeAppiumHandler", (_FakeAppiumHandler,), {"server_state": self})
+        self._httpd = _FakeHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,),
+                                        name=f"fake-appium-{self.port}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server and release its port.
+        """
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def connect(self, command_executor=None, **capabilities):
+        """
+        Create a real Appium session against this server.
+
+        :param command_executor: Optional remote connection to this server (e.g. from Utils/http_pool.py).
+        :param capabilities: Extra capabilities for the session.
+        :return: Appium driver instance.
+        """
+        from appium import webdriver
+        from appium.options.common import AppiumOptions
+
+        options = AppiumOptions().load_capabilities({"platformName": "Android",
+                                                     "appium:appPackage": "com.swaglabsmobileapp", **capabilities})
+        return webdriver.Remote(command_executor or self.url, options=options)
+
+    def kill_session(self, session_id: str):
+        """
+        Simulate a crashed session (e.g. a dead UiAutomator2 instrumentation).
+        Every following command on the session fails with 'invalid session id'.
+
+        :param session_id: The id of the session to kill.
+        """
+        self.sessions[session_id].alive = False
+
+    def drop_next(self, count: int = 1):
+        """
+        Simulate a transient network error: the next requests are read, then their connection
+        is closed without an answer (like a keep-alive connection dropped by a proxy).
+
+        :param count: Number of requests to drop.
+        """
+        with self._lock:
+            self.drop_requests = count
+
+    def count(self, method: str, pattern: str) -> int:
+        """
+        Count the served requests whose method matches and whose path matches the regex.
+
+        :param method: HTTP method, e.g. 'POST'.
+        :param pattern: Regular expression searched in the request path.
+        :return: The number of matching requests.
+        """
+        return sum(1 for m, path in self.requests if m == method and re.search(pattern, path))
+
+    # --- Command handlers -------------------------------------------------------------
+
+    def handle(self, method: str, path: str, body: dict) -> tuple[int, object]:
+        """
+        Dispatch one request and return the HTTP status code and the W3C 'value'.
+
+        :param method: HTTP method of the request.
+        :param path: URL path of the request.
+        :param body: Parsed JSON body (empty dict for bodiless requests).
+        :return: A tuple of (status code, response value).
+        """
+        with self._lock:
+            self.requests.append((method, path))
+
+        if path == "/status":
+            return 200, {"ready": True, "message": "fake appium server"}
+        if method == "POST" and path == "/session":
+            return self._new_session(body)
+
+        match = re.match(r"^/session/([^/]+)(/.*)?$", path)
+        if not match:
+            return _error(404, "unknown command", f"Unhandled path {path}")
+        session = self.sessions.get(match.group(1))
+        if session is None or not session.alive:
+            return _error(404, "invalid session id", "The session is not active")
+        command_path = match.group(2) or ""
+
+        if method == "DELETE" and command_path == "":
+            del self.sessions[session.session_id]
+            self.sessions_deleted += 1
+            return 200, None
+        if method == "GET" and command_path == "":
+            return 200, session.capabilities
+        if command_path == "/timeouts":
+            return 200, None if method == "POST" else {"implicit": 0}
+        if method == "POST" and command_path == "/execute/sync":
+            return self._execute_script(session, body.get("script", ""), (body.get("args") or [{}])[0])
+        return self.handle_session_command(session, method, command_path, body)
+
+    def handle_session_command(self, session: FakeSession, method: str, command_path: str, body: dict):
+        """
+        Handle the element, page source and screenshot commands of a session.
+
+        :return: A tuple of (status code, response value).
+        """
+        app = session.app
+        if method == "GET" and command_path == "/source":
+            return 200, app.source()
+        if method == "GET" and command_path == "/screenshot":
+            return 200, BLANK_PNG_BASE64
+        if method == "POST" and command_path in ("/element", "/elements"):
+            return self._find(app.render(), body, command_path == "/elements", app.process)
+        if command_path == "/actions":
+            if method == "POST":
+                self._perform_actions(app, body.get("actions", []))
+            return 200, None
+
+        match = re.match(r"^/element/([^/]+)(/.*)?$", command_path)
+        if not match:
+            return _error(404, "unknown command", f"Unhandled command {method} {command_path}")
+        key, _, process = unquote(match.group(1)).rpartition("@")
+        action = match.group(2) or ""
+        node = _by_key(app.render(), key) if process == str(app.process) else None
+        if node is None:
+            return _error(404, "stale element reference", f"Element {key} is no longer on screen")
+
+        if method == "POST" and action in ("/element", "/elements"):
+            return self._find(node, body, action == "/elements", app.process)
+        if method == "POST" and action == "/click":
+            app.click(key)
+            return 200, None
+        if method == "POST" and action == "/clear":
+            app.clear(key)
+            return 200, None
+        if method == "POST" and action == "/value":
+            app.set_text(key, body.get("text", "".join(body.get("value", []))))
+            return 200, None
+        if method == "GET" and action == "/displayed":
+            return 200, node.get("displayed") == "true"
+        if method == "GET" and action == "/text":
+            return 200, node.get("text")
+        if method == "GET" and action.startswith("/attribute/"):
+            return 200, node.get(action[len("/attribute/"):])
+        if method == "GET" and action == "/rect":
+            x1, y1, x2, y2 = _bounds(node)
+            return 200, {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+        return _error(404, "unknown command", f"Unhandled command {method} {command_path}")
+
+    def _find(self, scope, body: dict, many: bool, process: int):
+        """
+        Resolve a locator on the rendered hierarchy.
+        Element ids are the node key and the app process number, e.g. 'login-button@1'.
+        """
+        using, value = body.get("using"), body.get("value")
+        if using == "xpath":
+            found = scope.xpath(value)
+        elif using == "accessibility id":
+            found = scope.xpath(".//*[@content-desc=$value]", value=value)
+        elif using == "id":
+            found = scope.xpath(".//*[@resource-id=$value]", value=value)
+        elif using == "class name":
+            found = scope.xpath(".//*[@class=$value]", value=value)
+        elif using == "-android uiautomator":
+            try:
+                found = _ui_select(list(scope.iter()), _parse_uiselector(value))
+            except ValueError as error:
+                return _error(400, "invalid selector", str(error))
+        else:
+            return _error(400, "invalid selector", f"Unsupported locator strategy {using}")
+        found = [element for element in found if isinstance(element, etree._Element) and element.get(KEY)]
+        if many:
+            return 200, [{W3C_ELEMENT_KEY: f"{element.get(KEY)}@{process}"} for element in found]
+        if not found:
+            return _error(404, "no such element", f"No element matches {using}={value}")
+        return 200, {W3C_ELEMENT_KEY: f"{found[0].get(KEY)}@{process}"}
+
+    @staticmethod
+    def _perform_actions(app, sources: list):
+        """
+        Replay the taps of W3C pointer action sequences on the app: a pointerDown followed by a
+        pointerUp at the same viewport position is a tap. Other input sources are ignored.
+        """
+        for source in sources:
+            if source.get("type") != "pointer":
+                continue
+            position, down_at = (0, 0), None
+            for action in source.get("actions", []):
+                if action["type"] == "pointerMove":
+                    position = (int(action.get("x", 0)), int(action.get("y", 0)))
+                elif action["type"] == "pointerDown":
+                    down_at = position
+                elif action["type"] == "pointerUp":
+                    if down_at == position:
+                        app.tap(*position)
+                    down_at = None
+
+    def _new_session(self, body: dict):
+        capabilities = dict(body.get("capabilities", {}).get("alwaysMatch", {}))
+        session = FakeSession(capabilities, self.app_factory())
+        with self._lock:
+            self.sessions[session.session_id] = session
+            self.sessions_created += 1
+        return 200, {"sessionId": session.session_id, "capabilities": capabilities}
+
+    def _execute_script(self, session: FakeSession, script: str, args: dict):
+        app_id = args.get("appId", session.app_package)
+        if script == "mobile: getCurrentPackage":
+            return 200, session.app_package if session.app_running else "com.android.launcher3"
+        if script == "mobile: getCurrentActivity":
+            return 200, ".MainActivity" if session.app_running else "com.android.launcher3.Launcher"
+        if script == "mobile: terminateApp":
+            was_running = session.app_running
+            session.app_running = False
+            return 200, was_running
+        if script == "mobile: activateApp":
+            if not session.app_running:
+                session.app.restart()
+            session.app_running = True
+            return 200, None
+        if script == "mobile: clearApp":
+            session.data_clears += 1
+            session.app.reset()
+            return 200, None
+        if script == "mobile: queryAppState":
+            return 200, 4 if session.app_running else 1
+        if script == "mobile: backgroundApp":
+            return 200, None
+        if script == "mobile: scrollGesture":
+            if args.get("direction") not in ("down", "up"):
+                return 200, False
+            step = max(1, int(args.get("height", 0) * float(args.get("percent", 1.0))) // ITEM_HEIGHT)
+            session.app.scroll_by(step if args["direction"] == "down" else -step)
+            return 200, session.app.can_scroll(args["direction"])
+        if script == "mobile: deepLink":
+            if not session.app.open_link(args.get("url", "")):
+                return _error(500, "unknown error", f"No activity handles {args.get('url')}")
+            session.app_running = True
+            return 200, None
+        if script == "mobile: getPerformanceData":
+            table = session.app.performance_data(args.get("dataType"))
+            if table is None:
+                return _error(400, "invalid argument", f"Unknown data type {args.get('dataType')}")
+            return 200, table
+        if script == "mobile: shell":
+            if not self.relaxed_security:
+                return _error(403, "unknown error", "Potentially insecure feature 'adb_shell' has not been enabled")
+            if args.get("command") == "dumpsys" and (args.get("args") or [None])[0] == "gfxinfo":
+                return 200, session.app.gfxinfo()
+            return 200, ""
+        return self.handle_script(session, script, args, app_id)
+
+    def handle_script(self, session: FakeSession, script: str, args: dict, app_id: str):
+        """
+        Handle a `mobile:` execute method that is not covered by the app lifecycle handlers.
+
+        :return: A tuple of (status code, response value).
+        """
+        return _error(404, "unknown method", f"Unsupported execute method {script}")
+
+
+def _by_key(root, key: str):
+    """
+    Find the rendered node carrying the given element key, or None if it is not on screen.
+    """
+    for element in root.iter():
+        if element.get(KEY) == key:
+            return element
+    return None
+
+
+# UiSelector methods understood by the fake server and the node attributes they compare
+UISELECTOR_ATTRIBUTES = {"className": "class", "text": "text", "description": "content-desc", "resourceId": "resource-id"}
+
+
+def _parse_uiselector(expression: str):
+    """
+    Parse a 'new UiSelector().className("...").childSelector(new UiSelector()...)' expression.
+
+    :return: A tuple of (attribute checks, chained (method, selector) or None).
+    :raises ValueError: If the expression uses syntax or methods the fake server does not know.
+    """
+    selector, position = _parse_selector(expression.strip(), 0)
+    if position != len(expression.strip()):
+        raise ValueError(f"Unexpected '{expression[position:]}' in UiSelector")
+    return selector
+
+
+def _parse_selector(text: str, position: int):
+    prefix = "new UiSelector()"
+    if not text.startswith(prefix, position):
+        raise ValueError(f"Expected '{prefix}' at '{text[position:]}'")
+    position += len(prefix)
+    checks, chain = [], None
+    while text.startswith(".", position):
+        match = re.compile(r"\.(\w+)\(").match(text, position)
+        if not match:
+            raise ValueError(f"Unexpected '{text[position:]}' in UiSelector")
+        method, position = match.group(1), match.end()
+        if method in ("childSelector", "fromParent"):
+            nested, position = _parse_selector(text, position)
+            chain = (method, nested)
+        elif method in UISELECTOR_ATTRIBUTES:
+            literal = re.compile(r'"((?:[^"\\]|\\.)*)"').match(text, position)
+            if not literal:
+                raise ValueError(f"Expected a string argument for {method}")
+            checks.append((UISELECTOR_ATTRIBUTES[method], re.sub(r"\\(.)", r"\1", literal.group(1))))
+            position = literal.end()
+        else:
+            raise ValueError(f"UiSelector method {method} is not supported by the fake server")
+        if not text.startswith(")", position):
+            raise ValueError(f"Expected ')' after {method}")
+        position += 1
+    return (checks, chain), position
+
+
+def _ui_select(candidates: list, selector) -> list:
+    """
+    Resolve a parsed UiSelector among the candidate nodes, following childSelector/fromParent chains.
+    """
+    checks, chain = selector
+    matched = [node for node in candidates if node.get(KEY) and all(node.get(name) == value for name, value in checks)]
+    if chain is None:
+        return matched
+    method, nested = chain
+    found = []
+    for node in matched:
+        pool = list(node.iterdescendants()) if method == "childSelector" else \
+            [sibling for sibling in node.getparent() if sibling is not node]
+        found.extend(element for element in _ui_select(pool, nested) if element not in found)
+    return found
+
+
+def _bounds(node) -> tuple[int, int, int, int]:
+    """
+    Parse the UiAutomator2 '[x1,y1][x2,y2]' bounds attribute.
+    """
+    return tuple(int(value) for value in node.get("bounds").replace("][", ",").strip("[]").split(","))
+
+
+def _error(status: int, error: str, message: str) -> tuple[int, dict]:
+    """
+    Build a W3C error response value.
+    """
+    return status, {"error": error, "message": message, "stacktrace": ""}
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    # Listen backlog; the default of 5 drops concurrent connects of many sessions, which then retry after 1 s
+    request_queue_size = 128
+
+
+class _FakeAppiumHandler(BaseHTTPRequestHandler):
+    """
+    HTTP glue between `http.server` and `FakeAppiumServer.handle`.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real Appium server
+    wbufsize = 64 * 1024  # Send headers and body in one segment (avoids Nagle/delayed-ACK stalls)
+    server_state: FakeAppiumServer = None
+
+    def setup(self):
+        super().setup()
+        with self.server_state._lock:
+            self.server_state.connections += 1
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        with self.server_state._lock:
+            drop = self.server_state.drop_requests > 0
+            if drop:
+                self.server_state.drop_requests -= 1
+                self.server_state.requests.append((method, self.path.rstrip("/") or "/"))
+        if drop:
+            self.close_connection = True
+            return
+        body = json.loads(raw) if raw.strip() else {}
+        if self.server_state.latency:
+            time.sleep(self.server_state.latency)
+        status, value = self.server_state.handle(method, self.path.rstrip("/") or "/", body)
+        payload = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass  # Keep test output clean
@@ -0,0 +1,296 @@
+from lxml import etree
+
+# Screen geometry of the simulated device, in pixels
+SCREEN_WIDTH = 1080
+SCREEN_HEIGHT = 2400
+LIST_TOP = 400  # y coordinate where the product list starts
+ITEM_HEIGHT = 450
+
+USERS = {
+    "standard_user": "secret_sauce",
+    "locked_out_user": "secret_sauce",
+    "problem_user": "secret_sauce",
+}
+
+# Private attribute carrying the stable element key; stripped from the page source
+KEY = "_key"
+
+# Simulated resource usage: memory of a fresh app process and growth per cart item, in KB
+BASE_PSS_KB = 120000
+BASE_RSS_KB = 180000
+CART_ITEM_KB = 1500
+
+
+def catalog(size: int) -> list[str]:
+    """
+    Build a product catalog of the given size, starting with the real Swag Labs products.
+
+    :param size: Number of products in the catalog.
+    :return: A list of product titles.
+    """
+    real = ["Sauce Labs Backpack", "Sauce Labs Bike Light", "Sauce Labs Bolt T-Shirt",
+            "Sauce Labs Fleece Jacket", "Sauce Labs Onesie", "Test.allTheThings() T-Shirt (Red)"]
+    return real[:size] + [f"Sauce Labs Product {index}" for index in range(len(real), size)]
+
+
+class FakeSwagLabsApp:
+    """
+    FakeSwagLabsApp simulates the Swag Labs sample app behind the fake Appium server.
+
+    It models the login screen (validation and error messages) and the products screen
+    (catalog, ADD TO CART / REMOVE buttons and the cart badge), and renders them as a
+    UiAutomator2-like hierarchy. Every node carries a stable key, which the server turns into
+    the element id together with the app process number, so element handles stay valid until
+    their node leaves the screen or the app restarts.
+    """
+
+    def __init__(self, items=6, viewport: int = None, logged_in: bool = False):
+        """
+        Initialize the FakeSwagLabsApp.
+
+        :param items: Either the number of products or the list of product titles.
+        :param viewport: Number of products rendered at once. Defaults to None, which renders the whole list.
+        :param logged_in: Start on the products screen instead of the login screen.
+        """
+        self.items = catalog(items) if isinstance(items, int) else list(items)
+        self.viewport = viewport
+        self.start_logged_in = logged_in
+        self.process = 0  # Incremented whenever the app process starts again; old element handles go stale
+        self.reset()
+
+    def reset(self):
+        """
+        Simulate clearing the app data: logged out, empty cart, empty login form.
+        """
+        self.screen = "products" if self.start_logged_in else "login"
+        self.cart = set()
+        self.username = ""
+        self.password = ""
+        self.error = None
+        self.scroll = 0  # Index of the first rendered product
+        self.frames = self.janky_frames = 0  # Frame counters of the app process, as shown by gfxinfo
+        self.process += 1
+
+    def restart(self):
+        """
+        Simulate an app restart: the login form is shown again, the cart is kept.
+        """
+        self.screen = "products" if self.start_logged_in else "login"
+        self.username = self.password = ""
+        self.error = None
+        self.scroll = 0
+        self.frames = self.janky_frames = 0
+        self.process += 1
+
+    # --- Rendering ---------------------------------------------------------------------
+
+    def render(self):
+        """
+        Render the current screen as an lxml tree.
+
+        :return: The root element of the hierarchy.
+        """
+        root = etree.Element("hierarchy", rotation="0", width=str(SCREEN_WIDTH), height=str(SCREEN_HEIGHT))
+        frame = _node(root, "android.widget.FrameLayout", "root", (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        if self.screen == "login":
+            self._render_login(frame)
+        else:
+            self._render_products(frame)
+        return root
+
+    def source(self) -> str:
+        """
+        The page source of the current screen, without the private element keys.
+        """
+        root = self.render()
+        for element in root.iter():
+            element.attrib.pop(KEY, None)
+        return etree.tostring(root, encoding="unicode")
+
+    def _render_login(self, parent):
+        form = _node(parent, "android.widget.ScrollView", "login", (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), desc="test-Login")
+        _node(form, "android.widget.EditText", "username", (100, 900, 980, 1040), desc="test-Username",
+              text=self.username or "Username")
+        _node(form, "android.widget.EditText", "password", (100, 1080, 980, 1220), desc="test-Password",
+              text="•" * len(self.password) if self.password else "Password", password="true")
+        button = _node(form, "android.view.ViewGroup", "login-button", (100, 1260, 980, 1400), desc="test-LOGIN",
+                       clickable="true")
+        _node(button, "android.widget.TextView", "login-label", (450, 1300, 630, 1360), text="LOGIN")
+        if self.error:
+            box = _node(form, "android.view.ViewGroup", "error", (100, 1440, 980, 1580), desc="test-Error message")
+            _node(box, "android.widget.TextView", f"error-label:{self.error}", (120, 1470, 960, 1550), text=self.error)
+            dismiss = _node(box, "android.view.ViewGroup", "error-dismiss", (880, 1470, 960, 1550), clickable="true")
+            _node(dismiss, "android.widget.ImageView", "error-dismiss-icon", (890, 1480, 950, 1540))
+
+    def _render_products(self, parent):
+        header = _node(parent, "android.view.ViewGroup", "header", (0, 0, SCREEN_WIDTH, 300))
+        _node(header, "android.view.ViewGroup", "menu", (20, 100, 140, 220), desc="test-Menu", clickable="true")
+        cart = _node(header, "android.view.ViewGroup", "cart", (940, 100, 1060, 220), desc="test-Cart", clickable="true")
+        _node(cart, "android.widget.ImageView", "cart-icon", (950, 110, 1050, 210))
+        if self.cart:
+            badge = _node(cart, "android.view.ViewGroup", "cart-badge", (1000, 100, 1060, 160))
+            _node(badge, "android.widget.TextView", "cart-count", (1010, 105, 1050, 155), text=str(len(self.cart)))
+        _node(parent, "android.widget.TextView", "title", (40, 310, 400, 380), text="PRODUCTS")
+        scroller = _node(parent, "android.widget.ScrollView", "products", (0, LIST_TOP, SCREEN_WIDTH, SCREEN_HEIGHT),
+                         desc="test-PRODUCTS", scrollable="true")
+        content = _node(scroller, "android.view.ViewGroup", "products-content", (0, LIST_TOP, SCREEN_WIDTH, SCREEN_HEIGHT))
+        last = len(self.items) if self.viewport is None else min(len(self.items), self.scroll + self.viewport)
+        for position, index in enumerate(range(self.scroll, last)):
+            title = self.items[index]
+            top = LIST_TOP + position * ITEM_HEIGHT
+            item = _node(content, "android.view.ViewGroup", f"item:{title}", (0, top, SCREEN_WIDTH, top + ITEM_HEIGHT),
+                         desc="test-Item")
+            _node(item, "android.widget.ImageView", f"item-image:{title}", (40, top + 20, 340, top + 320))
+            _node(item, "android.widget.TextView", f"item-title:{title}", (380, top + 20, 1040, top + 120),
+                  desc="test-Item title", text=title)
+            _node(item, "android.widget.TextView", f"item-price:{title}", (380, top + 140, 700, top + 220),
+                  desc="test-Price", text=f"${9.99 + index:.2f}")
+            label = "REMOVE" if title in self.cart else "ADD TO CART"
+            button = _node(item, "android.view.ViewGroup", f"item-button:{title}", (380, top + 260, 1040, top + 400),
+                           desc=f"test-{label}", clickable="true")
+            _node(button, "android.widget.TextView", f"item-button-label:{title}", (560, top + 300, 860, top + 360),
+                  text=label)
+
+    # --- Interaction -------------------------------------------------------------------
+
+    def click(self, key: str):
+        """
+        Handle a tap on the element with the given key.
+        """
+        self.frames += 4  # Ripple animation
+        if key in ("login-button", "login-label"):
+            self._submit_login()
+        elif key in ("error-dismiss", "error-dismiss-icon"):
+            self.error = None
+        elif key.startswith("item-button"):
+            title = key.split(":", 1)[1]
+            self.cart.symmetric_difference_update({title})  # ADD TO CART <-> REMOVE
+
+    def tap(self, x: int, y: int):
+        """
+        Handle a tap at screen coordinates by clicking the innermost clickable element there.
+        """
+        hit = None
+        for element in self.render().iter():
+            bounds = element.get("bounds")
+            if element.get("clickable") == "true" and bounds and _contains(bounds, x, y):
+                hit = element.get(KEY)
+        if hit:
+            self.click(hit)
+
+    def set_text(self, key: str, text: str):
+        """
+        Handle typing into the element with the given key.
+        """
+        if key == "username":
+            self.username += text
+        elif key == "password":
+            self.password += text
+
+    def clear(self, key: str):
+        """
+        Handle clearing the element with the given key.
+        """
+        if key == "username":
+            self.username = ""
+        elif key == "password":
+            self.password = ""
+
+    def open_link(self, url: str) -> bool:
+        """
+        Handle a deep link. Like the real app, 'swaglabs://swag-overview/<ids>' opens the products
+        screen without logging in, with the products of the comma-separated ids in the cart.
+
+        :return: True if the link was handled, False if the app does not know it.
+        """
+        prefix = "swaglabs://swag-overview/"
+        if not url.startswith(prefix):
+            return False
+        ids = [int(value) for value in url[len(prefix):].split(",") if value.strip().isdigit()]
+        self.screen = "products"
+        self.cart = {self.items[index] for index in ids if index < len(self.items)}
+        self.error = None
+        self.scroll = 0
+        return True
+
+    def scroll_by(self, items: int):
+        """
+        Scroll the product list by the given number of items (negative scrolls up).
+
+        :return: True if the list moved, False if it was already at the end.
+        """
+        if self.viewport is None:
+            return False
+        previous = self.scroll
+        self.scroll = max(0, min(len(self.items) - self.viewport, self.scroll + items))
+        self.frames += 12
+        self.janky_frames += 1  # Binding the newly visible rows misses one frame deadline
+        return self.scroll != previous
+
+    def can_scroll(self, direction: str) -> bool:
+        """
+        Whether the product list can scroll further in the given direction ('down' or 'up').
+        """
+        if self.viewport is None:
+            return False
+        if direction == "up":
+            return self.scroll > 0
+        return self.scroll + self.viewport < len(self.items)
+
+    # --- Resource usage ----------------------------------------------------------------
+
+    def performance_data(self, data_type: str) -> list | None:
+        """
+        Answer `mobile: getPerformanceData` like UiAutomator2: a header row and a value row.
+
+        :return: The table, or None for an unknown data type.
+        """
+        if data_type == "cpuinfo":
+            return [["user", "kernel"], [round(2.0 + self.frames % 7 * 0.5, 1), 1.5]]
+        if data_type == "memoryinfo":
+            growth = len(self.cart) * CART_ITEM_KB + self.scroll * 10
+            return [["totalPrivateDirty", "totalPss", "totalRss"],
+                    [str(BASE_PSS_KB // 2 + growth), str(BASE_PSS_KB + growth), str(BASE_RSS_KB + growth)]]
+        return None
+
+    def gfxinfo(self) -> str:
+        """
+        The frame statistics part of `dumpsys gfxinfo <package>`.
+        """
+        share = self.janky_frames / self.frames * 100 if self.frames else 0.0
+        return (f"Stats since: 0ns\nTotal frames rendered: {self.frames}\n"
+                f"Janky frames: {self.janky_frames} ({share:.2f}%)\n")
+
+    def _submit_login(self):
+        if not self.username:
+            self.error = "Username is required"
+        elif not self.password:
+            self.error = "Password is required"
+        elif USERS.get(self.username) != self.password:
+            self.error = "Username and password do not match any user in this service."
+        elif self.username == "locked_out_user":
+            self.error = "Sorry, this user has been locked out."
+        else:
+            self.error = None
+            self.screen = "products"
+
+
+def _node(parent, tag: str, key: str, bounds: tuple, desc: str = "", text: str = "", **attributes):
+    """
+    Append a UiAutomator2-like node to the parent.
+    """
+    x1, y1, x2, y2 = bounds
+    element = etree.SubElement(parent, tag)
+    element.attrib.update({
+        "index": str(len(parent) - 1), "package": "com.swaglabsmobileapp", "class": tag, "text": text,
+        "content-desc": desc, "resource-id": "", "clickable": "false", "enabled": "true", "displayed": "true",
+        "bounds": f"[{x1},{y1}][{x2},{y2}]",
+    })
+    element.attrib.update(attributes)
+    element.set(KEY, key)
+    return element
+
+
+def _contains(bounds: str, x: int, y: int) -> bool:
+    x1, y1, x2, y2 = (int(value) for value in bounds.replace("][", ",").strip("[]").split(","))
+    return x1 <= x < x2 and y1 <= y < y2
@@ -0,0 +1,164 @@
+import os
+import socket
+import sqlite3
+import time
+
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException)
+from urllib3.exceptions import HTTPError, ReadTimeoutError
+
+# Kinds of test failures, from the exception that failed the test
+FAILURE_KINDS = ("timeout", "stale_element", "no_such_element", "session", "assertion", "other")
+# Failures that can be transient on a device. Failed assertions, which usually are real bugs, and errors
+# in the test code itself are only retried when asked for (--retry-on).
+RETRYABLE_KINDS = ("timeout", "stale_element", "no_such_element", "session")
+# Growth of the wait before every further rerun
+BACKOFF_FACTOR = 2.0
+
+
+def classify(error: BaseException) -> str:
+    """
+    The kind of a test failure (see FAILURE_KINDS).
+
+    :param error: The exception that failed the test.
+    :return: 'timeout' for waits and reads that timed out, 'stale_element' and 'no_such_element' for
+             element lookups, 'session' for a lost session or Appium connection, 'assertion' for failed
+             asserts, 'other' for anything else.
+    """
+    if isinstance(error, (TimeoutException, ReadTimeoutError, socket.timeout)):
+        return "timeout"
+    if isinstance(error, StaleElementReferenceException):
+        return "stale_element"
+    if isinstance(error, NoSuchElementException):
+        return "no_such_element"
+    if isinstance(error, (InvalidSessionIdException, HTTPError, ConnectionError)):
+        return "session"
+    if isinstance(error, AssertionError):
+        return "assertion"
+    return "other"
+
+
+class RetryPolicy:
+    """
+    RetryPolicy decides whether a failed test is run again, and after how long. The reruns
+    themselves are done by pytest-rerunfailures, through the `flaky` marker of every device test.
+
+    A test is retried up to `retries` times when it failed with one of `kinds`;
+    `@pytest.mark.flaky(reruns=3, reruns_delay=2.0)` overrides the limit and backoff of one test.
+    The n-th retry waits `backoff * BACKOFF_FACTOR ** (n - 1)` seconds, giving a slow screen time to settle.
+    """
+
+    def __init__(self, retries: int = 1, backoff: float = 1.0, kinds: tuple = RETRYABLE_KINDS):
+        """
+        Initialize the RetryPolicy.
+
+        :param retries: Maximum number of retries per test (0 = no retries).
+        :param backoff: Seconds before the first retry, doubled for every further retry.
+        :param kinds: The failure kinds that are retried (see FAILURE_KINDS).
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.kinds = kinds
+
+    def for_item(self, item) -> tuple[int, float]:
+        """
+        The retry limit and backoff of a test.
+        """
+        marker = item.get_closest_marker("flaky")
+        if marker is None:
+            return self.retries, self.backoff
+        return marker.kwargs.get("reruns", self.retries), marker.kwargs.get("reruns_delay", self.backoff)
+
+    def retryable(self, error: BaseException = None) -> bool:
+        """
+        Whether a test that failed with the given exception is run again; the rerun condition of the `flaky` marker.
+        """
+        return error is not None and classify(error) in self.kinds
+
+
+class FlakeStore:
+    """
+    FlakeStore keeps the outcome of the last runs of every test: passed, flaky (failed, then
+    passed on a retry) or failed, with the kinds of the failures.
+
+    A test whose runs failed at least once too often is quarantined. A test that did not pass
+    at all in its last runs is broken rather than flaky, and is not quarantined. The store is
+    a local SQLite database, written by every pytest-xdist worker at the end of its run.
+    """
+
+    def __init__(self, path: str, history: int = 20, timeout: float = 30):
+        """
+        Initialize the FlakeStore.
+
+        :param path: SQLite database file of the outcomes, created on first use.
+        :param history: Number of runs kept per test; the flake rate is computed over them.
+        :param timeout: Maximum time in seconds to wait for another worker's write to finish.
+        """
+        self.path = path
+        self.history = history
+        self.timeout = timeout
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS outcomes (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                           "nodeid TEXT NOT NULL, outcome TEXT NOT NULL, attempts INTEGER NOT NULL, "
+                           "kinds TEXT NOT NULL, recorded REAL NOT NULL)")
+        return connection
+
+    def record(self, outcomes: list[tuple]):
+        """
+        Store the outcomes of a run, dropping the runs of those tests beyond `history`.
+
+        :param outcomes: (node id, outcome, attempts, failure kinds) tuples; the outcome is
+                         'passed', 'flaky' or 'failed'.
+        """
+        if not outcomes:
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO outcomes (nodeid, outcome, attempts, kinds, recorded) VALUES (?, ?, ?, ?, ?)",
+                    [(nodeid, outcome, attempts, ",".join(kinds), time.time())
+                     for nodeid, outcome, attempts, kinds in outcomes])
+                connection.execute("DELETE FROM outcomes WHERE id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                                   "(PARTITION BY nodeid ORDER BY id DESC) AS age FROM outcomes) WHERE age > ?)",
+                                   (self.history,))
+        finally:
+            connection.close()
+
+    def rates(self) -> dict[str, dict]:
+        """
+        The flake statistics of every test over its last runs.
+
+        :return: Per node id, a dictionary with 'runs', 'flaky', 'failed', 'rate' (runs that failed
+                 at least once, divided by the runs) and 'kinds' (failures per kind).
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT nodeid, outcome, kinds FROM outcomes").fetchall()
+        finally:
+            connection.close()
+        stats = {}
+        for nodeid, outcome, kinds in rows:
+            entry = stats.setdefault(nodeid, {"runs": 0, "flaky": 0, "failed": 0, "kinds": {}})
+            entry["runs"] += 1
+            if outcome in ("flaky", "failed"):
+                entry[outcome] += 1
+            for kind in filter(None, kinds.split(",")):
+                entry["kinds"][kind] = entry["kinds"].get(kind, 0) + 1
+        for entry in stats.values():
+            entry["rate"] = round((entry["flaky"] + entry["failed"]) / entry["runs"], 3)
+        return stats
+
+    def quarantined(self, threshold: float = 0.2, min_runs: int = 5) -> dict[str, dict]:
+        """
+        The tests to quarantine: at least `min_runs` runs, a flake rate of at least `threshold`,
+        and at least one run that passed (flaky or not).
+
+        :return: The flake statistics (see `rates`) of the quarantined tests, per node id.
+        """
+        return {nodeid: entry for nodeid, entry in self.rates().items()
+                if entry["runs"] >= min_runs and entry["rate"] >= threshold and entry["failed"] < entry["runs"]}
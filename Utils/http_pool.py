@@ -0,0 +1,170 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError, ProtocolError
+
+logger = logging.getLogger("test_logger")
+
+# POST commands that only read the screen and may be sent twice: element lookups
+_LOOKUP = re.compile(r"/elements?$")
+
+
+class HttpPool:
+    """
+    HttpPool is the HTTP connection layer shared by every Appium session of the process.
+
+    All sessions talk to their Appium server through one urllib3 PoolManager, so keep-alive
+    connections are reused across sessions and tests instead of being opened per session.
+    The number of connections per host is capped; a request that finds every connection busy
+    waits for one instead of opening another socket. Requests that fail with a transient
+    connection error are sent again with exponential backoff:
+    - failed connects (the request never reached the server) are retried for every command,
+    - dropped connections (e.g. a keep-alive connection closed by the server or a proxy) only
+      for commands that can safely run twice: GET, DELETE and element lookups.
+    Read timeouts are never retried, as the command may still be running on the device.
+    """
+
+    def __init__(self, max_per_host: int = 4, connect_timeout: float = 10, read_timeout: float = 300,
+                 retries: int = 2, backoff: float = 0.5):
+        """
+        Initialize the HttpPool.
+
+        :param max_per_host: Maximum number of open connections per Appium server.
+        :param connect_timeout: Maximum time in seconds to open a connection.
+        :param read_timeout: Maximum time in seconds to wait for the answer to a command.
+        :param retries: Number of times a request is sent again after a transient connection error.
+        :param backoff: Delay in seconds before the first retry; it doubles with every retry.
+        """
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hosts = {}  # 'host:port' -> {'requests', 'connections', 'retries', 'failures'}
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def manager(self) -> urllib3.PoolManager:
+        """
+        The shared PoolManager, created with the current settings on first use.
+        """
+        with self._lock:
+            if self._manager is None:
+                self._manager = urllib3.PoolManager(num_pools=16, maxsize=self.max_per_host, block=True,
+                                                    retries=False, timeout=self.timeout())
+                self._manager.pool_classes_by_scheme = {
+                    "http": type("CountingHTTPConnectionPool", (_CountingPool, HTTPConnectionPool), {"metrics": self}),
+                    "https": type("CountingHTTPSConnectionPool", (_CountingPool, HTTPSConnectionPool), {"metrics": self}),
+                }
+            return self._manager
+
+    def timeout(self) -> urllib3.Timeout:
+        return urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout)
+
+    def connection(self, appium_url: str, recorder=None) -> "PooledAppiumConnection":
+        """
+        Create a remote connection to an Appium server on top of the shared pool.
+
+        :param appium_url: Base URL of the Appium server, e.g. 'http://127.0.0.1:4723'.
+        :param recorder: Optional CassetteRecorder capturing the traffic of the connection
+                         (see Utils/traffic_cassette.py).
+        :return: A connection to pass to `webdriver.Remote`.
+        """
+        return PooledAppiumConnection(self, recorder, client_config=AppiumClientConfig(
+            remote_server_addr=appium_url, keep_alive=True, timeout=self.timeout()))
+
+    def count(self, host: str, name: str):
+        with self._lock:
+            counters = self.hosts.setdefault(host, {"requests": 0, "connections": 0, "retries": 0, "failures": 0})
+            counters[name] += 1
+
+    def report(self) -> dict:
+        """
+        Summarize the pool use per Appium server: requests sent, connections opened, retries,
+        requests given up after the last retry, and the share of requests that reused an open
+        connection.
+        """
+        with self._lock:
+            return {host: {**counters, "reuse_rate": round(1 - counters["connections"] / counters["requests"], 3)
+                           if counters["requests"] else 0.0}
+                    for host, counters in self.hosts.items()}
+
+    def dump(self, path: str):
+        """
+        Write the report to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        with self._lock:
+            if self._manager is not None:
+                self._manager.clear()
+                self._manager = None
+
+
+class _CountingPool:
+    """
+    Connection pool mixin counting the connections it opens.
+    """
+
+    metrics: HttpPool = None
+
+    def _new_conn(self):
+        self.metrics.count(f"{self.host}:{self.port}", "connections")
+        return super()._new_conn()
+
+
+class PooledAppiumConnection(AppiumConnection):
+    """
+    AppiumConnection sending its requests through an HttpPool, with retries of transient
+    connection errors (see HttpPool). The exchanges that got an answer are passed to the
+    recorder, if any, once per request however often it was sent.
+    """
+
+    def __init__(self, pool: HttpPool, recorder=None, **kwargs):
+        self.pool = pool
+        self.recorder = recorder
+        super().__init__(**kwargs)
+
+    def _get_connection_manager(self):
+        return self.pool.manager()
+
+    def _request(self, method, url, body=None) -> dict:
+        parsed = urlparse(url)
+        host = f"{parsed.hostname}:{parsed.port or (443 if parsed.scheme == 'https' else 80)}"
+        retryable = method in ("GET", "DELETE") or bool(_LOOKUP.search(parsed.path))
+        attempt = 0
+        while True:
+            self.pool.count(host, "requests")
+            try:
+                response = super()._request(method, url, body=body)
+            except (NewConnectionError, ConnectTimeoutError, ProtocolError) as error:
+                connected = not isinstance(error, (NewConnectionError, ConnectTimeoutError))
+                if attempt >= self.pool.retries or (connected and not retryable):
+                    self.pool.count(host, "failures")
+                    raise
+                delay = self.pool.backoff * 2 ** attempt * random.uniform(0.5, 1)
+                logger.warning("%s %s failed (%s), retrying in %.2f s", method, parsed.path, error, delay)
+                self.pool.count(host, "retries")
+                attempt += 1
+                time.sleep(delay)
+                continue
+            if self.recorder is not None:
+                self.recorder.record(method, parsed.path, body if method in ("POST", "PUT") else None, response)
+            return response
+
+    def close(self):
+        pass  # The pooled connections are shared with other sessions; HttpPool.close closes them
@@ -0,0 +1,189 @@
+import copy
+import html
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+# Attributes of every LogRecord; anything else on a record was passed through `extra` and is written as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "test"}
+
+
+class LogLimiter(logging.Filter):
+    """
+    LogLimiter tags every record with the test being run and caps the records per test.
+
+    Beyond `limit` records, the records of a test below WARNING are dropped before they reach
+    the queue, so they are neither formatted nor written. Warnings and errors always pass.
+    """
+
+    def __init__(self, limit: int = 500):
+        """
+        Initialize the LogLimiter.
+
+        :param limit: Maximum number of records below WARNING per test (0 = no limit).
+        """
+        super().__init__()
+        self.limit = limit
+        self.test = None  # Node id of the running test, None outside of tests
+        self.counts = {}  # Node id -> {level name: records kept, 'dropped': records dropped}
+        self._lock = threading.Lock()  # Records also come from background threads (samplers, artifact writer)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        test = record.test = self.test
+        if test is None:
+            return True
+        with self._lock:
+            counts = self.counts.setdefault(test, {"kept": 0, "dropped": 0})
+            if self.limit and record.levelno < logging.WARNING and counts["kept"] >= self.limit:
+                counts["dropped"] += 1
+                return False
+            counts["kept"] += 1
+            counts[record.levelname.lower()] = counts.get(record.levelname.lower(), 0) + 1
+        return True
+
+    def summary(self, test: str) -> dict:
+        """
+        The records kept per level and the records dropped of one test.
+        """
+        with self._lock:
+            return dict(self.counts.get(test, {"kept": 0, "dropped": 0}))
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    LazyQueueHandler puts records on the queue as they are, without formatting them.
+
+    The standard QueueHandler formats the message in the logging thread so the record can be
+    pickled; the queue of a LogPipeline stays in the process, so formatting is left to the
+    handlers of the listener, and only happens for records a handler accepts. Arguments are
+    formatted later, so pass values that do not change after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)  # The other handlers of the logger still get the original
+
+
+class JsonlHandler(logging.Handler):
+    """
+    JsonlHandler writes every record as one JSON event per line:
+    time, level, logger, test, method (module.function of the logging call) and message,
+    plus the fields given through `extra`, e.g. `extra={"step": 3, "duration": 1.2}`.
+    """
+
+    def __init__(self, path: str, level: int = logging.NOTSET):
+        """
+        Initialize the JsonlHandler.
+
+        :param path: File of the events, truncated on start.
+        :param level: Minimum level of the written records.
+        """
+        super().__init__(level)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.stream = open(path, "w", encoding="utf-8")
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            event = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                     "test": getattr(record, "test", None), "method": f"{record.module}.{record.funcName}",
+                     "message": record.getMessage()}
+            event.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+            if record.exc_info:
+                event["exception"] = logging.Formatter().formatException(record.exc_info)
+            self.stream.write(json.dumps(event, default=str) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if not self.stream.closed:
+                self.stream.close()
+        finally:
+            self.release()
+            super().close()
+
+
+class LogPipeline:
+    """
+    LogPipeline moves log output off the test thread.
+
+    A LazyQueueHandler on the root logger (or the given logger) puts the records on an in-process queue; a
+    background QueueListener formats them and writes them to a JSONL file. The logger's
+    level is set to `level`, so records below it are discarded before they are even created.
+    Records are tagged with the running test and capped per test (see LogLimiter).
+    """
+
+    def __init__(self, path: str, level: int = logging.INFO, limit: int = 500, logger: str = None):
+        """
+        Initialize the LogPipeline.
+
+        :param path: JSONL file of the log events.
+        :param level: Minimum level of the written records.
+        :param limit: Maximum number of records below WARNING per test (0 = no limit).
+        :param logger: Name of the logger to attach to. Defaults to the root logger.
+        """
+        self.path = path
+        self.logger = logger
+        self.level = level
+        self.limiter = LogLimiter(limit)
+        self._handler = None
+        self._listener = None
+        self._logger_level = None
+
+    def start(self):
+        """
+        Attach the queue handler to the logger and start the background writer.
+        """
+        if self._listener:
+            return
+        records = queue.SimpleQueue()
+        self._handler = LazyQueueHandler(records)
+        self._handler.addFilter(self.limiter)
+        self._listener = logging.handlers.QueueListener(records, JsonlHandler(self.path, self.level),
+                                                        respect_handler_level=True)
+        self._listener.start()
+        logger = logging.getLogger(self.logger)
+        self._logger_level = logger.level
+        logger.setLevel(self.level)
+        logger.addHandler(self._handler)
+
+    def stop(self):
+        """
+        Detach the queue handler, write the records still queued and close the file.
+        """
+        if not self._listener:
+            return
+        logger = logging.getLogger(self.logger)
+        logger.removeHandler(self._handler)
+        logger.setLevel(self._logger_level)
+        self._listener.stop()  # Processes the queued records first
+        for handler in self._listener.handlers:
+            handler.close()
+        self._handler = self._listener = None
+
+    @property
+    def test(self) -> str | None:
+        return self.limiter.test
+
+    @test.setter
+    def test(self, nodeid: str | None):
+        self.limiter.test = nodeid
+
+    def summary(self, test: str) -> dict:
+        """
+        The records of one test kept per level and dropped beyond the limit.
+        """
+        return self.limiter.summary(test)
+
+
+def summary_html(summary: dict, path: str) -> str:
+    """
+    Render the log summary of a test for the pytest-html report.
+    """
+    levels = ", ".join(f"{count} {level}" for level, count in summary.items() if level not in ("kept", "dropped"))
+    dropped = f", {summary['dropped']} dropped beyond the per-test limit" if summary["dropped"] else ""
+    return f"<p>Log: {summary['kept']} records ({levels or 'none'}){dropped}, see {html.escape(path)}</p>"
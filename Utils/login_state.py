@@ -0,0 +1,79 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+
+logger = logging.getLogger("test_logger")
+
+# Deep link opening the products screen of Swag Labs without going through the login form
+PRODUCTS_DEEP_LINK = "swaglabs://swag-overview/"
+
+
+class LoginError(RuntimeError):
+    """
+    Raised when the logged-in state can neither be restored nor established through the UI.
+    """
+
+
+class LoginState:
+    """
+    LoginState brings a session to the logged-in products screen as cheaply as possible.
+
+    The first time (per device) the user logs in through the real login form, which proves the
+    credentials and the UI path work. After that the state is restored with a deep link to
+    the products screen, which costs one command instead of a full form fill and submit.
+    If the deep link does not lead to the products screen, the UI login is used for the
+    rest of the run.
+    """
+
+    def __init__(self, username: str, password: str, app_package: str, deep_link: str = PRODUCTS_DEEP_LINK):
+        """
+        Initialize the LoginState.
+
+        :param username: The username to log in with.
+        :param password: The password to log in with.
+        :param app_package: Package name of the app under test, which handles the deep link.
+        :param deep_link: Deep link opening the logged-in products screen.
+        """
+        self.username = username
+        self.password = password
+        self.app_package = app_package
+        self.deep_link = deep_link
+        self.ui_logins = 0  # Number of logins through the login form
+        self.restores = 0  # Number of logins restored through the deep link
+        self.deep_link_works = True
+
+    def apply(self, driver):
+        """
+        Bring the app on the given session to the logged-in products screen.
+
+        :param driver: Appium WebDriver instance, with the app freshly reset.
+        :raises LoginError: If the products screen could not be reached.
+        """
+        if self.ui_logins and self.deep_link_works:
+            if self.restore(driver):
+                self.restores += 1
+                return
+            logger.warning("Deep link %s did not open the products screen, using the login form.", self.deep_link)
+            self.deep_link_works = False
+
+        if self.username is None or self.password is None:
+            raise LoginError("TEST_USERNAME and TEST_PASSWORD environment variables must be set.")
+        LoginPage(driver).perform_login(self.username, self.password)
+        if not HomePage(driver).is_logged_in():
+            raise LoginError(f"Login through the login form failed for user '{self.username}'.")
+        self.ui_logins += 1
+
+    def restore(self, driver) -> bool:
+        """
+        Open the products screen through the deep link.
+
+        :param driver: Appium WebDriver instance.
+        :return: True if the products screen is shown, False otherwise.
+        """
+        try:
+            driver.execute_script("mobile: deepLink", {"url": self.deep_link, "package": self.app_package})
+        except WebDriverException as error:
+            logger.warning("Deep link %s failed: %s", self.deep_link, error.msg)
+            return False
+        return HomePage(driver).is_logged_in()
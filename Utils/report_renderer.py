@@ -0,0 +1,215 @@
+"""
+Render the paginated HTML report of a run from the results database (see Utils/results_sink.py).
+
+Usage:
+    python -m Utils.report_renderer [--database PATH] [--output DIR] [--run ID] [--page-size N] [--watch SECONDS]
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DATABASE = os.path.join("debug", "reports.sqlite")
+OUTPUT_DIR = "report"
+PAGE_SIZE = 100  # Tests per page
+REFRESH = 10  # Seconds between two reloads of the pages of a run that is still going
+OUTCOMES = ("failed", "error", "skipped", "flaky", "passed")
+
+STYLE = """<style>
+body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;width:100%}
+td,th{border:1px solid #ddd;padding:4px 8px;text-align:left;vertical-align:top}
+.failed,.error{color:#b00}.passed{color:#080}.skipped{color:#888}.flaky{color:#c60}pre{white-space:pre-wrap;font-size:90%}
+</style>"""
+
+# One row per test of a run: its first report, total duration, worker and the phase outcomes that decide its outcome
+TESTS_QUERY = """
+SELECT nodeid, MIN(id) AS first, SUM(duration), MAX(worker),
+       MAX(phase = 'call' AND outcome = 'failed'), MAX(phase != 'call' AND outcome = 'failed'), MAX(outcome = 'skipped'),
+       MAX(outcome = 'rerun')
+FROM reports WHERE run = ? GROUP BY nodeid ORDER BY first
+"""
+
+
+def outcome(call_failed: bool, error: bool, skipped: bool, rerun: bool = False) -> str:
+    """
+    The outcome of a test from its phases: a failed setup or teardown is an error, like in pytest,
+    and a test that passed after failed attempts (reported as 'rerun') is flaky.
+    """
+    return "failed" if call_failed else "error" if error else "skipped" if skipped else "flaky" if rerun else "passed"
+
+
+def render_report(database: str = DATABASE, output: str = OUTPUT_DIR, run: str = None, page_size: int = PAGE_SIZE,
+                  root: str = None) -> str:
+    """
+    Render a run as an index page (summary and failures) and pages of `page_size` tests.
+
+    Only one page of phase reports is read at a time, so a large run is rendered in constant
+    memory. The database can be rendered while the run is still writing to it; the pages of
+    an unfinished run reload themselves every REFRESH seconds.
+
+    :param database: The results database.
+    :param output: Directory of the report, created if needed.
+    :param run: Id of the run to render. Defaults to the latest run.
+    :param page_size: Number of tests per page.
+    :param root: Directory that relative links of the reports (e.g. failure screenshots) start from.
+                 Defaults to the current working directory.
+    :return: Path of the index page.
+    """
+    connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        query = "SELECT id, started, finished, arguments, exit_status FROM runs"
+        row = connection.execute(query + (" WHERE id = ?" if run else " ORDER BY started DESC LIMIT 1"),
+                                 (run,) if run else ()).fetchone()
+        if row is None:
+            raise ValueError(f"No run {run} in {database}" if run else f"No run in {database}")
+        run, started, finished, arguments, exit_status = row
+        tests = [(nodeid, duration or 0.0, worker, outcome(*flags))
+                 for nodeid, _, duration, worker, *flags in connection.execute(TESTS_QUERY, (run,))]
+        pages = [tests[start:start + page_size] for start in range(0, len(tests), page_size)] or [[]]
+        os.makedirs(output, exist_ok=True)
+        links = _LinkResolver(root or os.getcwd(), output)
+        refresh = "" if finished else f'<meta http-equiv="refresh" content="{REFRESH}">'
+
+        for number, page in enumerate(pages, start=1):
+            phases = _phases(connection, run, [nodeid for nodeid, *_ in page])
+            rows = "".join(_test_row(number, page_size, index, test, phases.get(test[0], []), links)
+                           for index, test in enumerate(page))
+            body = (f"<p><a href='index.html'>Summary</a> | {_page_links(len(pages), number)}</p>"
+                    f"<table><tr><th>Outcome</th><th>Test</th><th>Duration s</th><th>Worker</th></tr>{rows}</table>")
+            _write(os.path.join(output, f"page-{number}.html"), f"Page {number} of {len(pages)}", refresh, body)
+        for name in os.listdir(output):  # Pages left over from an earlier, larger run
+            match = re.fullmatch(r"page-(\d+)\.html", name)
+            if match and int(match.group(1)) > len(pages):
+                os.remove(os.path.join(output, name))
+
+        counts = {name: sum(1 for *_, result in tests if result == name) for name in OUTCOMES}
+        state = (f"finished in {finished - started:.1f} s (exit status {exit_status})" if finished
+                 else f"running for {time.time() - started:.0f} s, this page reloads every {REFRESH} s")
+        failures = "".join(
+            f"<li><a href='page-{index // page_size + 1}.html#test-{index}'>{html.escape(nodeid)}</a> "
+            f"<span class='{result}'>{result}</span></li>"
+            for index, (nodeid, _, _, result) in enumerate(tests) if result in ("failed", "error"))
+        body = (f"<p>Run {html.escape(run)}: <code>pytest {html.escape(' '.join(json.loads(arguments or '[]')))}</code>, "
+                f"started {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))}, {state}.</p>"
+                f"<p>{len(tests)} tests: " + ", ".join(f"<span class='{name}'>{count} {name}</span>"
+                                                      for name, count in counts.items()) + "</p>"
+                f"<p>Pages: {_page_links(len(pages))}</p>" + (f"<h2>Failures</h2><ul>{failures}</ul>" if failures else ""))
+        index = os.path.join(output, "index.html")
+        _write(index, "Test report", refresh, body)
+        return index
+    finally:
+        connection.close()
+
+
+def _phases(connection, run: str, nodeids: list[str]) -> dict[str, list]:
+    phases = {}
+    for start in range(0, len(nodeids), 500):  # Below SQLite's limit of bound parameters
+        chunk = nodeids[start:start + 500]
+        rows = connection.execute(
+            f"SELECT nodeid, phase, outcome, duration, longrepr, extras FROM reports "
+            f"WHERE run = ? AND nodeid IN ({', '.join('?' * len(chunk))}) ORDER BY id", (run, *chunk))
+        for nodeid, *phase in rows:
+            phases.setdefault(nodeid, []).append(phase)
+    return phases
+
+
+def _test_row(page: int, page_size: int, index: int, test: tuple, phases: list, links: "_LinkResolver") -> str:
+    nodeid, duration, worker, result = test
+    anchor = (page - 1) * page_size + index
+    details = ""
+    for phase, phase_outcome, phase_duration, longrepr, extras in phases:
+        if longrepr:
+            details += (f"<p>{phase} {phase_outcome} after {phase_duration or 0:.2f} s</p>"
+                        f"<pre>{html.escape(longrepr)}</pre>")
+        for extra in json.loads(extras or "[]"):
+            if "url" in extra:
+                details += f"<a href='{html.escape(links.resolve(extra['url']))}'>{html.escape(extra['name'])}</a> "
+            else:
+                details += extra["html"]  # Rendered by the framework's own summaries, already escaped
+    name = html.escape(nodeid)
+    cell = f"<details><summary>{name}</summary>{details}</details>" if details else name
+    return (f"<tr id='test-{anchor}'><td class='{result}'>{result}</td><td>{cell}</td>"
+            f"<td>{duration:.2f}</td><td>{html.escape(worker or '')}</td></tr>")
+
+
+class _LinkResolver:
+    """
+    Rewrites links relative to the project root into links relative to the report directory.
+    """
+
+    def __init__(self, root: str, output: str):
+        self.root = os.path.abspath(root)
+        self.output = os.path.abspath(output)
+
+    def resolve(self, url: str) -> str:
+        if "://" in url or url.startswith("/"):
+            return url
+        return os.path.relpath(os.path.join(self.root, url), self.output).replace(os.sep, "/")
+
+
+def _page_links(pages: int, current: int = None) -> str:
+    return " ".join(str(number) if number == current else f"<a href='page-{number}.html'>{number}</a>"
+                    for number in range(1, pages + 1))
+
+
+def _write(path: str, title: str, head: str, body: str):
+    temporary = f"{path}.tmp"  # Replaced at once, so a reloading browser never sees half a page
+    with open(temporary, "w", encoding="utf-8") as handle:
+        handle.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'>{head}<title>{html.escape(title)}</title>"
+                     f"{STYLE}</head><body><h1>{html.escape(title)}</h1>{body}</body></html>")
+    os.replace(temporary, path)
+
+
+class ReportWatcher(threading.Thread):
+    """
+    ReportWatcher renders the report of the current run again every `interval` seconds, so
+    the partial report can be followed while the run is going.
+    """
+
+    def __init__(self, interval: float, **options):
+        """
+        Initialize the ReportWatcher.
+
+        :param interval: Seconds between two renderings.
+        :param options: The arguments of `render_report`.
+        """
+        super().__init__(name="report-watcher", daemon=True)
+        self.interval = interval
+        self.options = options
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                render_report(**self.options)
+            except (sqlite3.Error, ValueError, OSError):
+                pass  # Nothing reported yet, or the database is busy: try again next time
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Utils.report_renderer", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=DATABASE, help="The results database of the runs.")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Directory of the report.")
+    parser.add_argument("--run", default=None, help="Id of the run to render. Defaults to the latest run.")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Tests per page.")
+    parser.add_argument("--watch", type=float, default=0, metavar="SECONDS",
+                        help="Render again every SECONDS until interrupted.")
+    args = parser.parse_args(argv)
+    while True:
+        index = render_report(args.database, args.output, args.run, args.page_size)
+        print(f"Report written to {index}")
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+import gzip
+import html
+import json
+import logging
+import re
+import threading
+import time
+
+import urllib3
+
+logger = logging.getLogger("test_logger")
+
+# Columns of a resource series; cpu in percent, memory in KB, frame counters cumulative as reported by gfxinfo
+COLUMNS = ("t", "cpu_user", "cpu_kernel", "pss_kb", "rss_kb", "frames", "janky_frames")
+
+_TOTAL_FRAMES = re.compile(r"Total frames rendered:\s*(\d+)")
+_JANKY_FRAMES = re.compile(r"Janky frames:\s*(\d+)")
+
+
+class AppiumScriptError(RuntimeError):
+    """
+    Raised when the Appium server answers an execute request with an error.
+    """
+
+
+class ResourceSampler:
+    """
+    ResourceSampler polls the CPU, memory and frame statistics of the app under test while a test runs.
+
+    It samples `mobile: getPerformanceData` (cpuinfo, memoryinfo) and `dumpsys gfxinfo` (through
+    `mobile: shell`) on a background thread, over its own HTTP connection to the Appium server.
+    The test's commands never wait for the sampler on the client side, and the samples do not show
+    up in the command recorder or in recorded cassettes. Appium itself runs the commands of a session
+    one at a time, so a command sent while a sample is taken waits for it on the server; one sample
+    costs a few tens of milliseconds, which keeps the overhead small at the default interval.
+    A data type the server answers with an error (e.g. `mobile: shell` without `--relaxed-security`)
+    is dropped for the rest of the test; connection failures only skip the sample.
+    """
+
+    def __init__(self, appium_url: str, session_id: str, app_package: str, interval: float = 1.0,
+                 timeout: float = 10):
+        """
+        Initialize the ResourceSampler.
+
+        :param appium_url: Base URL of the Appium server of the session.
+        :param session_id: Id of the Appium session to sample through.
+        :param app_package: Package name of the app under test.
+        :param interval: Seconds between two samples.
+        :param timeout: Maximum time in seconds for one sampling request.
+        """
+        self.url = f"{appium_url.rstrip('/')}/session/{session_id}/execute/sync"
+        self.app_package = app_package
+        self.interval = interval
+        self.sources = ["cpuinfo", "memoryinfo", "gfxinfo"]
+        self.columns = {name: [] for name in COLUMNS}
+        self.errors = 0  # Number of failed sampling requests
+        self.started = None
+        self._http = urllib3.PoolManager(maxsize=1, timeout=urllib3.Timeout(total=timeout), retries=False)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Take a first sample and keep sampling on a background thread.
+
+        :return: The sampler itself, for chaining.
+        """
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop sampling and take a last sample, so the series covers the whole test.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+        self._http.clear()
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self):
+        """
+        Read every supported data type once and append one row to the series.
+        """
+        row = dict.fromkeys(COLUMNS)
+        row["t"] = round(time.monotonic() - self.started, 3)
+        for source in list(self.sources):
+            try:
+                row.update(getattr(self, f"_read_{source}")())
+            except AppiumScriptError as error:
+                logger.warning("Resource sampler: %s is not available, dropping it: %s", source, error)
+                self.sources.remove(source)
+                self.errors += 1
+            except (urllib3.exceptions.HTTPError, ValueError, KeyError, IndexError) as error:
+                logger.debug("Resource sampler: %s sample failed: %s", source, error)
+                self.errors += 1
+        with self._lock:
+            for name in COLUMNS:
+                self.columns[name].append(row[name])
+
+    def execute(self, script: str, args: dict):
+        """
+        Send one `mobile:` execute method over the sampler's own connection.
+
+        :return: The 'value' of the response.
+        :raises AppiumScriptError: If the server answers with a W3C error.
+        """
+        response = self._http.request("POST", self.url, body=json.dumps({"script": script, "args": [args]}),
+                                      headers={"Content-Type": "application/json; charset=utf-8"})
+        value = json.loads(response.data or b"{}").get("value")
+        if response.status >= 400:
+            error = value if isinstance(value, dict) else {}
+            raise AppiumScriptError(f"{error.get('error', f'HTTP {response.status}')}: {error.get('message', '')}")
+        return value
+
+    def _performance_data(self, data_type: str) -> dict:
+        """
+        Read one `mobile: getPerformanceData` table; it comes as a header row and a value row.
+        """
+        table = self.execute("mobile: getPerformanceData", {"packageName": self.app_package, "dataType": data_type})
+        return {name: value for name, value in zip(table[0], table[1]) if value not in (None, "")}
+
+    def _read_cpuinfo(self) -> dict:
+        values = self._performance_data("cpuinfo")
+        return {"cpu_user": float(values["user"]), "cpu_kernel": float(values["kernel"])}
+
+    def _read_memoryinfo(self) -> dict:
+        values = self._performance_data("memoryinfo")
+        return {"pss_kb": int(values["totalPss"]),
+                "rss_kb": int(values["totalRss"]) if "totalRss" in values else None}  # totalRss needs Android 10+
+
+    def _read_gfxinfo(self) -> dict:
+        output = self.execute("mobile: shell", {"command": "dumpsys", "args": ["gfxinfo", self.app_package]})
+        total, janky = _TOTAL_FRAMES.search(output), _JANKY_FRAMES.search(output)
+        if not total or not janky:
+            raise ValueError("no frame statistics in the gfxinfo output")
+        return {"frames": int(total.group(1)), "janky_frames": int(janky.group(1))}
+
+    def series(self) -> dict:
+        """
+        A copy of the sampled columns.
+        """
+        with self._lock:
+            return {name: list(values) for name, values in self.columns.items()}
+
+    def summary(self) -> dict:
+        """
+        Summarize the series of the test.
+
+        :return: A dictionary with the sample count, peak RSS and PSS in KB, mean and max CPU in percent,
+                 and the frames rendered and janky frames during the test. Values that were never
+                 sampled are None.
+        """
+        return summarize(self.series(), self.interval)
+
+    def dump(self, path: str, test: str = None):
+        """
+        Write the series to a gzip-compressed columnar JSON file.
+
+        :param path: Destination file path, e.g. 'debug/resources/test_login.json.gz'.
+        :param test: The test the series belongs to.
+        """
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            json.dump({"test": test, "interval": self.interval, "package": self.app_package,
+                       "summary": self.summary(), "columns": self.series()}, handle, separators=(",", ":"))
+
+
+def load_series(path: str) -> dict:
+    """
+    Read a file written by `ResourceSampler.dump`.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def frame_delta(counts: list) -> int | None:
+    """
+    Frames counted between the first and last sample of a cumulative gfxinfo counter.
+    The counters restart with the app process; a drop is treated as a restart from zero.
+    """
+    counts = [count for count in counts if count is not None]
+    if not counts:
+        return None
+    return sum(current - previous if current >= previous else current
+               for previous, current in zip(counts, counts[1:]))
+
+
+def summarize(columns: dict, interval: float = None) -> dict:
+    """
+    Summarize a columnar resource series (see `ResourceSampler.summary`).
+    """
+    present = lambda name: [value for value in columns[name] if value is not None]
+    cpu = [user + kernel for user, kernel in zip(columns["cpu_user"], columns["cpu_kernel"])
+           if user is not None and kernel is not None]
+    return {
+        "samples": len(columns["t"]),
+        "interval": interval,
+        "peak_rss_kb": max(present("rss_kb"), default=None),
+        "peak_pss_kb": max(present("pss_kb"), default=None),
+        "cpu_mean": round(sum(cpu) / len(cpu), 1) if cpu else None,
+        "cpu_max": round(max(cpu), 1) if cpu else None,
+        "frames": frame_delta(columns["frames"]),
+        "janky_frames": frame_delta(columns["janky_frames"]),
+    }
+
+
+def summary_html(summary: dict) -> str:
+    """
+    Render a resource summary as a paragraph for the pytest-html report.
+    """
+    megabytes = lambda kb: f"{kb / 1024:.1f} MB" if kb is not None else "n/a"
+    parts = [f"peak RSS {megabytes(summary['peak_rss_kb'])}", f"peak PSS {megabytes(summary['peak_pss_kb'])}"]
+    if summary["cpu_mean"] is not None:
+        parts.append(f"CPU mean {summary['cpu_mean']} %, max {summary['cpu_max']} %")
+    if summary["frames"] is not None:
+        share = f" ({summary['janky_frames'] / summary['frames'] * 100:.1f} %)" if summary["frames"] else ""
+        parts.append(f"janky frames {summary['janky_frames']} of {summary['frames']}{share}")
+    return (f"<p>Device resources ({summary['samples']} samples every {summary['interval']} s): "
+            f"{html.escape(', '.join(parts))}</p>")
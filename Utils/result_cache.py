@@ -0,0 +1,228 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import os
+import sqlite3
+import sys
+import time
+from Utils.apk_cache import file_sha256
+
+
+class ResultCache:
+    """
+    ResultCache remembers the last result of every test together with the fingerprint of
+    everything the result depends on (see `Fingerprinter`).
+
+    A test whose fingerprint is unchanged since it last passed does not need to run again.
+    The results are kept in a local SQLite database, so several pytest-xdist workers can
+    record their results at the same time without losing each other's updates.
+    """
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+        Initialize the ResultCache.
+
+        :param path: SQLite database file of the results, created on first use.
+        :param timeout: Maximum time in seconds to wait for another worker's write to finish.
+        """
+        self.path = path
+        self.timeout = timeout
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers do not block the writing workers
+        connection.execute("CREATE TABLE IF NOT EXISTS results (nodeid TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                           "outcome TEXT NOT NULL, duration REAL, recorded REAL NOT NULL)")
+        return connection
+
+    def load(self) -> dict[str, dict]:
+        """
+        The last recorded result of every test.
+
+        :return: Per node id, a dictionary with 'fingerprint', 'outcome', 'duration' and 'recorded' (epoch seconds).
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT nodeid, fingerprint, outcome, duration, recorded FROM results").fetchall()
+        finally:
+            connection.close()
+        return {nodeid: {"fingerprint": fingerprint, "outcome": outcome, "duration": duration, "recorded": recorded}
+                for nodeid, fingerprint, outcome, duration, recorded in rows}
+
+    def record(self, nodeid: str, fingerprint: str, outcome: str, duration: float = None):
+        """
+        Store the result of a test run, replacing its previous result.
+
+        :param nodeid: The pytest node id of the test.
+        :param fingerprint: The fingerprint the test ran with.
+        :param outcome: 'passed', 'flaky' (passed on a rerun) or 'failed'; only 'passed' tests are skipped.
+        :param duration: Setup, call and teardown time in seconds.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                   (nodeid, fingerprint, outcome, duration, time.time()))
+        finally:
+            connection.close()
+
+    def clear(self):
+        """
+        Forget every stored result.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM results")
+        finally:
+            connection.close()
+
+
+class Fingerprinter:
+    """
+    Fingerprinter computes what the result of a test depends on:
+    - the APK under test,
+    - the devices the test can run on (udid, Android version and Appium server),
+    - the source of every page-object and framework module the test module imports, directly or
+      through other modules of `packages`,
+    - the framework modules the fixtures of the test use, and the modules those import,
+    - the conftest.py files whose fixtures the test can use,
+    - the source of the test function and the values of its parameters.
+    Framework modules only the other fixtures use (e.g. the report renderer) are not part of the fingerprint.
+    """
+
+    def __init__(self, apk_path: str, packages: tuple = ("Pages", "Utils"), devices: list = ()):
+        """
+        Initialize the Fingerprinter.
+
+        :param apk_path: Path of the APK under test. A missing APK counts as one fixed version.
+        :param packages: Top-level packages whose modules are followed through the imports.
+        :param devices: The Devices (see Utils/device_pool.py) the tests can be leased. Which one a test
+                        gets is only known when it runs, so the whole pool is part of the fingerprint.
+        """
+        self.apk_path = apk_path
+        self.packages = packages
+        self.devices = devices
+        self._apk = None
+        self._files = {}  # File path -> SHA-256 of its content
+        self._modules = {}  # Module name -> sorted source files it depends on
+
+    def apk(self) -> str:
+        if self._apk is None:
+            try:
+                self._apk = file_sha256(self.apk_path)
+            except OSError:
+                self._apk = "missing"
+        return self._apk
+
+    def file(self, path: str) -> str:
+        if path not in self._files:
+            self._files[path] = file_sha256(path)
+        return self._files[path]
+
+    def page_modules(self, module) -> list[str]:
+        """
+        The source files of the modules of `packages` that a module imports, followed transitively.
+        Imports are read from the source, so constants imported from a page module count as well.
+        """
+        if module.__name__ in self._modules:
+            return self._modules[module.__name__]
+        found, pending = set(), [module]
+        while pending:
+            for name in self.imports(pending.pop()):
+                imported = sys.modules[name]
+                source = getattr(imported, "__file__", None)
+                if source and source not in found:
+                    found.add(source)
+                    pending.append(imported)
+        self._modules[module.__name__] = sorted(found)
+        return self._modules[module.__name__]
+
+    def imports(self, module) -> set[str]:
+        """
+        The names of the loaded modules of `packages` imported by a module's source.
+        """
+        with open(module.__file__, encoding="utf-8") as handle:
+            tree = ast.parse(handle.read())
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), module.__package__) \
+                    if node.level else node.module
+                names.add(base)
+                names.update(f"{base}.{alias.name}" for alias in node.names)  # 'from Pages import home_page'
+        return {name for name in names if name.split(".")[0] in self.packages and name in sys.modules}
+
+    def fixture_modules(self, item) -> list[str]:
+        """
+        The source files of the modules of `packages` that the fixtures of a test use, followed
+        transitively through their imports. A fixture uses the modules whose classes, functions or
+        objects its code refers to, including through the helper functions of its own module.
+        """
+        owners = [item.module] + [plugin for plugin in item.config.pluginmanager.get_plugins()
+                                  if self.applies(item, getattr(plugin, "__file__", "") or "")]
+        found = set()
+        for name in item.fixturenames:
+            fixture = next((getattr(owner, name) for owner in owners if callable(getattr(owner, name, None))), None)
+            for module_name in self.referenced_modules(inspect.unwrap(fixture)) if fixture else ():
+                module = sys.modules[module_name]
+                found.add(module.__file__)
+                found.update(self.page_modules(module))
+        return sorted(found)
+
+    def referenced_modules(self, function, seen: set = None) -> set[str]:
+        """
+        The names of the loaded modules of `packages` that a function's code refers to by global name.
+        """
+        seen = set() if seen is None else seen
+        if function in seen or not inspect.isfunction(function):
+            return set()
+        seen.add(function)
+        names, pending = set(), [function.__code__]
+        while pending:
+            code = pending.pop()
+            names.update(code.co_names)
+            pending.extend(const for const in code.co_consts if inspect.iscode(const))  # Nested functions
+        modules = set()
+        for name in names & function.__globals__.keys():
+            value = function.__globals__[name]
+            if inspect.ismodule(value):
+                modules.add(value.__name__)
+            elif inspect.isfunction(value) and value.__module__ == function.__module__:
+                modules |= self.referenced_modules(value, seen)  # Helper function, e.g. create_driver
+            elif isinstance(getattr(value, "__module__", None), str):
+                modules.add(value.__module__)  # Classes, functions and their instances, e.g. a shared pool
+        return {name for name in modules if name.split(".")[0] in self.packages and name in sys.modules}
+
+    @staticmethod
+    def applies(item, source: str) -> bool:
+        """
+        True if `source` is a conftest.py whose fixtures the test can use.
+        """
+        directory = os.path.dirname(source)
+        return os.path.basename(source) == "conftest.py" and os.path.commonpath([str(item.path), directory]) == directory
+
+    def fingerprint(self, item) -> str:
+        """
+        Fingerprint one collected test.
+
+        :param item: The pytest item.
+        :return: A hex digest that changes whenever anything the test depends on changes.
+        """
+        digest = hashlib.sha256(f"apk:{self.apk()}\n".encode())
+        for device in self.devices:
+            digest.update(f"device:{device.udid}:{device.platform_version}:{device.appium_url}\n".encode())
+        for source in sorted(set(self.page_modules(item.module)) | set(self.fixture_modules(item))):
+            digest.update(f"{os.path.basename(source)}:{self.file(source)}\n".encode())
+        for plugin in item.config.pluginmanager.get_plugins():
+            source = getattr(plugin, "__file__", "") or ""
+            if self.applies(item, source):
+                digest.update(f"conftest:{self.file(source)}\n".encode())
+        digest.update(inspect.getsource(item.function).encode())
+        params = getattr(getattr(item, "callspec", None), "params", {})
+        digest.update(repr(sorted((name, repr(value)) for name, value in params.items())).encode())
+        return digest.hexdigest()
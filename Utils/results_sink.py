@@ -0,0 +1,94 @@
+import json
+import os
+import sqlite3
+import time
+
+
+class ResultsSink:
+    """
+    ResultsSink appends every test report to a local SQLite database as soon as it is made.
+
+    Nothing is kept in memory, so memory use does not grow with the run, and a run that
+    crashes keeps every result reported until then. pytest-xdist workers write to the same
+    database under the run id of the controller; the database is in WAL mode, so the report
+    renderer (see Utils/report_renderer.py) can read it while the workers are still writing.
+    """
+
+    def __init__(self, path: str, timeout: float = 30, keep_runs: int = 20):
+        """
+        Initialize the ResultsSink.
+
+        :param path: SQLite database file of the results, created on first use.
+        :param timeout: Maximum time in seconds to wait for another worker's write to finish.
+        :param keep_runs: Number of runs kept in the database; older runs are deleted when a run starts.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.keep_runs = keep_runs
+        self.run = None  # Id of the run the reports belong to, see `start_run`
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")  # The renderer reads while the workers write
+            connection.execute("PRAGMA synchronous=NORMAL")  # Commits survive a crash of the run, not a power loss
+            connection.execute("CREATE TABLE IF NOT EXISTS runs (id TEXT PRIMARY KEY, started REAL NOT NULL, "
+                               "finished REAL, arguments TEXT, exit_status INTEGER)")
+            connection.execute("CREATE TABLE IF NOT EXISTS reports (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                               "run TEXT NOT NULL, nodeid TEXT NOT NULL, phase TEXT NOT NULL, outcome TEXT NOT NULL, "
+                               "duration REAL, worker TEXT, finished REAL NOT NULL, longrepr TEXT, extras TEXT)")
+            connection.execute("CREATE INDEX IF NOT EXISTS reports_run ON reports (run, nodeid)")
+            self._connection = connection
+        return self._connection
+
+    def start_run(self, run: str, arguments: list[str]):
+        """
+        Register a new run and make it the run of the following reports.
+
+        :param run: Unique id of the run, shared by the controller and its workers.
+        :param arguments: The command-line arguments of the run, shown in the report.
+        """
+        self.run = run
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT OR IGNORE INTO runs (id, started, arguments) VALUES (?, ?, ?)",
+                               (run, time.time(), json.dumps(arguments)))
+            old = "SELECT id FROM runs ORDER BY started DESC LIMIT -1 OFFSET ?"
+            connection.execute(f"DELETE FROM reports WHERE run IN ({old})", (self.keep_runs,))
+            connection.execute(f"DELETE FROM runs WHERE id IN ({old})", (self.keep_runs,))
+
+    def finish_run(self, exit_status: int):
+        """
+        Mark the run as finished; the report stops refreshing itself.
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("UPDATE runs SET finished = ?, exit_status = ? WHERE id = ?",
+                               (time.time(), int(exit_status), self.run))
+
+    def append(self, nodeid: str, phase: str, outcome: str, duration: float, longrepr: str = None,
+               extras: list[dict] = None, worker: str = None):
+        """
+        Store the report of one test phase.
+
+        :param nodeid: The pytest node id of the test.
+        :param phase: 'setup', 'call' or 'teardown'.
+        :param outcome: 'passed', 'failed' or 'skipped'.
+        :param duration: Duration of the phase in seconds.
+        :param longrepr: The failure or skip reason as text.
+        :param extras: Report extras, as {'html': ...} or {'url': ..., 'name': ...} dictionaries.
+        :param worker: The pytest-xdist worker id, if any.
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT INTO reports (run, nodeid, phase, outcome, duration, worker, finished, "
+                               "longrepr, extras) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (self.run, nodeid, phase, outcome, duration, worker, time.time(), longrepr,
+                                json.dumps(extras) if extras else None))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,199 @@
+import heapq
+import json
+import os
+import re
+import threading
+
+# Estimated duration in seconds of a test that has never run
+DEFAULT_DURATION = 10.0
+# pytest-xdist appends the xdist_group name to the node ids of grouped tests, e.g. 'test_a@worker0'
+# (or 'test_a@quarantine' for the quarantined tests, see conftest.py)
+_GROUP_SUFFIX = re.compile(r"@(worker\d+|quarantine)$")
+
+
+class DurationStore:
+    """
+    DurationStore remembers how long each test took in past runs.
+
+    Durations (setup + call + teardown) are kept per pytest node id as an exponential moving
+    average, so one slow run does not throw the schedule off. The store is a local JSON file;
+    every worker merges its own tests into it at the end of its run.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.5):
+        """
+        Initialize the DurationStore.
+
+        :param path: JSON file of the stored durations.
+        :param smoothing: Weight of the latest run in the moving average (1 = only the latest run).
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, float]:
+        """
+        The stored duration of every known test, in seconds.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                return {nodeid: entry["duration"] for nodeid, entry in json.load(handle).items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def update(self, durations: dict[str, float]):
+        """
+        Merge the durations of a run into the store. The file is re-read first and replaced
+        atomically, so workers finishing at the same time do not overwrite each other's tests.
+
+        :param durations: Seconds per test node id.
+        """
+        if not durations:
+            return
+        with self._lock:
+            try:
+                with open(self.path, encoding="utf-8") as handle:
+                    stored = json.load(handle)
+            except (OSError, ValueError):
+                stored = {}
+            for nodeid, duration in durations.items():
+                nodeid = base_nodeid(nodeid)
+                entry = stored.get(nodeid)
+                if entry:
+                    entry["duration"] = round(self.smoothing * duration + (1 - self.smoothing) * entry["duration"], 3)
+                    entry["runs"] += 1
+                else:
+                    stored[nodeid] = {"duration": round(duration, 3), "runs": 1}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(stored, handle, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+
+
+def base_nodeid(nodeid: str) -> str:
+    """
+    The node id of a test without the xdist_group suffix pytest-xdist appends to it.
+    """
+    return _GROUP_SUFFIX.sub("", nodeid)
+
+
+class WorkUnit:
+    """
+    WorkUnit is a group of tests that must run on the same worker, in the given order:
+    a single test, the cases of a `batched` test, or tests linked by `depends_on`.
+    """
+
+    def __init__(self, items: list, duration: float):
+        self.items = items
+        self.duration = duration
+
+    def __repr__(self):
+        return f"WorkUnit({[item.nodeid for item in self.items]}, {self.duration:.1f}s)"
+
+
+def worker_group(number: int) -> str:
+    """
+    The xdist_group name pinning work units to one worker.
+    """
+    return f"worker{number}"
+
+
+def function_id(item) -> str:
+    """
+    Identify the test function of a test item, shared by all of its parametrized cases.
+    """
+    return f"{item.module.__name__}::{item.originalname}"
+
+
+def dependencies(item, items: list) -> list:
+    """
+    The collected tests an item declares with `@pytest.mark.depends_on(...)`.
+
+    A name is either a test function of the same module ('test_valid_login') or a node id
+    without parameters ('Tests/test_login.py::test_valid_login'); it covers every parametrized
+    case. Dependencies that are not collected (e.g. deselected with -k) are ignored.
+    """
+    required = []
+    for marker in item.iter_markers("depends_on"):
+        for name in marker.args:
+            required += [other for other in items if other is not item and (
+                other.nodeid.split("[")[0] == name if "::" in name
+                else other.module is item.module and other.originalname == name)]
+    return required
+
+
+def build_units(items: list, durations: dict[str, float]) -> list[WorkUnit]:
+    """
+    Group the collected tests into work units, in collection order.
+
+    :param items: The collected pytest items.
+    :param durations: Known durations per node id; other tests get the mean of the known ones.
+    :return: The work units, each with its items in run order (dependencies first).
+    :raises ValueError: If the declared dependencies form a cycle.
+    """
+    index = {id(item): position for position, item in enumerate(items)}
+    parent = list(range(len(items)))
+
+    def root(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def join(first, second):
+        parent[root(index[id(second)])] = root(index[id(first)])
+
+    batches, requires = {}, {}
+    for item in items:
+        if item.get_closest_marker("batched"):
+            join(batches.setdefault(function_id(item), item), item)
+        requires[id(item)] = dependencies(item, items)
+        for required in requires[id(item)]:
+            join(required, item)
+
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    groups = {}
+    for item in items:
+        groups.setdefault(root(index[id(item)]), []).append(item)
+    return [WorkUnit(run_order(members, requires), sum(durations.get(item.nodeid, default) for item in members))
+            for members in groups.values()]
+
+
+def run_order(members: list, requires: dict) -> list:
+    """
+    Order the items of a work unit so that every test runs after its dependencies,
+    keeping the collection order otherwise.
+
+    :raises ValueError: If the dependencies form a cycle.
+    """
+    ordered, done = [], set()
+    pending = list(members)
+    while pending:
+        ready = next((item for item in pending if all(id(required) in done for required in requires[id(item)])), None)
+        if ready is None:
+            raise ValueError(f"Dependency cycle between {', '.join(item.nodeid for item in pending)}")
+        pending.remove(ready)
+        ordered.append(ready)
+        done.add(id(ready))
+    return ordered
+
+
+def longest_first(units: list[WorkUnit], bins: int) -> list[list[WorkUnit]]:
+    """
+    Distribute work units over a number of workers, longest-processing-time first: each unit,
+    from the longest to the shortest, goes to the worker with the least work so far. The
+    longest worker then takes at most 4/3 of the optimal wall time.
+
+    :param units: The work units to distribute.
+    :param bins: The number of workers.
+    :return: The units of each worker, in their original order.
+    """
+    loads = [(0.0, number) for number in range(bins)]
+    assigned = [[] for _ in range(bins)]
+    for position, unit in sorted(enumerate(units), key=lambda entry: (-entry[1].duration, entry[0])):
+        load, number = heapq.heappop(loads)
+        assigned[number].append((position, unit))
+        heapq.heappush(loads, (load + unit.duration, number))
+    return [[unit for _, unit in sorted(entries, key=lambda entry: entry[0])] for entries in assigned]
@@ -0,0 +1,123 @@
+import logging
+import threading
+from typing import Callable
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError
+
+logger = logging.getLogger("test_logger")
+
+
+class SessionPool:
+    """
+    SessionPool keeps warm Appium sessions alive across tests.
+
+    Creating a session (APK push, install, app launch) costs tens of seconds, while an
+    in-session reset (terminate app, clear app data, activate app) costs a few. The pool
+    hands out idle sessions after resetting them and checking their health, and only
+    creates a new session when none is idle or the health check fails.
+    """
+
+    def __init__(self, factory: Callable, app_package: str, max_size: int = 1):
+        """
+        Initialize the SessionPool.
+
+        :param factory: Callable returning a new Appium WebDriver session.
+        :param app_package: Package name of the app under test, used for the in-session reset.
+        :param max_size: Maximum number of idle sessions kept alive. 0 disables reuse, so every
+                         test gets a brand-new session and released sessions are quit.
+        """
+        self.factory = factory
+        self.app_package = app_package
+        self.max_size = max_size
+        self.created = 0  # Number of sessions created by the pool
+        self.reused = 0  # Number of times an idle session was handed out again
+        self.soft_resets = 0  # Number of times a session was handed out after a soft reset only
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self, soft_reset: Callable = None):
+        """
+        Hand out a session in a clean app state.
+
+        An idle session is reset and health-checked first; if either step fails the session
+        is discarded and the next idle one (or a new one) is used instead.
+
+        :param soft_reset: Optional callable taking the driver and returning True if it brought the
+                           current screen back to its initial state without restarting the app
+                           (e.g. LoginPage.soft_reset). If it returns False, the full reset is done.
+        :return: Appium driver instance.
+        """
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            try:
+                if soft_reset and soft_reset(driver):
+                    self.reused += 1
+                    self.soft_resets += 1
+                    return driver
+                self.reset_app(driver)
+                if self.is_healthy(driver):
+                    self.reused += 1
+                    return driver
+                logger.warning("Session %s failed the health check, replacing it.", driver.session_id)
+            except (WebDriverException, HTTPError) as error:
+                logger.warning("Session %s could not be reset, replacing it: %s", driver.session_id, error)
+            self._quit(driver)
+
+        self.created += 1
+        return self.factory()
+
+    def release(self, driver, discard: bool = False):
+        """
+        Return a session to the pool.
+
+        :param driver: The session previously handed out by `acquire`.
+        :param discard: Quit the session instead of keeping it warm (e.g. after it crashed).
+        """
+        with self._lock:
+            if not discard and len(self._idle) < self.max_size:
+                self._idle.append(driver)
+                return
+        self._quit(driver)
+
+    def reset_app(self, driver):
+        """
+        Bring the app back to a clean state without creating a new session:
+        terminate the app, clear its data and launch it again.
+
+        :param driver: The session to reset.
+        """
+        driver.terminate_app(self.app_package)
+        driver.execute_script("mobile: clearApp", {"appId": self.app_package})
+        driver.activate_app(self.app_package)
+
+    def is_healthy(self, driver) -> bool:
+        """
+        Check that the session responds and the app under test is in the foreground.
+
+        :param driver: The session to check.
+        :return: True if the session can be handed out, False otherwise.
+        """
+        try:
+            return driver.current_package == self.app_package
+        except (WebDriverException, HTTPError):
+            return False
+
+    def close(self):
+        """
+        Quit every idle session. Called once at the end of the test run.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except (WebDriverException, HTTPError):
+            pass  # The session is already gone
@@ -0,0 +1,161 @@
+import json
+import time
+from Pages.waits import poll_intervals
+
+# Cycles run by cart flows when no soak option is given
+DEFAULT_CYCLES = 5
+
+
+class SoakRun:
+    """
+    SoakRun drives repeated cart cycles for a number of cycles or a duration, and measures
+    how long each action takes to show on screen.
+
+    The latency of an action is measured from just before the tap until the page object first
+    reports the expected state (e.g. `get_cart_quantity` shows the new count), so it includes
+    the tap round trip, the app's reaction and the re-render of the badge. The screen is read on
+    the polling schedule of the explicit waits (see Pages/waits.py). An action that does not show
+    within the timeout is kept as a sample of the full timeout and counted as timed out, so the
+    percentiles do not leave out the slowest actions. The summary gives p50/p95/p99 per action,
+    the timeouts, the throughput, and the drift of the latency over the run, which shows the app
+    slowing down during long sessions.
+    """
+
+    def __init__(self, cycles: int = None, duration: float = None, timeout: float = 10):
+        """
+        Initialize the SoakRun.
+
+        :param cycles: Number of cycles to run. Defaults to DEFAULT_CYCLES if no duration is given either.
+        :param duration: Run cycles for this many seconds instead of a fixed count.
+        :param timeout: Maximum time in seconds for an action to show on screen.
+        """
+        self.cycles = cycles if cycles or duration else DEFAULT_CYCLES
+        self.duration = duration
+        self.timeout = timeout
+        self.cycle = 0
+        self.samples = []  # (seconds since start, action, latency in seconds, timed out)
+        self.started = None
+        self.finished = None
+
+    def next_cycle(self) -> bool:
+        """
+        Start the next cycle if the run is not over.
+
+        :return: True if another cycle should run, False once the cycle count or duration is reached.
+        """
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        if (self.cycles and self.cycle >= self.cycles) or (self.duration and now - self.started >= self.duration):
+            self.finished = now
+            return False
+        self.cycle += 1
+        return True
+
+    def measure(self, action: str, perform, read, expected):
+        """
+        Perform an action and wait until its effect is visible.
+
+        :param action: Name of the action in the summary (e.g. 'add_to_cart').
+        :param perform: Callable performing the action (e.g. a tap on a button).
+        :param read: Callable returning the observed state (e.g. the cart quantity). It is called
+                     on every poll, so it must read the screen again on every call.
+        :param expected: The state expected after the action.
+        :return: The last observed state; equals `expected` unless the timeout was reached.
+        """
+        start = time.monotonic()
+        perform()
+        deadline = start + self.timeout
+        intervals = poll_intervals()
+        observed = read()
+        while observed != expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(next(intervals), remaining))
+            observed = read()
+        self.samples.append((round(start - (self.started or start), 4), action, time.monotonic() - start,
+                             observed != expected))
+        return observed
+
+    def summary(self) -> dict:
+        """
+        Summarize the measured latencies.
+
+        :return: A dictionary with the cycle count, duration, throughput (actions per second),
+                 percentiles in milliseconds per action and overall (timed-out actions count with
+                 the full timeout), the timed-out actions per action, and the latency drift.
+        """
+        elapsed = (self.finished or time.monotonic()) - self.started if self.started else 0.0
+        actions, timeouts = {}, {}
+        for _, action, latency, timed_out in self.samples:
+            actions.setdefault(action, []).append(latency)
+            if timed_out:
+                timeouts[action] = timeouts.get(action, 0) + 1
+        return {
+            "cycles": self.cycle,
+            "duration": round(elapsed, 2),
+            "throughput": round(len(self.samples) / elapsed, 2) if elapsed else 0.0,
+            "latency": {action: percentiles(latencies) for action, latencies in
+                        [("all", [sample[2] for sample in self.samples]), *actions.items()]},
+            "timeouts": timeouts,
+            "drift": drift(self.samples),
+        }
+
+    def dump(self, path: str):
+        """
+        Write the summary and every sample to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"summary": self.summary(), "samples": self.samples}, handle, indent=2)
+
+
+def percentiles(latencies: list[float]) -> dict:
+    """
+    p50, p95, p99 and max of a list of latencies, in milliseconds.
+    """
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+    pick = lambda fraction: round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+    return {"count": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)}
+
+
+def drift(samples: list[tuple]) -> dict:
+    """
+    Measure how the latency changes over the run.
+
+    :return: The mean latency of the first and last quarter of the samples (ms), their relative
+             change in percent, and the least-squares slope of latency over time (ms per minute).
+    """
+    if len(samples) < 8:
+        return {}
+    quarter = len(samples) // 4
+    first = sum(sample[2] for sample in samples[:quarter]) / quarter * 1000
+    last = sum(sample[2] for sample in samples[-quarter:]) / quarter * 1000
+    times = [sample[0] for sample in samples]
+    latencies = [sample[2] * 1000 for sample in samples]
+    mean_time, mean_latency = sum(times) / len(times), sum(latencies) / len(latencies)
+    variance = sum((t - mean_time) ** 2 for t in times)
+    slope = sum((t - mean_time) * (latency - mean_latency) for t, latency in zip(times, latencies)) / variance \
+        if variance else 0.0
+    return {"first_quarter_ms": round(first, 1), "last_quarter_ms": round(last, 1),
+            "change_percent": round((last - first) / first * 100, 1) if first else 0.0,
+            "slope_ms_per_minute": round(slope * 60, 2)}
+
+
+def summary_text(name: str, summary: dict) -> str:
+    """
+    Render a soak summary as a few lines for the terminal and the log.
+    """
+    lines = [f"{name}: {summary['cycles']} cycles in {summary['duration']} s, {summary['throughput']} actions/s"]
+    for action, stats in summary["latency"].items():
+        if stats:
+            lines.append(f"  {action:<18} p50 {stats['p50']} ms  p95 {stats['p95']} ms  p99 {stats['p99']} ms  "
+                         f"max {stats['max']} ms  (n={stats['count']})")
+    if summary["timeouts"]:
+        lines.append("  timed out: " + ", ".join(f"{action} {count}x" for action, count in summary["timeouts"].items()))
+    if summary["drift"]:
+        lines.append(f"  drift: {summary['drift']['first_quarter_ms']} ms -> {summary['drift']['last_quarter_ms']} ms "
+                     f"({summary['drift']['change_percent']:+} %), {summary['drift']['slope_ms_per_minute']:+} ms/min")
+    return "\n".join(lines)
@@ -0,0 +1,217 @@
+import gzip
+import json
+import logging
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+logger = logging.getLogger("test_logger")
+
+CASSETTE_VERSION = 1
+
+
+def request_key(method: str, path: str, body) -> str:
+    """
+    Build the key under which an HTTP exchange is recorded and looked up.
+
+    New-session requests are matched on method and path only, because their capabilities
+    contain machine-specific values such as the absolute APK path.
+
+    :param method: HTTP method.
+    :param path: URL path, including the session id.
+    :param body: Request body as a JSON string, parsed JSON or None.
+    :return: A canonical string key.
+    """
+    path = unquote(path)  # Element ids are percent-encoded on the wire but not in the client
+    if method == "POST" and path.rstrip("/").endswith("/session"):
+        return f"{method} {path}"
+    if isinstance(body, (bytes, str)):
+        body = json.loads(body) if body and body.strip() else None
+    return f"{method} {path} {json.dumps(body, sort_keys=True) if body else ''}".rstrip()
+
+
+class CassetteRecorder:
+    """
+    CassetteRecorder captures the WebDriver HTTP exchanges of a real run into a cassette.
+
+    A cassette is a gzip-compressed JSON-lines file: a header line followed by one line per
+    exchange holding the request method, path and body, and the response the Appium server gave.
+    Exchanges are written as they happen, so a crashed run still leaves a usable cassette.
+    The connection of the session records them: pass the recorder to `HttpPool.connection`
+    (see Utils/http_pool.py) before the session is created.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the CassetteRecorder.
+
+        :param path: Destination cassette file (e.g. 'debug/cassettes/run.jsonl.gz').
+        """
+        self.path = path
+        self.exchanges = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+
+    def record(self, method: str, path: str, body, response: dict):
+        """
+        Append one exchange to the cassette.
+
+        :param method: HTTP method.
+        :param path: URL path, including the session id.
+        :param body: Request body as a JSON string, or None.
+        :param response: The parsed response of the Appium server.
+        """
+        line = json.dumps({"method": method, "path": path, "body": json.loads(body) if body else None,
+                           "response": response})
+        with self._lock:
+            self._file.write(line + "\n")
+            self.exchanges += 1
+
+    def close(self):
+        """
+        Flush and close the cassette file.
+        """
+        with self._lock:
+            self._file.close()
+
+
+def load_cassette(path: str) -> list[dict]:
+    """
+    Read the exchanges of a cassette.
+
+    :param path: Path of the cassette file.
+    :return: The recorded exchanges, in recording order.
+    :raises ValueError: If the file is not a cassette of a supported version.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        header = json.loads(handle.readline() or "{}")
+        if header.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a version {CASSETTE_VERSION} Appium cassette.")
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+class ReplayServer:
+    """
+    ReplayServer stands in for the Appium server by serving the responses of a cassette.
+
+    Responses are looked up by request (method, path and body) and served in recorded order
+    per request, so a poll that returned "not found" twice and then the element gets the same
+    answers again. Requests that were never recorded get a W3C 'unknown command' error and are
+    flagged as mismatches; requests repeated more often than recorded get the last recorded
+    response and are flagged as extra.
+    """
+
+    def __init__(self, cassette: str, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the ReplayServer.
+
+        :param cassette: Path of the cassette to replay.
+        :param host: Interface to bind the HTTP server to.
+        :param port: Port to listen on. Defaults to 0, which picks a free port.
+        """
+        self.host = host
+        self.port = port
+        self.responses = {}
+        for exchange in load_cassette(cassette):
+            key = request_key(exchange["method"], exchange["path"], exchange["body"])
+            self.responses.setdefault(key, deque()).append(exchange["response"])
+        self.mismatches = []  # Requests that were never recorded
+        self.extra = []  # Requests sent more often than recorded
+        self._exhausted = set()
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Start serving the cassette on a background thread.
+
+        :return: The server itself, for chaining.
+        """
+        handler = type("ReplayHandler", (_ReplayHandler,), {"replay": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, args=(0.05,), name="appium-replay", daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server and release its port.
+        """
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def respond(self, method: str, path: str, body: bytes) -> dict | None:
+        """
+        Find the recorded response for a request.
+
+        :return: The recorded response, or None if the request was never recorded.
+        """
+        key = request_key(method, path, body)
+        with self._lock:
+            queue = self.responses.get(key)
+            if not queue:
+                self.mismatches.append(key)
+                logger.warning("Replay mismatch, request not in cassette: %s", key)
+                return None
+            if len(queue) == 1:
+                # Keep serving the last recorded response, but note repeats beyond the recording
+                if key in self._exhausted:
+                    self.extra.append(key)
+                self._exhausted.add(key)
+                return queue[0]
+            return queue.popleft()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """
+    HTTP glue between `http.server` and `ReplayServer.respond`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024
+    replay: ReplayServer = None
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        response = self.replay.respond(method, self.path, body)
+        if response is None:
+            status, payload = 404, json.dumps({"value": {"error": "unknown command", "stacktrace": "",
+                                                         "message": f"{method} {self.path} is not in the cassette"}})
+        elif isinstance(response.get("status"), int) and response["status"] >= 400:
+            status, payload = response["status"], response["value"]  # Raw error body as received
+        else:
+            status, payload = 200, json.dumps(response)
+        data = payload.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
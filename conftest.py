@@ -4,6 +4,29 @@ from appium import webdriver
 from appium.options.common import AppiumOptions
 from dotenv import load_dotenv
 import os
+import pathlib
+import re
+import time
+import warnings
+from Pages.element_cache import element_cache
+from Pages.locator_compiler import locator_compiler
+from Pages.waits import wait_recorder
+from Utils.command_metrics import command_recorder, summary_html
+from Utils.apk_cache import AdbError, ApkInstallCache
+from Utils.device_pool import Device, DevicePool, load_devices
+from Utils.failure_artifacts import ArtifactStore
+from Utils.flaky_tests import BACKOFF_FACTOR, FAILURE_KINDS, RETRYABLE_KINDS, FlakeStore, RetryPolicy, classify
+from Utils.http_pool import HttpPool
+from Utils.log_pipeline import LogPipeline, summary_html as log_summary_html
+from Utils.login_state import LoginState
+from Utils.result_cache import Fingerprinter, ResultCache
+from Utils.results_sink import ResultsSink
+from Utils.report_renderer import ReportWatcher, render_report
+from Utils.resource_sampler import ResourceSampler, summary_html as resource_summary_html
+from Utils.scheduler import DurationStore, base_nodeid, build_units, function_id, longest_first, worker_group
+from Utils.session_pool import SessionPool
+from Utils.soak import SoakRun, summary_text
+from Utils.traffic_cassette import CassetteRecorder, ReplayServer
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,21 +35,264 @@ load_dotenv()
 file = __file__
 path = os.path.dirname(os.path.abspath(file))
 
-# Fixture to set up and tear down the Appium driver
-@pytest.fixture(scope="function")
-def driver():
+APP_PACKAGE = "com.swaglabsmobileapp"
+APK_PATH = os.path.join(path, "apks", "Android.SauceLabs.Mobile.Sample.app.2.7.1.apk")
+ARTIFACT_DIR = os.path.join("debug", "artifacts")  # Relative to the project root, where report.html is written
+REPORT_DIR = os.path.join(path, "report")
+RECENT_COMMANDS = 20  # Number of last WebDriver commands kept with the artifacts of a failed test
+
+# Screenshots, page sources and last commands of failed tests, written in the background
+artifact_store = ArtifactStore(os.path.join(path, ARTIFACT_DIR))
+# Keep-alive connections to the Appium servers, shared by every session of this process
+http_pool = HttpPool()
+# Log records written as JSONL events by a background thread, capped per test
+log_pipeline = LogPipeline(os.path.join(path, "debug", "logs", "test_steps.jsonl"))
+# Every test report, appended as it is made; the report in REPORT_DIR is rendered from it
+results_sink = ResultsSink(os.path.join(path, "debug", "reports.sqlite"))
+
+
+def pytest_addoption(parser):
+    """
+    Register the command-line options of the framework.
+    """
+    parser.addoption("--session-pool-size", action="store", type=int, default=1,
+                     help="Number of warm Appium sessions kept alive between tests (0 = new session per test).")
+    parser.addoption("--devices", action="store", default=None,
+                     help="JSON file listing the devices and Appium servers to run on (see Utils/device_pool.py).")
+    parser.addoption("--appium-record", action="store", default=None, metavar="PATH",
+                     help="Record the Appium traffic of the run to a cassette (see Utils/traffic_cassette.py).")
+    parser.addoption("--appium-replay", action="store", default=None, metavar="PATH",
+                     help="Run against a recorded cassette instead of a device and Appium server.")
+    parser.addoption("--replay-strict", action="store_true", default=False,
+                     help="Fail tests that send requests which are not in the replayed cassette.")
+    parser.addoption("--soak-cycles", action="store", type=int, default=None,
+                     help="Soak mode: number of add/remove cycles run by the cart soak flows.")
+    parser.addoption("--soak-duration", action="store", type=float, default=None,
+                     help="Soak mode: run the cart soak flows for this many seconds.")
+    parser.addoption("--resource-interval", action="store", type=float, default=1.0, metavar="SECONDS",
+                     help="Seconds between two samples of the app's CPU, memory and frame statistics (0 = off).")
+    parser.addoption("--http-pool-size", action="store", type=int, default=4,
+                     help="Maximum number of open HTTP connections per Appium server.")
+    parser.addoption("--http-timeout", action="store", type=float, default=300, metavar="SECONDS",
+                     help="Maximum time to wait for the Appium server to answer a command.")
+    parser.addoption("--http-retries", action="store", type=int, default=2,
+                     help="Retries of commands that failed with a transient connection error (see Utils/http_pool.py).")
+    parser.addoption("--artifacts-max-mb", action="store", type=float, default=200,
+                     help="Maximum disk space of the failure artifacts in debug/artifacts; the oldest are deleted beyond it.")
+    parser.addoption("--schedule", action="store", choices=("duration", "collection"), default="duration",
+                     help="Test order: 'duration' spreads the tests over the workers by their past durations, "
+                          "'collection' keeps the collection order.")
+    parser.addoption("--no-result-cache", action="store_true", default=False,
+                     help="Run every selected test, even those unchanged since they last passed (results are still stored).")
+    parser.addoption("--result-cache-clear", action="store_true", default=False,
+                     help="Forget the stored test results before the run.")
+    parser.addoption("--step-log-level", action="store", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                     help="Minimum level of the log records written to debug/logs/test_steps*.jsonl.")
+    parser.addoption("--test-log-limit", action="store", type=int, default=500,
+                     help="Maximum number of log records below WARNING kept per test (0 = no limit).")
+    parser.addoption("--report", action="store_true", default=False,
+                     help="Store the results and render report/ even if no device test is selected.")
+    parser.addoption("--report-refresh", action="store", type=float, default=30, metavar="SECONDS",
+                     help="Render the report in report/ every SECONDS while the run is going (0 = only at the end).")
+    parser.addoption("--retries", action="store", type=int, default=1,
+                     help="Reruns of a device test that failed with a retryable failure, in the same session after an "
+                          "app reset (0 = off). Override per test with @pytest.mark.flaky(reruns=N, reruns_delay=S).")
+    parser.addoption("--retry-backoff", action="store", type=float, default=1.0, metavar="SECONDS",
+                     help="Wait before the first rerun of a test, doubled for every further rerun.")
+    parser.addoption("--retry-on", action="store", default=",".join(RETRYABLE_KINDS),
+                     help=f"Comma-separated failure kinds that are rerun, of: {', '.join(FAILURE_KINDS)}.")
+    parser.addoption("--quarantine-threshold", action="store", type=float, default=0.2,
+                     help="Quarantine tests that failed in at least this share of their last runs (see Utils/flaky_tests.py).")
+    parser.addoption("--no-quarantine", action="store_true", default=False,
+                     help="Run quarantined tests in their usual place, with their failures counted.")
+    parser.addoption("--xpath-locators", action="store_true", default=False,
+                     help="Send XPath locators as they are instead of compiling them into native locators.")
+    parser.addoption("--no-apk-cache", action="store_true", default=False,
+                     help="Let Appium push and reinstall the APK for every new session.")
+
+
+def pytest_configure(config):
+    """
+    Register the markers of the framework and apply the global options.
+    """
+    locator_compiler.enabled = not config.getoption("--xpath-locators")
+    artifact_store.max_bytes = int(config.getoption("--artifacts-max-mb") * 1024 * 1024)
+    http_pool.max_per_host = config.getoption("--http-pool-size")
+    http_pool.read_timeout = config.getoption("--http-timeout")
+    http_pool.retries = config.getoption("--http-retries")
+    retry_policy.retries = config.getoption("--retries")
+    retry_policy.backoff = config.getoption("--retry-backoff")
+    retry_policy.kinds = tuple(kind.strip() for kind in config.getoption("--retry-on").split(",") if kind.strip())
+    unknown = set(retry_policy.kinds) - set(FAILURE_KINDS)
+    if unknown:
+        raise pytest.UsageError(f"--retry-on: unknown failure kinds {', '.join(sorted(unknown))}")
+    log_pipeline.path = os.path.join(path, "debug", "logs", f"test_steps{worker_suffix()}.jsonl")
+    log_pipeline.level = logging.getLevelName(config.getoption("--step-log-level"))
+    log_pipeline.limiter.limit = config.getoption("--test-log-limit")
+    log_pipeline.start()
+
+    # The workers append their reports under the controller's run id. The run is only registered
+    # once device tests turn up (see start_report), so unit test runs leave the report alone.
+    if hasattr(config, "workerinput"):
+        config.report_run = config.workerinput["report_run"]
+        config.report_arguments = config.workerinput["report_arguments"]
+    else:
+        config.report_run = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        config.report_arguments = list(config.invocation_params.args)
+        if config.getoption("--report"):
+            start_report(config)
+    config.addinivalue_line(
+        "markers", "batched(page=PageClass): run the parametrized cases of a test in one session, resetting only the "
+                   "screen of the given page object between them (see BasePage.soft_reset).")
+    config.addinivalue_line(
+        "markers", "quarantine(reason): run the test at the end, as a non-strict xfail, whatever its flake rate.")
+    config.addinivalue_line(
+        "markers", "depends_on(*names): run the test after the named tests, on the same worker (see Utils/scheduler.py).")
+
+    # The scheduler pins its work units to workers with xdist_group marks, which only --dist loadgroup honors
+    if getattr(config.option, "numprocesses", None) and config.option.dist == "load" \
+            and config.getoption("--schedule") == "duration":
+        config.option.dist = "loadgroup"
+    if getattr(config, "workerinput", {}).get("loadgroup"):
+        config.option.loadgroup = True  # Workers parse the original command line, without the switch above
+
+    # Clear the stored results once, before any worker collects
+    if config.getoption("--result-cache-clear") and not hasattr(config, "workerinput") and track_results(config):
+        result_cache.clear()
+
+
+def start_report(config):
+    """
+    Register the run in the results database, once, and on the controller start rendering the
+    report while the run is going. Called when the run turns out to have device tests, or for --report.
+    """
+    if results_sink.run is not None:
+        return
+    results_sink.start_run(config.report_run, config.report_arguments)
+    if not hasattr(config, "workerinput") and config.getoption("--report-refresh") > 0:
+        config.report_watcher = ReportWatcher(config.getoption("--report-refresh"), database=results_sink.path,
+                                              output=REPORT_DIR, run=results_sink.run, root=path)
+        config.report_watcher.start()
+
+
+def pytest_unconfigure(config):
+    """
+    Write the log records still queued and close the log file.
+    """
+    log_pipeline.stop()
+
+
+def pytest_runtest_logstart(nodeid):
+    """
+    Tag the log records from here on with the test about to run.
+    """
+    log_pipeline.test = nodeid
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Store the outcome of a device test once all its attempts are done (see record_outcome).
+
+    A device test that failed with a retryable failure (see Utils/flaky_tests.py) is run again by
+    pytest-rerunfailures, up to its retry limit and after its backoff. Between two attempts only
+    the function-scoped fixtures are torn down: the driver fixture gets the same warm session
+    back after an app reset, so a retry costs a reset instead of a new session. The failed
+    attempts are reported as 'rerun' and do not count towards --maxfail.
+    """
+    item.phase_reports = []  # Every phase of every attempt, see pytest_runtest_makereport
+    result = yield
+    record_outcome(item)
+    return result
+
+
+def record_outcome(item):
+    """
+    Note the outcome of a device test over all its attempts (passed, flaky or failed) for the flake
+    store, written at the end of the run, and store its result in the result cache.
+    """
+    reports = item.phase_reports
+    if "driver" not in item.fixturenames or not any(report.when == "setup" for report in reports):
+        return
+    attempts = sum(report.when == "setup" for report in reports)
+    kinds = [report.failure_kind for report in reports if getattr(report, "failure_kind", None)]
+    last = reports[max(index for index, report in enumerate(reports) if report.when == "setup"):]
+    call = next((report for report in last if report.when == "call"), None)
+    if call and (call.passed or call.failed or hasattr(call, "wasxfail")):
+        outcome = "failed" if call.failed or (call.skipped and hasattr(call, "wasxfail")) else \
+            "flaky" if attempts > 1 else "passed"
+        flake_outcomes.append((base_nodeid(item.nodeid), outcome, attempts, kinds))
+
+    failed = any(report.failed for report in last)
+    if hasattr(item, "fingerprint") and not getattr(item, "result_cached", False) and (failed or (call and call.passed)):
+        # A test that only passed on a rerun is stored as flaky, so it is not skipped next time
+        result = "failed" if failed else "flaky" if attempts > 1 else "passed"
+        result_cache.record(base_nodeid(item.nodeid), item.fingerprint, result, test_durations[item.nodeid])
+
+
+def pytest_runtest_logreport(report):
+    """
+    Append every reported test phase to the results database (see Utils/results_sink.py) as soon as
+    it is reported, once the run is registered. Under pytest-xdist the worker that ran the test stores
+    it; the controller only starts the report when the first device test comes in.
+    """
+    if getattr(report, "node", None) is not None:
+        if getattr(report, "device_test", False):
+            start_report(report.node.config)
+    elif results_sink.run is not None:
+        results_sink.append(report.nodeid, report.when, report.outcome, report.duration,
+                            report.longreprtext if report.longrepr else None, getattr(report, "result_extras", None),
+                            os.getenv("PYTEST_XDIST_WORKER"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    Tell a pytest-xdist worker whether the controller schedules by xdist_group, and the id
+    and command line of the run its reports belong to.
+    """
+    node.workerinput["loadgroup"] = node.config.option.dist == "loadgroup"
+    node.workerinput["report_run"] = node.config.report_run
+    node.workerinput["report_arguments"] = node.config.report_arguments
+
+
+# Outcome of the last finished test, used to decide whether a batch can continue without a full reset
+last_test = {"function": None, "passed": False}
+
+
+# Durations of past runs, used to spread the tests evenly over the workers
+duration_store = DurationStore(os.path.join(path, "debug", "durations.json"))
+test_durations = {}  # Seconds per test node id in this run
+
+# Last result of every test and the fingerprint it ran with, to skip tests that did not change since they passed
+result_cache = ResultCache(os.path.join(path, "debug", "results.sqlite"))
+fingerprinter = Fingerprinter(APK_PATH)
+
+# Retries of failed tests in the same session, and the outcomes of past runs to quarantine flaky tests
+retry_policy = RetryPolicy()
+flake_store = FlakeStore(os.path.join(path, "debug", "flakes.sqlite"))
+flake_outcomes = []  # (node id, outcome, attempts, failure kinds) of every test run in this process
+QUARANTINE_GROUP = "quarantine"  # xdist_group of the quarantined tests
+
+
+def create_driver(device, recorder=None, app_installed=False):
     """
     Initializes the Appium driver for automated control.
 
     Desired Capabilities:
         - platformName: Android
-        - platformVersion: 15 (adjust to match your test device/emulator)
-        - deviceName: Name/ID of the device or emulator
+        - platformVersion, deviceName, udid, systemPort, chromedriverPort, mjpegServerPort:
+          taken from the leased device (see Utils/device_pool.py)
         - appPackage: Package name of the app under test
         - appActivity: Main activity to launch the app
-        - app: Path to the APK file
+        - app: Path to the APK file, left out when the APK cache has already installed this build
         - automationName: UiAutomator2 for Android automation
-        - noReset: Resets app state between tests
+        - noReset: Resets app state when the session is created
+
+    Args:
+        device: The Device the session is created on.
+        recorder: Optional CassetteRecorder capturing the traffic of the session.
+        app_installed: True if the exact APK build is known to be installed on the device.
 
     Returns:
         Appium driver instance.
@@ -34,22 +300,401 @@ def driver():
     # Define desired capabilities for the Appium driver
     desired_caps = {
         "platformName": "Android",
-        "platformVersion": "15",
-        "deviceName": "emulator-5554",
-        "appium:appPackage": "com.swaglabsmobileapp",
+        **device.capabilities(),
+        "appium:appPackage": APP_PACKAGE,
         "appium:appActivity": "com.swaglabsmobileapp.MainActivity",
-        "app": fr"{path}\apks\Android.SauceLabs.Mobile.Sample.app.2.7.1.apk",
         "automationName": "UiAutomator2",
         "noReset": False,
     }
+    if not app_installed:
+        desired_caps["app"] = APK_PATH  # Appium pushes and installs the APK
+
+    # Create the connection explicitly, so the traffic can be recorded from the first request.
+    # It sends its requests over the pooled keep-alive connections of this process (see Utils/http_pool.py).
+    connection = http_pool.connection(device.appium_url, recorder)
 
     # Initialize the Appium driver
-    driver = webdriver.Remote('http://localhost:4723', options=AppiumOptions().load_capabilities(desired_caps))
+    return webdriver.Remote(connection, options=AppiumOptions().load_capabilities(desired_caps))
+
+
+def cassette_path(option: str, replay: bool = False) -> str:
+    """
+    Per-worker cassette path, e.g. 'run-gw0.jsonl.gz' for 'run.jsonl.gz' under pytest-xdist.
+    When replaying, the shared cassette is used if the worker has no cassette of its own.
+    """
+    directory, name = os.path.split(option)
+    stem, dot, extension = name.partition(".")
+    worker_path = os.path.join(directory, f"{stem}{worker_suffix()}{dot}{extension}")
+    if replay and not os.path.exists(worker_path):
+        return option
+    return worker_path
+
+
+# Fixture serving a recorded cassette in place of the Appium server
+@pytest.fixture(scope="session")
+def replay_server(request):
+    """
+    Starts a local replay server for --appium-replay runs (see Utils/traffic_cassette.py).
+
+    Returns:
+        ReplayServer instance, or None when running against real devices.
+    """
+    option = request.config.getoption("--appium-replay")
+    if not option:
+        yield None
+        return
+    with ReplayServer(cassette_path(option, replay=True)) as server:
+        yield server
+    if server.mismatches or server.extra:
+        logging.getLogger("test_logger").warning(
+            "Replay finished with %s unrecorded and %s extra requests.", len(server.mismatches), len(server.extra))
+
+
+# Fixture recording the Appium traffic of the run
+@pytest.fixture(scope="session")
+def cassette_recorder(request):
+    """
+    Records every WebDriver HTTP exchange to the --appium-record cassette.
+
+    Returns:
+        CassetteRecorder instance, or None when not recording.
+    """
+    option = request.config.getoption("--appium-record")
+    if not option:
+        yield None
+        return
+    cassette = cassette_path(option)
+    os.makedirs(os.path.dirname(cassette) or ".", exist_ok=True)
+    recorder = CassetteRecorder(cassette)
+
+    yield recorder
+
+    recorder.close()
+
+
+# Fixture leasing one device for this worker for the whole test run
+@pytest.fixture(scope="session")
+def device(request, replay_server):
+    """
+    Leases a device and its Appium endpoint from the device pool.
+    Under pytest-xdist every worker gets its own device; the lease is given back at the end
+    of the run, or taken over by another worker if this one crashes.
+    When replaying a cassette, the replay server stands in for the device and nothing is leased.
+
+    Returns:
+        Device instance.
+    """
+    if replay_server:
+        yield Device("replay", replay_server.url)
+        return
+
+    pool = DevicePool(load_devices(request.config.getoption("--devices")), os.path.join(path, "debug", "device_leases"))
+    lease = pool.lease()
+
+    yield lease.device
+
+    lease.release()
+
+
+def install_app(request, device) -> bool:
+    """
+    Install the APK under test on the device unless that exact build is already installed
+    (see Utils/apk_cache.py).
+
+    Returns:
+        True if the build is installed, False if Appium has to install it with the session.
+    """
+    if request.config.getoption("--no-apk-cache") or request.config.getoption("--appium-replay"):
+        return False
+    cache = ApkInstallCache(os.path.join(path, "debug", "apk_index.json"))
+    try:
+        cache.ensure_installed(device.udid, APK_PATH, APP_PACKAGE)
+        return True
+    except (AdbError, OSError) as error:
+        logging.getLogger("test_logger").warning("APK cache unavailable, Appium installs the app: %s", error)
+        return False
+
+
+# Fixture keeping warm Appium sessions alive for the whole test run
+@pytest.fixture(scope="session")
+def session_pool(request, device, cassette_recorder):
+    """
+    Provides the pool of reusable Appium sessions.
+    Sessions are reset in place (terminate app, clear data, activate app) between tests
+    instead of being recreated, and all of them are quit at the end of the run.
+    The APK is installed through the APK cache first, so sessions only reinstall it when
+    the cache could not check the device.
+
+    Returns:
+        SessionPool instance.
+    """
+    app_installed = install_app(request, device)
+    pool = SessionPool(lambda: create_driver(device, cassette_recorder, app_installed), APP_PACKAGE, max_size=request.config.getoption("--session-pool-size"))
+
+    yield pool
+
+    pool.close()
+
+
+# Fixture to set up and tear down the Appium driver
+@pytest.fixture(scope="function")
+def driver(request, session_pool, device, replay_server):
+    """
+    Provides an Appium driver in a clean app state for a single test.
+    The session comes from the session pool, so it is usually a warm session that has
+    just been reset rather than a new one. Every WebDriver command of the test is
+    recorded by the command recorder (see Utils/command_metrics.py).
+    When replaying a cassette, requests the recording does not contain are reported
+    as a warning, or as a test error with --replay-strict.
+
+    Cases of a test marked `batched(page=...)` follow each other in the same session: after a
+    passed case only the page's screen is reset (`page.soft_reset`). After a failed case,
+    or if the soft reset does not succeed, the app gets the usual full reset.
+
+    While the test runs, the app's CPU, memory and frame statistics are sampled in the
+    background (see Utils/resource_sampler.py) and written to debug/resources/<test>*.json.gz.
+
+    Returns:
+        Appium driver instance.
+    """
+    command_recorder.start_test(request.node.nodeid)
+    mismatches = len(replay_server.mismatches) if replay_server else 0
+    batched = request.node.get_closest_marker("batched")
+    soft_reset = None
+    if batched and last_test["function"] == function_id(request.node) and last_test["passed"]:
+        soft_reset = lambda session: batched.kwargs["page"](session).soft_reset()
+    driver = session_pool.acquire(soft_reset)
+    command_recorder.install(driver)
+    interval = request.config.getoption("--resource-interval")
+    sampler = None
+    if interval > 0 and not replay_server:
+        sampler = ResourceSampler(device.appium_url, driver.session_id, APP_PACKAGE, interval).start()
+        request.node.resource_sampler = sampler
 
     yield driver  # Provide the driver to the test function
 
-    # Quit the driver session after the test
-    driver.quit()
+    if sampler:
+        sampler.stop()
+        os.makedirs(os.path.join(path, "debug", "resources"), exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", request.node.name)
+        sampler.dump(os.path.join(path, "debug", "resources", f"{name}{worker_suffix()}.json.gz"), request.node.nodeid)
+
+    # Hand the session back to the pool; it is reset before its next use
+    session_pool.release(driver)
+
+    if replay_server and len(replay_server.mismatches) > mismatches:
+        message = "Requests not in the replayed cassette:\n" + "\n".join(replay_server.mismatches[mismatches:])
+        if request.config.getoption("--replay-strict"):
+            pytest.fail(message, pytrace=False)
+        warnings.warn(message)
+
+
+# Fixture remembering how to log in on this worker's device
+@pytest.fixture(scope="session")
+def login_state():
+    """
+    Provides the login state shared by the tests that start logged in.
+    The first of them logs in through the login form, the others restore the
+    logged-in state through a deep link (see Utils/login_state.py).
+
+    Returns:
+        LoginState instance.
+    """
+    return LoginState(os.getenv("TEST_USERNAME"), os.getenv("TEST_PASSWORD"), APP_PACKAGE)
+
+
+# Fixture providing a driver already logged in and on the products screen
+@pytest.fixture(scope="function")
+def logged_in_driver(driver, login_state):
+    """
+    Provides an Appium driver with the user logged in, for tests that do not test the login itself.
+
+    Returns:
+        Appium driver instance.
+    """
+    login_state.apply(driver)
+    return driver
+
+
+# Summaries of the soak runs of this session, printed at the end of the run
+soak_summaries = []
+
+
+# Fixture driving the cycles of cart soak flows
+@pytest.fixture(scope="function")
+def soak(request):
+    """
+    Provides the SoakRun of a repeated cart flow (see Utils/soak.py).
+    Without soak options the flow runs its default number of cycles. With --soak-cycles or
+    --soak-duration it runs longer, and the latency percentiles, throughput and drift are
+    written to debug/soak-<test>*.json and printed at the end of the run.
+
+    Returns:
+        SoakRun instance.
+    """
+    cycles, duration = request.config.getoption("--soak-cycles"), request.config.getoption("--soak-duration")
+    run = SoakRun(cycles=cycles, duration=duration)
+
+    yield run
+
+    if (cycles or duration) and run.samples:
+        os.makedirs(os.path.join(path, "debug"), exist_ok=True)
+        run.dump(os.path.join(path, "debug", f"soak-{request.node.name}{worker_suffix()}.json"))
+        text = summary_text(request.node.name, run.summary())
+        logging.getLogger("test_logger").info("Soak results\n%s", text)
+        soak_summaries.append(text)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Print the tests that were rerun, the results of the soak runs, if any, and where the report is.
+    """
+    if getattr(terminalreporter.config, "report_index", None):
+        terminalreporter.write_sep("-", f"Report: {pathlib.Path(terminalreporter.config.report_index).as_uri()}")
+    reruns = {}
+    for report in terminalreporter.stats.get("rerun", []):
+        reruns.setdefault(report.nodeid, []).append(getattr(report, "failure_kind", "other"))
+    if reruns:
+        terminalreporter.section("rerun tests")
+        for nodeid, kinds in reruns.items():
+            terminalreporter.write_line(f"{nodeid}: {len(kinds)} rerun(s) after {', '.join(kinds)} failures")
+    if soak_summaries:
+        terminalreporter.section("soak results")
+        for text in soak_summaries:
+            terminalreporter.write_line(text)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Start the report of the run if it has device tests, or --report is given (see start_report).
+
+    Give every device test the `flaky` marker of pytest-rerunfailures, with its retry limit and
+    backoff and the retryable failure kinds as rerun condition (see Utils/flaky_tests.py).
+
+    Skip the device tests whose fingerprint (APK, devices, page objects and framework modules used,
+    test code and parameters) is unchanged since they last passed (see Utils/result_cache.py), unless --no-result-cache is given.
+
+    Quarantine the tests marked `quarantine` or failing too often in their last runs (see
+    Utils/flaky_tests.py): they run after all the others, as non-strict xfails.
+
+    Order the tests and distribute them over the pytest-xdist workers, longest-processing-time
+    first, using the durations of past runs (see Utils/scheduler.py). Cases of a `batched` test
+    and tests linked by `depends_on` stay together on one worker, dependencies first. Under
+    pytest-xdist the quarantined tests form a group of their own, run by one worker on its
+    device, so they do not hold up the tests of the other workers.
+    """
+    durations = duration_store.load()
+    if config.getoption("--report") or any("driver" in item.fixturenames for item in items):
+        start_report(config)
+
+    # Let pytest-rerunfailures rerun the device tests that failed with a retryable failure
+    for item in (item for item in items if "driver" in item.fixturenames):
+        retries, backoff = retry_policy.for_item(item)
+        item.add_marker(pytest.mark.flaky(reruns=retries, reruns_delay=backoff, reruns_delay_backoff_factor=BACKOFF_FACTOR,
+                                          condition=retry_policy.retryable), append=False)
+    if track_results(config):
+        results = {} if config.getoption("--no-result-cache") else result_cache.load()
+        fingerprinter.devices = load_devices(config.getoption("--devices"))
+        for item in (item for item in items if "driver" in item.fixturenames):  # Tests on a device
+            item.fingerprint = fingerprinter.fingerprint(item)
+            result = results.get(item.nodeid)
+            if result and result["outcome"] == "passed" and result["fingerprint"] == item.fingerprint:
+                passed = time.strftime("%Y-%m-%d %H:%M", time.localtime(result["recorded"]))
+                item.add_marker(pytest.mark.skip(
+                    reason=f"Unchanged since it passed on {passed} (run with --no-result-cache to run it anyway)"))
+                item.result_cached = True
+                durations[item.nodeid] = 0.0
+
+    # Quarantine the flaky tests: they run last, as non-strict xfails, so their failures do not stop the run
+    if not config.getoption("--no-quarantine"):
+        flaky = flake_store.quarantined(config.getoption("--quarantine-threshold")) if track_results(config) else {}
+        for item in items:
+            marker, entry = item.get_closest_marker("quarantine"), flaky.get(base_nodeid(item.nodeid))
+            if marker or entry:
+                reason = (marker.kwargs.get("reason") or (marker.args[0] if marker.args else "marked as quarantined")
+                          if marker else f"failed in {entry['rate']:.0%} of its last {entry['runs']} runs")
+                item.add_marker(pytest.mark.xfail(reason=f"Quarantined: {reason}", strict=False))
+                item.quarantined = True
+        items[:] = sorted(items, key=lambda item: getattr(item, "quarantined", False))
+
+    if config.getoption("--schedule") != "duration":
+        return
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    try:
+        units = build_units(items, durations)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    quarantine = [unit for unit in units if any(getattr(item, "quarantined", False) for item in unit.items)]
+    plan = longest_first([unit for unit in units if unit not in quarantine], workers)
+    items[:] = [item for assigned in plan for unit in assigned for item in unit.items]
+    items += [item for unit in quarantine for item in unit.items]
+    if workers > 1:
+        for number, assigned in enumerate(plan):
+            for item in (item for unit in assigned for item in unit.items):
+                item.add_marker(pytest.mark.xdist_group(worker_group(number)))
+        for item in (item for unit in quarantine for item in unit.items):
+            item.add_marker(pytest.mark.xdist_group(QUARANTINE_GROUP))  # All on one worker's device
+    loads = [sum(unit.duration for unit in assigned) for assigned in plan]
+    logging.getLogger("test_logger").info(
+        "Scheduled %s tests on %s worker(s): estimated wall time %.1f s of %.1f s in total, %s quarantined at the end.",
+        len(items), workers, max(loads, default=0), sum(loads), sum(len(unit.items) for unit in quarantine))
+
+
+def track_results(config) -> bool:
+    """
+    Whether results are read from and stored in the result cache and the flake store: not when
+    replaying a cassette, which is not a run on a device, nor in soak mode, which is about
+    running the flows again.
+    """
+    return not (config.getoption("--appium-replay") or config.getoption("--soak-cycles")
+                or config.getoption("--soak-duration"))
+
+
+def worker_suffix() -> str:
+    """
+    Suffix for per-worker output files, e.g. '-gw0' under pytest-xdist and '' otherwise.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    return f"-{worker}" if worker else ""
+
+
+def pytest_sessionfinish(session):
+    """
+    Write the measured durations of all explicit waits to debug/waits*.json and every
+    recorded WebDriver command to debug/commands*.json, so timeouts and slow lookups
+    can be tuned from real data. The XPath locators that could not be compiled into
+    native locators are listed in debug/locators*.json, the element cache hits and misses
+    in debug/elements*.json and the HTTP connection reuse in debug/connections*.json.
+    Failure artifacts still being written are waited for, and the test durations and
+    outcomes (for the flake rates) are stored for the next schedule. The controller renders the final report
+    into report/ if the run had device tests (or --report).
+    """
+    artifact_store.close()
+    if not session.config.getoption("--appium-replay"):
+        duration_store.update(test_durations)
+    if track_results(session.config):
+        flake_store.record(flake_outcomes)
+    os.makedirs(os.path.join(path, "debug"), exist_ok=True)
+    if wait_recorder.records:
+        wait_recorder.dump(os.path.join(path, "debug", f"waits{worker_suffix()}.json"))
+    if command_recorder.tests:
+        command_recorder.dump(os.path.join(path, "debug", f"commands{worker_suffix()}.json"))
+    if locator_compiler.enabled and command_recorder.tests:
+        locator_compiler.dump(os.path.join(path, "debug", f"locators{worker_suffix()}.json"))
+    if element_cache.hits or element_cache.misses:
+        element_cache.dump(os.path.join(path, "debug", f"elements{worker_suffix()}.json"))
+    if http_pool.hosts:
+        http_pool.dump(os.path.join(path, "debug", f"connections{worker_suffix()}.json"))
+    http_pool.close()
+
+    # Render the final report once, on the controller, from the reports of every worker
+    if not hasattr(session.config, "workerinput") and results_sink.run is not None:
+        if getattr(session.config, "report_watcher", None):
+            session.config.report_watcher.stop()
+        results_sink.finish_run(session.exitstatus)
+        session.config.report_index = render_report(results_sink.path, REPORT_DIR, results_sink.run, root=path)
+    results_sink.close()
 
 
 # Pytest hook to handle additional logic for test reports
@@ -57,7 +702,10 @@ def driver():
 def pytest_runtest_makereport(item, call):
     """
     Hook to capture test reports and handle failures.
-    Logs the outcome of each test and captures a screenshot on test failure.
+    Logs the outcome of each test and captures the failure artifacts (screenshot, page source,
+    last commands) on test failure.
+    Adds the command latency, device resource and log summaries to the report, and classifies
+    the failure of the test function (see Utils/flaky_tests.py).
 
     Args:
         item: The test item object (test function).
@@ -69,16 +717,65 @@ def pytest_runtest_makereport(item, call):
 
     # Initialize a logger for debugging purposes
     logger = logging.getLogger("test_logger")
-    logger.info(f"Test {item.name} finished with outcome: {report.outcome}")
+    logger.info("Test %s %s finished with outcome: %s", item.name, call.when, report.outcome,
+                extra={"step": call.when, "duration": round(report.duration, 3)})
 
     if report.outcome == "failed":
-        logger.error(f"Test failed at {item.name} with {report.longrepr}")
+        logger.error("Test failed at %s with %s", item.name, report.longrepr)
+
+    # Classify the failure, also when it is an expected failure, for the flake store; pytest-rerunfailures
+    # turns the report of a failed attempt into 'rerun' later, so the outcome is only known in record_outcome
+    if call.excinfo is not None and (report.failed or hasattr(report, "wasxfail")):
+        report.failure_kind = classify(call.excinfo.value)
+    if hasattr(item, "phase_reports"):
+        item.phase_reports.append(report)
+
+    # Add up the setup, call and teardown durations of every attempt for the scheduler
+    if not getattr(item, "result_cached", False):
+        test_durations[item.nodeid] = test_durations.get(item.nodeid, 0.0) + report.duration
 
-    # Capture a screenshot if the test fails during the 'call' phase (during test function execution)
+    # Remember whether the test passed, so the next case of a batch knows if it can skip the full reset
+    if call.when == "setup":
+        last_test.update(function=function_id(item), passed=report.passed)
+    else:
+        last_test["passed"] = last_test["passed"] and report.passed
+
+    # Attach the per-page-object-method command latency summary to the report
+    extras = []
+    records = command_recorder.for_test(item.nodeid)
+    if call.when == "call" and records:
+        extras.append({"html": summary_html(records)})
+
+    # Attach the device resource summary once the sampler has stopped, in the driver fixture teardown
+    sampler = getattr(item, "resource_sampler", None)
+    if call.when == "teardown" and sampler:
+        summary = sampler.summary()
+        logger.info("Device resources of %s: %s", item.name, summary)
+        extras.append({"html": resource_summary_html(summary)})
+
+    # Summarize the log records of the test; the records themselves are in the JSONL log
+    if call.when == "teardown":
+        summary = log_pipeline.summary(item.nodeid)
+        if summary["dropped"]:
+            logger.warning("Dropped %d log records of %s beyond --test-log-limit.", summary["dropped"], item.name)
+        log_path = os.path.relpath(log_pipeline.path, path).replace(os.sep, "/")
+        extras.append({"html": log_summary_html(summary, log_path)})
+
+    # Capture the failure artifacts if the test fails during the 'call' phase (during test function execution);
+    # they are encoded and written in the background, the report links them
     if call.when == "call" and report.failed:
         driver = item.funcargs.get("driver")  # Access driver from test function args
         if driver:
-            # Save the screenshot to a specified path
-            screenshot_path = f"debug/screenshots/{item.name}.png"
-            driver.save_screenshot(screenshot_path)
-            pytest.fail(f"Test failed. Screenshot saved to {screenshot_path}", pytrace=False)
+            artifacts = artifact_store.capture(driver, item.nodeid, command_recorder.last(RECENT_COMMANDS))
+            links = {kind: f"{ARTIFACT_DIR}/{name}".replace(os.sep, "/") for kind, name in artifacts.items()}
+            logger.error("Failure artifacts of %s: %s", item.name, ", ".join(links.values()))
+            extras += [{"url": link, "name": kind.replace("_", " ").capitalize()} for kind, link in links.items()]
+
+    # Keep the extras for the results database, and attach them to pytest-html's report if it is enabled
+    report.result_extras = extras
+    report.device_test = "driver" in item.fixturenames  # Starts the report on the pytest-xdist controller
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if pytest_html and extras:
+        report.extras = getattr(report, "extras", []) + [
+            pytest_html.extras.url(extra["url"], name=extra["name"]) if "url" in extra else pytest_html.extras.html(extra["html"])
+            for extra in extras]